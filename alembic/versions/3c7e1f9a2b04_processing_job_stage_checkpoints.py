@@ -0,0 +1,45 @@
+"""Processing job stage checkpoints
+
+Revision ID: 3c7e1f9a2b04
+Revises: 15a181ad7be4
+Create Date: 2026-01-12 10:14:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7e1f9a2b04"
+down_revision: Union[str, None] = "15a181ad7be4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "processing_jobs", sa.Column("transcript_id", sa.String(), nullable=True)
+    )
+    op.add_column("processing_jobs", sa.Column("transcript", sa.Text(), nullable=True))
+    op.add_column("processing_jobs", sa.Column("notes", sa.JSON(), nullable=True))
+    op.add_column(
+        "processing_jobs", sa.Column("report_path", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "processing_jobs",
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.drop_column("attempts")
+        batch_op.drop_column("report_path")
+        batch_op.drop_column("notes")
+        batch_op.drop_column("transcript")
+        batch_op.drop_column("transcript_id")
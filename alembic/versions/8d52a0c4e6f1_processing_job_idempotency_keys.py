@@ -0,0 +1,52 @@
+"""Processing job idempotency and in-flight keys
+
+Revision ID: 8d52a0c4e6f1
+Revises: 3c7e1f9a2b04
+Create Date: 2026-01-19 16:42:08.913550
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d52a0c4e6f1"
+down_revision: Union[str, None] = "3c7e1f9a2b04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "processing_jobs", sa.Column("idempotency_key", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "processing_jobs", sa.Column("inflight_key", sa.String(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_processing_jobs_idempotency_key"),
+        "processing_jobs",
+        ["idempotency_key"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_processing_jobs_inflight_key"),
+        "processing_jobs",
+        ["inflight_key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_processing_jobs_inflight_key"), table_name="processing_jobs")
+    op.drop_index(
+        op.f("ix_processing_jobs_idempotency_key"), table_name="processing_jobs"
+    )
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.drop_column("inflight_key")
+        batch_op.drop_column("idempotency_key")
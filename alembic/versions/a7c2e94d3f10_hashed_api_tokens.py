@@ -0,0 +1,90 @@
+"""Hashed API tokens with a public prefix
+
+Revision ID: a7c2e94d3f10
+Revises: e5a93c07d1b8
+Create Date: 2026-02-03 10:21:47.306118
+
+"""
+
+import hashlib
+import hmac
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c2e94d3f10"
+down_revision: Union[str, None] = "e5a93c07d1b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of the rules in app.core.security at the time of this revision
+PREFIX_LENGTH = 8
+
+
+def _hash(token: str) -> str:
+    if settings.API_TOKEN_HASH_KEY:
+        key = settings.API_TOKEN_HASH_KEY.encode()
+    else:
+        key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"report-generator/api-token-hash/v1",
+        ).derive(settings.SECRET_KEY.encode())
+    return hmac.new(key, token.encode(), hashlib.sha256).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("api_tokens", sa.Column("prefix", sa.String(), nullable=True))
+    op.add_column("api_tokens", sa.Column("token_hash", sa.String(), nullable=True))
+
+    # Existing tokens keep working: they are hashed and their plaintext dropped
+    api_tokens = sa.table(
+        "api_tokens",
+        sa.column("id", sa.Integer),
+        sa.column("token", sa.String),
+        sa.column("prefix", sa.String),
+        sa.column("token_hash", sa.String),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(api_tokens.c.id, api_tokens.c.token)).all()
+    for token_id, token in rows:
+        connection.execute(
+            api_tokens.update()
+            .where(api_tokens.c.id == token_id)
+            .values(prefix=token[:PREFIX_LENGTH], token_hash=_hash(token))
+        )
+
+    op.drop_index(op.f("ix_api_tokens_token"), table_name="api_tokens")
+    with op.batch_alter_table("api_tokens") as batch_op:
+        batch_op.alter_column("prefix", existing_type=sa.String(), nullable=False)
+        batch_op.alter_column("token_hash", existing_type=sa.String(), nullable=False)
+        batch_op.create_unique_constraint("uq_api_tokens_token_hash", ["token_hash"])
+        batch_op.drop_column("token")
+    op.create_index(
+        op.f("ix_api_tokens_prefix"), "api_tokens", ["prefix"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Token plaintexts cannot be recovered from their hashes, so every API
+    token is deleted and has to be issued again.
+    """
+    op.execute("DELETE FROM api_tokens")
+    op.drop_index(op.f("ix_api_tokens_prefix"), table_name="api_tokens")
+    with op.batch_alter_table("api_tokens") as batch_op:
+        batch_op.drop_constraint("uq_api_tokens_token_hash", type_="unique")
+        batch_op.drop_column("token_hash")
+        batch_op.drop_column("prefix")
+        batch_op.add_column(sa.Column("token", sa.String(), nullable=False))
+    op.create_index(op.f("ix_api_tokens_token"), "api_tokens", ["token"], unique=True)
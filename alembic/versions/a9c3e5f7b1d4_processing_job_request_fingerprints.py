@@ -0,0 +1,34 @@
+"""Processing job request fingerprints
+
+Revision ID: a9c3e5f7b1d4
+Revises: f2a6d9c3e7b4
+Create Date: 2026-03-04 09:18:27.402915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c3e5f7b1d4"
+down_revision: Union[str, None] = "f2a6d9c3e7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keys stored before have no fingerprint and match any request
+    op.add_column(
+        "processing_jobs",
+        sa.Column("request_fingerprint", sa.String(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.drop_column("request_fingerprint")
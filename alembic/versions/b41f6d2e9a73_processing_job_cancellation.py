@@ -0,0 +1,34 @@
+"""Processing job cancellation
+
+Revision ID: b41f6d2e9a73
+Revises: 8d52a0c4e6f1
+Create Date: 2026-01-26 09:27:51.206734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b41f6d2e9a73"
+down_revision: Union[str, None] = "8d52a0c4e6f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE job_status_enum ADD VALUE IF NOT EXISTS 'CANCELLED'")
+    op.add_column("processing_jobs", sa.Column("stage", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL cannot drop an enum value, 'CANCELLED' stays in the type
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.drop_column("stage")
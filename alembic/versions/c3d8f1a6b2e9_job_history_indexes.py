@@ -0,0 +1,91 @@
+"""Job history indexes
+
+Revision ID: c3d8f1a6b2e9
+Revises: a7c2e94d3f10
+Create Date: 2026-02-16 10:21:47.305118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d8f1a6b2e9"
+down_revision: Union[str, None] = "a7c2e94d3f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Upload times order the audio history: give every row one
+    op.execute(
+        "UPDATE audio_files SET created_at = CURRENT_TIMESTAMP"
+        " WHERE created_at IS NULL"
+    )
+    with op.batch_alter_table("audio_files") as batch_op:
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        )
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.add_column(sa.Column("user_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_processing_jobs_user_id_users", "users", ["user_id"], ["id"]
+        )
+    # Copy the owner of each job's audio onto the job
+    op.execute(
+        "UPDATE processing_jobs SET user_id = ("
+        "SELECT audio_files.user_id FROM audio_files"
+        " WHERE audio_files.id = processing_jobs.audio_id)"
+    )
+
+    op.create_index(
+        "ix_audio_files_user_id_created_at",
+        "audio_files",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        op.f("ix_processing_jobs_audio_id"), "processing_jobs", ["audio_id"]
+    )
+    op.create_index(
+        "ix_processing_jobs_user_id_created_at",
+        "processing_jobs",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_processing_jobs_user_id_status_created_at",
+        "processing_jobs",
+        ["user_id", "status", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_processing_jobs_status_created_at",
+        "processing_jobs",
+        ["status", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_processing_jobs_status_created_at", table_name="processing_jobs")
+    op.drop_index(
+        "ix_processing_jobs_user_id_status_created_at", table_name="processing_jobs"
+    )
+    op.drop_index("ix_processing_jobs_user_id_created_at", table_name="processing_jobs")
+    op.drop_index(op.f("ix_processing_jobs_audio_id"), table_name="processing_jobs")
+    op.drop_index("ix_audio_files_user_id_created_at", table_name="audio_files")
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.drop_constraint("fk_processing_jobs_user_id_users", type_="foreignkey")
+        batch_op.drop_column("user_id")
+    with op.batch_alter_table("audio_files") as batch_op:
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(timezone=True),
+            server_default=None,
+            nullable=True,
+        )
@@ -0,0 +1,65 @@
+"""Processing jobs archive
+
+Revision ID: d4e7a2b9c5f1
+Revises: c3d8f1a6b2e9
+Create Date: 2026-02-23 14:08:12.514630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e7a2b9c5f1"
+down_revision: Union[str, None] = "c3d8f1a6b2e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reuses the type of `processing_jobs.status` on PostgreSQL
+    job_status = postgresql.ENUM(
+        "CREATED",
+        "TRANSCRIBED",
+        "SUMMARIZED",
+        "FAILED",
+        "CANCELLED",
+        name="job_status_enum",
+        create_type=False,
+    )
+    op.create_table(
+        "processing_jobs_archive",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("audio_id", sa.String(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("status", job_status, nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("stage", sa.String(), nullable=True),
+        sa.Column("transcript_id", sa.String(), nullable=True),
+        sa.Column("transcript", sa.Text(), nullable=True),
+        sa.Column("notes", sa.JSON(), nullable=True),
+        sa.Column("report_path", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("idempotency_key", sa.String(), nullable=True),
+        sa.Column("callback_url", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived jobs are dropped, not moved back
+    op.drop_table("processing_jobs_archive")
@@ -0,0 +1,38 @@
+"""Processing job leases
+
+Revision ID: e8b1c4f7a3d2
+Revises: d4e7a2b9c5f1
+Create Date: 2026-03-02 11:42:05.871306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b1c4f7a3d2"
+down_revision: Union[str, None] = "d4e7a2b9c5f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing jobs hold no lease: the next restart may resume them
+    op.add_column(
+        "processing_jobs", sa.Column("claimed_by", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "processing_jobs",
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("processing_jobs") as batch_op:
+        batch_op.drop_column("claimed_until")
+        batch_op.drop_column("claimed_by")
@@ -0,0 +1,44 @@
+"""Processing jobs archive history indexes
+
+Revision ID: f2a6d9c3e7b4
+Revises: e8b1c4f7a3d2
+Create Date: 2026-03-02 16:05:37.240918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a6d9c3e7b4"
+down_revision: Union[str, None] = "e8b1c4f7a3d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_processing_jobs_archive_user_id_created_at",
+        "processing_jobs_archive",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_processing_jobs_archive_user_id_status_created_at",
+        "processing_jobs_archive",
+        ["user_id", "status", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_processing_jobs_archive_user_id_status_created_at",
+        table_name="processing_jobs_archive",
+    )
+    op.drop_index(
+        "ix_processing_jobs_archive_user_id_created_at",
+        table_name="processing_jobs_archive",
+    )
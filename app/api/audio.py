@@ -1,7 +1,10 @@
+from app.core.config import settings
 from app.api.deps import AudioServiceDep, AuthUserDep
+from datetime import datetime
+from typing import List, Optional, cast
 from pydantic import BaseModel
 
-from fastapi import APIRouter, UploadFile, status
+from fastapi import APIRouter, Query, UploadFile, status
 
 
 router = APIRouter()
@@ -11,11 +14,43 @@ class AudioUploadResponse(BaseModel):
     audio_id: str
 
 
+class AudioOut(BaseModel):
+    audio_id: str
+    filename: str
+    created_at: datetime
+
+
+class AudioListResponse(BaseModel):
+    items: List[AudioOut]
+    next_cursor: Optional[str]
+
+
+@router.get("/", status_code=status.HTTP_200_OK, response_model=AudioListResponse)
+async def list_audio(
+    current_user: AuthUserDep,
+    service: AudioServiceDep,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=settings.HISTORY_PAGE_MAX_SIZE),
+) -> AudioListResponse:
+    """List the current user's uploads, newest first, a page at a time."""
+
+    result = await service.list_audio(
+        cast(int, current_user.id),
+        created_from=created_from,
+        created_to=created_to,
+        cursor=cursor,
+        limit=limit,
+    )
+    return AudioListResponse(**result)
+
+
 @router.post(
     "/upload", status_code=status.HTTP_201_CREATED, response_model=AudioUploadResponse
 )
 async def upload_audio(
-    file: UploadFile, service: AudioServiceDep, current_user: AuthUserDep
+    file: UploadFile, current_user: AuthUserDep, service: AudioServiceDep
 ) -> AudioUploadResponse:
     """Upload an audio file and create an `AudioFile` record for the current user."""
 
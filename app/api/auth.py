@@ -2,20 +2,21 @@
 Authentication routes.
 """
 
-import secrets
 from typing import Dict
 
-from fastapi import APIRouter, Header, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 from sqlalchemy import select
 
 from app.api.deps import AuthUserDep, DBSessionDep, TokenUserDep
-from app.core.security import get_password_hash
+from app.core.security import api_token_prefix, generate_api_token, hash_api_token
+from app.db.unit_of_work import unit_of_work
 from app.models.user import APIToken, User
 from app.schemas.token import RefreshToken, Token
 from app.schemas.user import UserCreate, UserLogin, UserOut
 from app.services.auth import (
     authenticate_user,
     create_tokens_for_user,
+    password_hasher,
     refresh_access_token,
 )
 
@@ -25,6 +26,10 @@ router = APIRouter()
 @router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def create_user(user_data: UserCreate, db: DBSessionDep) -> User:
     """Register a new user."""
+    # Hash before the first query: the session holds no connection while
+    # the hash waits for a bcrypt thread
+    hashed_password = await password_hasher.hash(user_data.password)
+
     # Check if username or email already exists
     result = await db.execute(select(User).filter(User.username == user_data.username))
     existing_user = result.scalar_one_or_none()
@@ -37,11 +42,10 @@ async def create_user(user_data: UserCreate, db: DBSessionDep) -> User:
     # Create new user
     user = User(
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
     )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    async with unit_of_work(db):
+        db.add(user)
     return user
 
 
@@ -102,11 +106,33 @@ async def read_users_api_me(
 
 @router.post("/api-token")
 async def create_api_token(
-    db: DBSessionDep,
     user: AuthUserDep,
+    db: DBSessionDep,
 ) -> Dict:
-    token_value = secrets.token_hex(32)
-    db_token = APIToken(token=token_value, user_id=user.id)
-    db.add(db_token)
-    await db.commit()
-    return {"api_token": token_value}
+    """Create an API token; it is shown once, only its hash is stored."""
+    token_value = generate_api_token()
+    prefix = api_token_prefix(token_value)
+    db_token = APIToken(
+        prefix=prefix, token_hash=hash_api_token(token_value), user_id=user.id
+    )
+    async with unit_of_work(db):
+        db.add(db_token)
+    return {"api_token": token_value, "prefix": prefix}
+
+
+@router.delete("/api-token/{prefix}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_token(
+    prefix: str, user: AuthUserDep, db: DBSessionDep
+) -> Response:
+    """Revoke the current user's API tokens starting with `prefix`."""
+    result = await db.execute(
+        select(APIToken).filter(APIToken.prefix == prefix, APIToken.user_id == user.id)
+    )
+    tokens = result.scalars().all()
+    if not tokens:
+        raise HTTPException(status_code=404, detail="API token not found")
+    # Committing drops the tokens from the principal cache of this process
+    async with unit_of_work(db):
+        for token in tokens:
+            await db.delete(token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -2,44 +2,79 @@
 API dependencies.
 """
 
+import hmac
 from datetime import datetime
 from typing import Annotated, Optional, cast
 
-from app.repositories.audio import AudioFileRepository, AudioProcessingJobRepository
+from app.repositories.audio import (
+    ArchivedProcessingJobRepository,
+    AudioFileRepository,
+    AudioProcessingJobRepository,
+)
 from app.services.audio import AudioProcessingJobService, AudioService
-from fastapi import Depends, HTTPException, status, BackgroundTasks
+from fastapi import Depends, HTTPException, WebSocket, WebSocketException, status
 from fastapi.security import APIKeyHeader
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.security import api_token_prefix, hash_api_token, is_api_token
+from app.db.session import get_db, get_read_db
 from app.models.user import APIToken, User
 from app.schemas.token import TokenPayload
+from app.services.principal_cache import principal_cache
 
 DBSessionDep = Annotated[AsyncSession, Depends(get_db)]
+# Replica session for dependencies that only read; opens no connection unless used
+ReadDBSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+async def _load_user(db: AsyncSession, user_id: Optional[int]) -> Optional[User]:
+    """Fetch a user by id and cache it for the following requests."""
+
+    result = await db.execute(select(User).filter(User.id == user_id))
+    user = cast(Optional[User], result.scalar_one_or_none())
+    if user is not None:
+        principal_cache.put_user(user)
+    return user
+
+
+async def _find_token_user_id(
+    db: AsyncSession, api_token: str, token_hash: str
+) -> Optional[int]:
+    result = await db.execute(
+        select(APIToken.token_hash, APIToken.user_id).filter(
+            APIToken.prefix == api_token_prefix(api_token)
+        )
+    )
+    user_id = None
+    for stored_hash, candidate_id in result.all():
+        if hmac.compare_digest(stored_hash, token_hash):
+            user_id = candidate_id
+    return cast(Optional[int], user_id)
 
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = APIKeyHeader(name="Authorization", auto_error=False)
 
 
-async def get_current_user(
-    db: DBSessionDep,
-    token: str = Depends(oauth2_scheme),
-) -> User:
-    """Get current user from JWT token."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_bearer_token(authorization: Optional[str]) -> TokenPayload:
+    """Validate an `Authorization: Bearer <jwt>` value, without the database."""
+
+    credentials_exception = _credentials_exception()
     try:
-        if not token:
+        if not authorization:
             raise credentials_exception
-        token_seg = token.split(" ")
+        token_seg = authorization.split(" ")
         if len(token_seg) != 2 or token_seg[0] != "Bearer":
             raise credentials_exception
 
@@ -51,34 +86,117 @@ async def get_current_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    return token_data
 
-    result = await db.execute(select(User).filter(User.id == token_data.user_id))
-    user = cast(Optional[User], result.scalar_one_or_none())
+
+async def get_token_payload(
+    token: Optional[str] = Depends(oauth2_scheme),
+) -> TokenPayload:
+    """Claims of the request's JWT; rejects the request before any session."""
+
+    return decode_bearer_token(token)
+
+
+TokenPayloadDep = Annotated[TokenPayload, Depends(get_token_payload)]
+
+
+async def get_current_user(
+    token_data: TokenPayloadDep, read_db: ReadDBSessionDep, db: DBSessionDep
+) -> User:
+    """Get current user from JWT token.
+
+    The token is checked first: dependencies resolve in order, so a request
+    with a missing or invalid token never opens a session. The user is read
+    from a replica; a user missing there may have just signed up, so the
+    primary is asked before the token is rejected.
+    """
+
+    user = (
+        principal_cache.get_user(token_data.user_id)
+        or await _load_user(read_db, token_data.user_id)
+        or await _load_user(db, token_data.user_id)
+    )
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
 AuthUserDep = Annotated[User, Depends(get_current_user)]
 
-api_key_header = APIKeyHeader(name="X-API-Token", auto_error=False)
 
+async def get_websocket_token_payload(websocket: WebSocket) -> TokenPayload:
+    """Claims of the JWT of a WebSocket, from its `token` query parameter.
 
-async def get_current_user_token(
-    db: DBSessionDep, api_token: str = Depends(api_key_header)
+    Browsers cannot set headers on WebSocket handshakes, so the JWT may be
+    passed as `?token=<jwt>`; an `Authorization` header is accepted as well.
+    """
+    token = websocket.query_params.get("token")
+    authorization = (
+        f"Bearer {token}" if token else websocket.headers.get("Authorization")
+    )
+    try:
+        return decode_bearer_token(authorization)
+    except HTTPException:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+
+
+async def get_websocket_user(
+    token_data: Annotated[TokenPayload, Depends(get_websocket_token_payload)],
+    read_db: ReadDBSessionDep,
+    db: DBSessionDep,
 ) -> User:
+    """Get current user of a WebSocket, once its token is known to be valid."""
+    try:
+        return await get_current_user(token_data, read_db, db)
+    except HTTPException:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+
+
+WebSocketUserDep = Annotated[User, Depends(get_websocket_user)]
+
+api_key_header = APIKeyHeader(name="X-API-Token", auto_error=False)
+
+
+async def get_api_token(api_token: Optional[str] = Depends(api_key_header)) -> str:
+    """The request's API token, rejected before any session when malformed."""
+
     if not api_token:
         raise HTTPException(status_code=401, detail="API token missing")
+    if not is_api_token(api_token):
+        # Could not have been issued: no need to look it up
+        raise HTTPException(status_code=401, detail="Invalid API token")
+    return api_token
 
-    result = await db.execute(
-        select(APIToken)
-        .options(selectinload(APIToken.user))
-        .filter(APIToken.token == api_token)
+
+async def get_current_user_token(
+    api_token: Annotated[str, Depends(get_api_token)],
+    read_db: ReadDBSessionDep,
+    db: DBSessionDep,
+) -> User:
+    """Get current user from an API token.
+
+    Tokens are stored as a public prefix and a keyed hash: the prefix index
+    finds the candidates, and their hashes are compared in constant time.
+    Like JWT users, tokens are looked up on a replica, then on the primary.
+    """
+    token_hash = hash_api_token(api_token)
+    user_id = principal_cache.get_token_user_id(token_hash)
+    if user_id is None:
+        user_id = await _find_token_user_id(
+            read_db, api_token, token_hash
+        ) or await _find_token_user_id(db, api_token, token_hash)
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Invalid API token")
+        principal_cache.put_token(token_hash, user_id)
+
+    user = (
+        principal_cache.get_user(user_id)
+        or await _load_user(read_db, user_id)
+        or await _load_user(db, user_id)
     )
-    token_record = cast(Optional[APIToken], result.scalar_one_or_none())
-    if not token_record:
+    if user is None:
         raise HTTPException(status_code=401, detail="Invalid API token")
-    return cast(User, token_record.user)
+    return user
 
 
 TokenUserDep = Annotated[User, Depends(get_current_user_token)]
@@ -94,12 +212,17 @@ AudioServiceDep = Annotated[AudioService, Depends(get_audio_service)]
 
 
 def get_audio_processing_job_service(
-    db: DBSessionDep, background_tasks: BackgroundTasks
+    db: DBSessionDep, read_db: ReadDBSessionDep
 ) -> AudioProcessingJobService:
     """Get the audio processing job service."""
     job_repo = AudioProcessingJobRepository(db)
     audio_repo = AudioFileRepository(db)
-    return AudioProcessingJobService(job_repo, audio_repo, background_tasks)
+    return AudioProcessingJobService(
+        job_repo,
+        audio_repo,
+        reader=AudioProcessingJobRepository(read_db),
+        archive=ArchivedProcessingJobRepository(read_db),
+    )
 
 
 AudioProcessJobServiceDep = Annotated[
@@ -2,9 +2,12 @@
 Health check endpoints.
 """
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from typing import Dict
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.db.session import sessionmanager
 
 router = APIRouter()
 
@@ -20,3 +23,15 @@ class HealthStatusOutput(BaseModel):
 async def health_check() -> Dict:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@router.get("/health/db", status_code=status.HTTP_200_OK, include_in_schema=False)
+async def database_pool_metrics() -> Dict[str, Any]:
+    """Connection pool occupancy and checkout wait times of this process.
+
+    Off unless `DB_POOL_METRICS_ENDPOINT` is set: the metrics describe the
+    deployment, replica hosts included.
+    """
+    if not settings.DB_POOL_METRICS_ENDPOINT:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return sessionmanager.pool_metrics()
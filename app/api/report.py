@@ -1,8 +1,34 @@
-from app.api.deps import AudioProcessJobServiceDep, AuthUserDep
-from app.schemas.report import AudioJobStatusOut, ReportCreate, ReportCreateOut
+from app.core.config import settings
+from app.api.deps import AudioProcessJobServiceDep, AuthUserDep, WebSocketUserDep
+from app.schemas.report import (
+    AudioJobBatchStatusOut,
+    AudioJobStatusOut,
+    JobBatchStatusQuery,
+    JobHistoryOut,
+    ReportBatchCreate,
+    ReportBatchCreateOut,
+    ReportCreate,
+    ReportCreateOut,
+    ReportExportQuery,
+)
+
+from app.models.audio import JobStatus
+from app.services.renderers.base import ReportFormat
+from app.services.events import format_sse
+from datetime import datetime
+from typing import Optional, cast
 
-from fastapi import APIRouter, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketException,
+    status,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()
 
@@ -14,13 +40,115 @@ async def generate_report(
     report_create: ReportCreate,
     current_user: AuthUserDep,
     service: AudioProcessJobServiceDep,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> ReportCreateOut:
     """Create a background processing job for the provided audio id.
 
-    Returns the created job metadata (id, status, message).
+    Returns the created job metadata (id, status, message). Retries sending
+    the same `Idempotency-Key` get the original job back.
     """
 
-    response = await service.create_bg_task(report_create=report_create)
+    response = await service.create_bg_task(
+        report_create=report_create,
+        requester_id=cast(int, current_user.id),
+        idempotency_key=idempotency_key,
+    )
+    return ReportCreateOut(**response)
+
+
+@router.post(
+    "/generate/batch",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ReportBatchCreateOut,
+)
+async def generate_reports_batch(
+    batch: ReportBatchCreate,
+    current_user: AuthUserDep,
+    service: AudioProcessJobServiceDep,
+) -> ReportBatchCreateOut:
+    """Create processing jobs for many audio ids owned by the current user."""
+
+    response = await service.create_bg_tasks(batch, cast(int, current_user.id))
+    return ReportBatchCreateOut(**response)
+
+
+@router.post(
+    "/status/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=AudioJobBatchStatusOut,
+)
+async def get_job_statuses(
+    query: JobBatchStatusQuery,
+    current_user: AuthUserDep,
+    service: AudioProcessJobServiceDep,
+) -> AudioJobBatchStatusOut:
+    """Return the status of many jobs; unknown or foreign ids are omitted."""
+
+    result = await service.get_job_statuses(query.job_ids, cast(int, current_user.id))
+    return AudioJobBatchStatusOut(**result)
+
+
+@router.get("/jobs", status_code=status.HTTP_200_OK, response_model=JobHistoryOut)
+async def list_jobs(
+    current_user: AuthUserDep,
+    service: AudioProcessJobServiceDep,
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=settings.HISTORY_PAGE_MAX_SIZE),
+) -> JobHistoryOut:
+    """List the current user's jobs, newest first.
+
+    Pass the returned `next_cursor` as `cursor` to get the next page; it is
+    `null` on the last one.
+    """
+
+    result = await service.list_jobs(
+        cast(int, current_user.id),
+        status=job_status,
+        created_from=created_from,
+        created_to=created_to,
+        cursor=cursor,
+        limit=limit,
+    )
+    return JobHistoryOut(**result)
+
+
+@router.post("/export", status_code=status.HTTP_200_OK)
+async def export_reports(
+    query: ReportExportQuery,
+    current_user: AuthUserDep,
+    service: AudioProcessJobServiceDep,
+) -> StreamingResponse:
+    """Download the current user's reports, selected by id or date range, as a ZIP."""
+
+    return await service.export_reports(query, cast(int, current_user.id))
+
+
+@router.post(
+    "/retry/{job_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ReportCreateOut,
+)
+async def retry_report(
+    job_id: str, current_user: AuthUserDep, service: AudioProcessJobServiceDep
+) -> ReportCreateOut:
+    """Resume a failed job from the first stage that did not complete."""
+
+    response = await service.retry_job(job_id, cast(int, current_user.id))
+    return ReportCreateOut(**response)
+
+
+@router.post(
+    "/cancel/{job_id}", status_code=status.HTTP_200_OK, response_model=ReportCreateOut
+)
+async def cancel_report(
+    job_id: str, current_user: AuthUserDep, service: AudioProcessJobServiceDep
+) -> ReportCreateOut:
+    """Cancel a queued or running job; it is marked `cancelled` with its stage."""
+
+    response = await service.cancel_job(job_id, cast(int, current_user.id))
     return ReportCreateOut(**response)
 
 
@@ -28,18 +156,76 @@ async def generate_report(
     "/status/{job_id}", status_code=status.HTTP_200_OK, response_model=AudioJobStatusOut
 )
 async def get_job_status(
-    job_id: str, service: AudioProcessJobServiceDep, current_user: AuthUserDep
+    job_id: str,
+    current_user: AuthUserDep,
+    service: AudioProcessJobServiceDep,
+    wait: Optional[float] = Query(None, gt=0, le=settings.STATUS_LONG_POLL_MAX_SECONDS),
+    since: Optional[JobStatus] = None,
 ) -> AudioJobStatusOut:
-    """Return the current status and any error for a processing job."""
+    """Return the current status and any error for a processing job.
+
+    Pass `wait` (seconds) to long-poll: the response is held until the
+    status differs from `since` (default: the current status) or the
+    timeout passes, whichever comes first.
+    """
 
-    result = await service.get_job_status(job_id)
+    result = await service.get_job_status(job_id, wait=wait, since=since)
     return AudioJobStatusOut(**result)
 
 
+@router.get("/events/{job_id}", status_code=status.HTTP_200_OK)
+async def stream_job_events(
+    job_id: str, current_user: AuthUserDep, service: AudioProcessJobServiceDep
+) -> StreamingResponse:
+    """Stream stage transitions and progress of a job as Server-Sent Events.
+
+    The first event is the current status; the stream ends after the
+    `completed`, `failed` or `cancelled` event.
+    """
+
+    events = await service.stream_job_events(job_id, cast(int, current_user.id))
+    return StreamingResponse(
+        (format_sse(event) async for event in events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws/{job_id}")
+async def job_events_websocket(
+    websocket: WebSocket,
+    job_id: str,
+    current_user: WebSocketUserDep,
+    service: AudioProcessJobServiceDep,
+) -> None:
+    """WebSocket variant of `/events/{job_id}` sending each event as JSON."""
+
+    try:
+        events = await service.stream_job_events(job_id, cast(int, current_user.id))
+    except HTTPException as exc:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail)
+        )
+
+    await websocket.accept()
+    async for event in events:
+        await websocket.send_json(jsonable_encoder(event))
+    await websocket.close()
+
+
 @router.get("/download/{job_id}", status_code=status.HTTP_200_OK)
 async def download_report(
-    job_id: str, current_user: AuthUserDep, service: AudioProcessJobServiceDep
-) -> FileResponse:
-    """Return the generated PDF report file for the given job id."""
+    job_id: str,
+    current_user: AuthUserDep,
+    service: AudioProcessJobServiceDep,
+    format: ReportFormat = Query(ReportFormat.PDF),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+) -> Response:
+    """Return the generated report file for the given job id, in `format`.
+
+    Supports conditional (`If-None-Match`) and partial (`Range`) requests.
+    """
 
-    return await service.download_report(job_id=job_id)
+    return await service.download_report(
+        job_id=job_id, report_format=format, if_none_match=if_none_match
+    )
@@ -25,6 +25,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Key of the HMAC under which API tokens are stored; changing it
+    # invalidates every issued API token. Unset, a key is derived from
+    # SECRET_KEY with HKDF (see app.core.security.api_token_hash_key)
+    API_TOKEN_HASH_KEY: str = os.getenv("API_TOKEN_HASH_KEY", "")
+
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
 
@@ -66,6 +71,60 @@ class Settings(BaseSettings):
             return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         return f"{self.DB_ENGINE}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    # Connection pool: connections kept open, extra ones opened under load,
+    # how long a request may wait for one (seconds), and how old (seconds) a
+    # connection may get before it is replaced
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    # Test connections on checkout, so a restarted server costs no request
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Serve pool metrics (they name the replica hosts) on `/health/db`; only
+    # enable where the endpoint is not reachable from outside
+    DB_POOL_METRICS_ENDPOINT: bool = (
+        os.getenv("DB_POOL_METRICS_ENDPOINT", "false").lower() == "true"
+    )
+    # Statements running longer are cancelled (PostgreSQL only, 0 disables)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+    # Connect through PgBouncer in transaction mode (no prepared statement
+    # cache); EVENT_BROKER=postgres is refused then, LISTEN needs a session
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+
+    # SQLite files run in WAL mode with these pragmas; with a single writer,
+    # every primary session of a process queues on one connection while
+    # read-only sessions use a pool
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS", 5000))
+    DB_SQLITE_SYNCHRONOUS: str = os.getenv("DB_SQLITE_SYNCHRONOUS", "NORMAL")
+    DB_SQLITE_SINGLE_WRITER: bool = (
+        os.getenv("DB_SQLITE_SINGLE_WRITER", "false").lower() == "true"
+    )
+
+    # Read replicas (comma-separated URLs) serving read-only requests while
+    # healthy and at most DB_REPLICA_MAX_LAG_SECONDS behind the primary
+    DB_REPLICA_URLS: str = os.getenv("DB_REPLICA_URLS", "")
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(
+        os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 5)
+    )
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = float(
+        os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", 5)
+    )
+    # Jobs created or updated this recently are read from the primary
+    DB_READ_YOUR_WRITES_SECONDS: float = float(
+        os.getenv("DB_READ_YOUR_WRITES_SECONDS", 10)
+    )
+
+    @property
+    def DATABASE_REPLICA_URLS(self) -> List[str]:
+        """Replica URLs, in the driver of `DATABASE_URL` when not given."""
+        urls = [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+        if self.DB_ENGINE == "postgresql":
+            return [
+                url.replace("postgresql://", "postgresql+asyncpg://") for url in urls
+            ]
+        return urls
+
     @property
     def TEST_DATABASE_URL(self) -> str:
         """Construct database URL based on configuration."""
@@ -93,9 +152,135 @@ class Settings(BaseSettings):
         "DEFAULT_MISTRAL_MODEL", "mistral-medium-latest"
     )
 
+    # Timeouts (seconds) of provider HTTP calls
+    PROVIDER_CONNECT_TIMEOUT: float = float(os.getenv("PROVIDER_CONNECT_TIMEOUT", 10))
+    PROVIDER_READ_TIMEOUT: float = float(os.getenv("PROVIDER_READ_TIMEOUT", 300))
+
+    # Stage deadlines (seconds): a fixed part plus a part per second of audio
+    TRANSCRIPTION_DEADLINE_SECONDS: float = float(
+        os.getenv("TRANSCRIPTION_DEADLINE_SECONDS", 300)
+    )
+    TRANSCRIPTION_DEADLINE_PER_AUDIO_SECOND: float = float(
+        os.getenv("TRANSCRIPTION_DEADLINE_PER_AUDIO_SECOND", 1.0)
+    )
+    SUMMARIZATION_DEADLINE_SECONDS: float = float(
+        os.getenv("SUMMARIZATION_DEADLINE_SECONDS", 180)
+    )
+    SUMMARIZATION_DEADLINE_PER_AUDIO_SECOND: float = float(
+        os.getenv("SUMMARIZATION_DEADLINE_PER_AUDIO_SECOND", 0.1)
+    )
+    RENDERING_DEADLINE_SECONDS: float = float(
+        os.getenv("RENDERING_DEADLINE_SECONDS", 60)
+    )
+    RENDERING_DEADLINE_PER_AUDIO_SECOND: float = float(
+        os.getenv("RENDERING_DEADLINE_PER_AUDIO_SECOND", 0.02)
+    )
+
+    # Job progress events: "memory" (single node) or "postgres" (LISTEN/NOTIFY)
+    EVENT_BROKER: str = os.getenv("EVENT_BROKER", "memory")
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", 100))
+    EVENT_KEEPALIVE_SECONDS: float = float(os.getenv("EVENT_KEEPALIVE_SECONDS", 15))
+    # Upper bound of the `wait` parameter of long-polled status requests
+    STATUS_LONG_POLL_MAX_SECONDS: float = float(
+        os.getenv("STATUS_LONG_POLL_MAX_SECONDS", 60)
+    )
+
+    # Completion webhooks, signed with HMAC-SHA256 and retried with backoff.
+    # Each callback is signed with its own secret, derived from this key and
+    # returned when the job is created; without it webhooks are refused
+    WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
+    WEBHOOK_CONCURRENCY: int = int(os.getenv("WEBHOOK_CONCURRENCY", 8))
+    WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", 8))
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = float(
+        os.getenv("WEBHOOK_BACKOFF_BASE_SECONDS", 5)
+    )
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = float(
+        os.getenv("WEBHOOK_BACKOFF_MAX_SECONDS", 3600)
+    )
+    WEBHOOK_TIMEOUT_SECONDS: float = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", 10))
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = float(
+        os.getenv("WEBHOOK_POLL_INTERVAL_SECONDS", 5)
+    )
+    # Callbacks resolving to loopback, private, link-local or reserved
+    # addresses are refused unless this is set (local development only)
+    WEBHOOK_ALLOW_PRIVATE_URLS: bool = (
+        os.getenv("WEBHOOK_ALLOW_PRIVATE_URLS", "false").lower() == "true"
+    )
+
+    # Users resolved from JWTs and API tokens are cached this long in each
+    # process (0 disables the cache), up to this many entries
+    AUTH_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 30))
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+
+    # bcrypt runs on this many threads; beyond this many hashes running or
+    # waiting, login and signup answer 503 with Retry-After
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    # Failed logins allowed per username within the window, then 429
+    LOGIN_MAX_ATTEMPTS: int = int(os.getenv("LOGIN_MAX_ATTEMPTS", 10))
+    LOGIN_ATTEMPT_WINDOW_SECONDS: float = float(
+        os.getenv("LOGIN_ATTEMPT_WINDOW_SECONDS", 300)
+    )
+
     # directories to upload audio file and reports
     AUDIO_UPLOAD_DIR: str = os.getenv("AUDIO_UPLOAD_DIR", "uploads")
     REPORT_UPLOAD_DIR: str = os.getenv("REPORT_UPLOAD_DIR", "reports")
+    # Reports rendered on demand in other formats, keyed by content hash
+    REPORT_CACHE_DIR: str = os.getenv("REPORT_CACHE_DIR", "reports/cache")
+    # Sent with downloaded reports, which never change once rendered. Reports
+    # require authentication, so shared caches are opt-in ("public, ...")
+    REPORT_CACHE_CONTROL: str = os.getenv(
+        "REPORT_CACHE_CONTROL", "private, max-age=31536000, immutable"
+    )
+
+    # Pipeline scheduling: global and per-user concurrency, priority weights
+    PIPELINE_MAX_CONCURRENCY: int = int(os.getenv("PIPELINE_MAX_CONCURRENCY", 4))
+    PIPELINE_PER_USER_CONCURRENCY: int = int(
+        os.getenv("PIPELINE_PER_USER_CONCURRENCY", 2)
+    )
+    PIPELINE_INTERACTIVE_WEIGHT: float = float(
+        os.getenv("PIPELINE_INTERACTIVE_WEIGHT", 4.0)
+    )
+    PIPELINE_BULK_WEIGHT: float = float(os.getenv("PIPELINE_BULK_WEIGHT", 1.0))
+    # Initial guess of pipeline runtime per second of audio, refined at runtime
+    PIPELINE_SECONDS_PER_AUDIO_SECOND: float = float(
+        os.getenv("PIPELINE_SECONDS_PER_AUDIO_SECOND", 0.5)
+    )
+    # Used to estimate the duration of compressed audio from its size (128 kbps)
+    AUDIO_BYTES_PER_SECOND: int = int(os.getenv("AUDIO_BYTES_PER_SECOND", 16000))
+
+    # Maximum number of audio files or jobs accepted by one batch request
+    REPORT_BATCH_MAX_SIZE: int = int(os.getenv("REPORT_BATCH_MAX_SIZE", 500))
+    # Largest page of the audio and job history lists
+    HISTORY_PAGE_MAX_SIZE: int = int(os.getenv("HISTORY_PAGE_MAX_SIZE", 100))
+
+    # Report template, and TTF fonts (regular and bold) for non-Latin text
+    REPORT_TEMPLATE: str = os.getenv("REPORT_TEMPLATE", "default")
+    REPORT_FONT_PATH: str = os.getenv("REPORT_FONT_PATH", "")
+    REPORT_FONT_BOLD_PATH: str = os.getenv("REPORT_FONT_BOLD_PATH", "")
+
+    # Worker processes rendering PDFs (0 renders in a thread of the API
+    # process) and how many renders may run or wait in them at once
+    PDF_RENDER_PROCESSES: int = int(os.getenv("PDF_RENDER_PROCESSES", 2))
+    PDF_RENDER_MAX_CONCURRENCY: int = int(os.getenv("PDF_RENDER_MAX_CONCURRENCY", 4))
+
+    # Reschedule unfinished jobs whose lease expired from their last
+    # checkpoint, on startup and every third of JOB_LEASE_SECONDS
+    RESUME_INTERRUPTED_JOBS: bool = (
+        os.getenv("RESUME_INTERRUPTED_JOBS", "true").lower() == "true"
+    )
+
+    # Jobs queued or running in a worker are leased to it this long, renewed
+    # every third of it; only jobs whose lease expired are resumed
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", 60))
+
+    # Finished jobs older than this move to `processing_jobs_archive`, in
+    # batches, checked every interval (0 disables archival)
+    JOB_ARCHIVE_AFTER_DAYS: float = float(os.getenv("JOB_ARCHIVE_AFTER_DAYS", 30))
+    JOB_ARCHIVE_BATCH_SIZE: int = int(os.getenv("JOB_ARCHIVE_BATCH_SIZE", 1000))
+    JOB_ARCHIVE_INTERVAL_SECONDS: float = float(
+        os.getenv("JOB_ARCHIVE_INTERVAL_SECONDS", 3600)
+    )
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
@@ -2,9 +2,14 @@
 Security utilities for authentication and authorization.
 """
 
+import hashlib
+import hmac
+import secrets
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union, cast
 
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from jose import jwt
 from passlib.context import CryptContext
 
@@ -13,6 +18,13 @@ from app.core.config import settings
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Leading characters of an API token stored in clear to look it up
+API_TOKEN_PREFIX_LENGTH = 8
+# Longest API token looked up; `generate_api_token` returns 64 characters
+API_TOKEN_MAX_LENGTH = 256
+# HKDF label of the API token hash key derived from SECRET_KEY
+API_TOKEN_HASH_KEY_INFO = b"report-generator/api-token-hash/v1"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -24,6 +36,46 @@ def get_password_hash(password: str) -> str:
     return cast(str, pwd_context.hash(password))
 
 
+def generate_api_token() -> str:
+    """Generate a new random API token."""
+    return secrets.token_hex(32)
+
+
+def is_api_token(token: str) -> bool:
+    """Whether `token` is short enough to be worth looking up.
+
+    Only the length is bounded: tokens issued before `generate_api_token`
+    need not be hex and stay valid.
+    """
+    return len(token) <= API_TOKEN_MAX_LENGTH
+
+
+def api_token_prefix(token: str) -> str:
+    """Return the public part of an API token used to find its record."""
+    return token[:API_TOKEN_PREFIX_LENGTH]
+
+
+def api_token_hash_key() -> bytes:
+    """Return the key of the HMAC under which API tokens are stored.
+
+    `API_TOKEN_HASH_KEY` when set; otherwise a key derived from `SECRET_KEY`
+    under its own HKDF label, so the JWT signing key is never used as is.
+    """
+    if settings.API_TOKEN_HASH_KEY:
+        return settings.API_TOKEN_HASH_KEY.encode()
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=API_TOKEN_HASH_KEY_INFO,
+    ).derive(settings.SECRET_KEY.encode())
+
+
+def hash_api_token(token: str) -> str:
+    """Return the keyed hash under which an API token is stored."""
+    return hmac.new(api_token_hash_key(), token.encode(), hashlib.sha256).hexdigest()
+
+
 def create_access_token(
     subject: Union[str, Any], user_id: str, expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -0,0 +1,74 @@
+"""
+Connection pool instrumented with checkout wait metrics.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, cast
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+
+
+@dataclass
+class PoolWaitStats:
+    """Time spent waiting for a connection, since the engine was created."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` timing every checkout, including timed out ones."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            self.wait_stats.wait_seconds_total += time.perf_counter() - started
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return entry
+
+    def recreate(self) -> "MeteredQueuePool":
+        # `dispose()` swaps in a new pool; keep counting where we left off
+        pool = cast(MeteredQueuePool, super().recreate())
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+def pool_metrics(pool: Pool) -> Dict[str, Any]:
+    """Occupancy of `pool`, plus its wait statistics when it is metered."""
+
+    metrics: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # Negative while the pool has not opened `size` connections yet
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    stats = getattr(pool, "wait_stats", None)
+    if stats is not None:
+        metrics.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_seconds_total=round(stats.wait_seconds_total, 6),
+            wait_seconds_max=round(stats.wait_seconds_max, 6),
+        )
+    return metrics
@@ -0,0 +1,117 @@
+"""
+Read replicas: health and lag tracking, and read-your-writes stickiness.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary; 0 when it has replayed
+# everything it received, so an idle primary does not look like lag
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery()"
+    " OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+NO_LAG_QUERY = text("SELECT 0")
+
+
+class Replica:
+    """A replica engine and what its last health check found."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        # Unknown until checked: reads stay on the primary meanwhile
+        self.healthy = False
+        self.lag: Optional[float] = None
+
+    async def check(self, timeout: float) -> None:
+        query = (
+            POSTGRES_LAG_QUERY
+            if self.engine.dialect.name == "postgresql"
+            else NO_LAG_QUERY
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as connection:
+                    lag = (await connection.execute(query)).scalar()
+        except Exception as exc:
+            if self.healthy:
+                logger.warning("Replica %s is unhealthy: %s", self.engine.url, exc)
+            self.healthy, self.lag = False, None
+            return
+        self.healthy, self.lag = True, float(lag or 0)
+
+
+class ReplicaSet:
+    """Replicas eligible for reads: healthy and at most `max_lag` seconds behind."""
+
+    def __init__(self, engines: Sequence[AsyncEngine], max_lag: float):
+        self.replicas = [Replica(engine) for engine in engines]
+        self._max_lag = max_lag
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Return an eligible replica at random, None when there is none."""
+
+        eligible: List[AsyncEngine] = [
+            replica.engine
+            for replica in self.replicas
+            if replica.healthy
+            and replica.lag is not None
+            and replica.lag <= self._max_lag
+        ]
+        return random.choice(eligible) if eligible else None
+
+    async def check(self, timeout: float) -> None:
+        """Refresh the health and lag of every replica."""
+
+        await asyncio.gather(*(replica.check(timeout) for replica in self.replicas))
+
+    async def monitor(self, interval: float) -> None:
+        """Check the replicas every `interval` seconds, until cancelled."""
+
+        while True:
+            await self.check(timeout=interval)
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class RecentWrites:
+    """Keys written in the last `window` seconds, whose reads go to the primary.
+
+    Tracked in this process only; a request served by another process may
+    still read a replica, at most `DB_REPLICA_MAX_LAG_SECONDS` behind.
+    """
+
+    def __init__(self, window: float, capacity: int = 100000):
+        self._window = window
+        self._capacity = capacity
+        self._written: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, *keys: str) -> None:
+        expires = time.monotonic() + self._window
+        for key in keys:
+            self._written[key] = expires
+            self._written.move_to_end(key)
+        while len(self._written) > self._capacity:
+            self._written.popitem(last=False)
+
+    def contains(self, key: str) -> bool:
+        expires = self._written.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._written[key]
+            return False
+        return True
@@ -2,27 +2,145 @@
 Database session management.
 """
 
+import asyncio
 import contextlib
-from typing import Any, AsyncGenerator, AsyncIterator
+import uuid
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Sequence
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from app.core.config import settings
+from app.db.pool import MeteredQueuePool, pool_metrics
+from app.db.replicas import RecentWrites, ReplicaSet
+from app.db.sqlite import apply_pragmas, is_sqlite_file
+
+
+def engine_options(host: str) -> Dict[str, Any]:
+    """Engine arguments for `host`, from the `DB_*` pool settings."""
+
+    url = make_url(host)
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    if url.get_backend_name() == "sqlite" and not is_sqlite_file(host):
+        # In-memory databases live in their single connection, no pool to size
+        return options
+
+    options.update(
+        poolclass=MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.get_driver_name() != "asyncpg":
+        return options
+
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_PGBOUNCER:
+        # PgBouncer in transaction mode hands every transaction to any server
+        # connection: prepared statements must neither be cached nor reuse
+        # names, and startup parameters such as `statement_timeout` are
+        # refused, so the timeout is enforced client side instead
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["command_timeout"] = settings.DB_STATEMENT_TIMEOUT_MS / 1000
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    options["connect_args"] = connect_args
+    return options
 
 
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
-        self._engine = create_async_engine(host, **engine_kwargs)
-        self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
+    """Engines and sessions of the primary database, its replicas and readers.
+
+    SQLite files are opened in WAL mode. With `single_writer`, `session()`
+    uses one connection, so writes of this process queue in the pool rather
+    than failing with "database is locked", while `read_session()` gets a
+    pool of read-only connections that never wait for the writer. Reads
+    through `session()` queue with the writes, hence it is off by default.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        replicas: Sequence[str] = (),
+        max_replica_lag: float = 5.0,
+        single_writer: bool = False,
+    ):
+        self._reader: Optional[AsyncEngine] = None
+        if is_sqlite_file(host):
+            if single_writer:
+                self._reader = create_async_engine(host, **engine_kwargs)
+                apply_pragmas(self._reader, read_only=True)
+                engine_kwargs = {**engine_kwargs, "pool_size": 1, "max_overflow": 0}
+            self._engine = create_async_engine(host, **engine_kwargs)
+            apply_pragmas(self._engine)
+        else:
+            self._engine = create_async_engine(host, **engine_kwargs)
+        # Objects stay readable after the unit of work commits; reloading
+        # them would cost a SELECT each (and cannot happen lazily under asyncio)
+        self._sessionmaker = async_sessionmaker(
+            autocommit=False, bind=self._engine, expire_on_commit=False
+        )
+        self._replicas = ReplicaSet(
+            [create_async_engine(url, **engine_kwargs) for url in replicas],
+            max_replica_lag,
+        )
+        self._monitor: Optional["asyncio.Task[None]"] = None
+
+    async def start(self, check_interval: float = 5.0) -> None:
+        """Check the replicas now, then every `check_interval` seconds."""
+
+        if self._replicas.replicas and self._monitor is None:
+            await self._replicas.check(timeout=check_interval)
+            self._monitor = asyncio.create_task(self._replicas.monitor(check_interval))
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Checked out and overflow connections, and checkout wait times."""
+
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        metrics = pool_metrics(self._engine.pool)
+        if self._reader is not None:
+            metrics["reader"] = pool_metrics(self._reader.pool)
+        if self._replicas.replicas:
+            metrics["replicas"] = [
+                {
+                    "host": replica.engine.url.host,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag,
+                    **pool_metrics(replica.engine.pool),
+                }
+                for replica in self._replicas.replicas
+            ]
+        return metrics
 
     async def close(self) -> None:
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+            self._monitor = None
+        await self._replicas.dispose()
+        if self._reader is not None:
+            await self._reader.dispose()
+            self._reader = None
         await self._engine.dispose()
 
         self._engine = None
@@ -54,13 +172,48 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """A session for reads only, on a replica when one is eligible.
+
+        Falls back to the SQLite reader pool, or to the primary, when no
+        replica is configured, healthy and within the lag bound. Data written
+        moments ago may not be on a replica yet: callers needing it read
+        through `session()`.
+        """
+        if self._sessionmaker is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        engine = self._replicas.choose() or self._reader
+        session = self._sessionmaker(bind=engine) if engine else self._sessionmaker()
+        try:
+            yield session
+        finally:
+            await session.close()
+
 
 sessionmanager = DatabaseSessionManager(
     settings.DATABASE_URL,
-    # {"echo": settings.echo_sql}
+    engine_options(settings.DATABASE_URL),
+    replicas=settings.DATABASE_REPLICA_URLS,
+    max_replica_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    single_writer=settings.DB_SQLITE_SINGLE_WRITER,
 )
 
+# Jobs created or updated lately, whose reads must see the write
+recent_writes = RecentWrites(settings.DB_READ_YOUR_WRITES_SECONDS)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session of a request.
+
+    A session only checks a connection out of the pool at its first
+    statement, so requests rejected before any query hold none.
+    """
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with sessionmanager.read_session() as session:
+        yield session
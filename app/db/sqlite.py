@@ -0,0 +1,53 @@
+"""
+SQLite tuning for single-node deployments: pragmas applied on connect.
+"""
+
+from typing import Any, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+
+def is_sqlite_file(host: str) -> bool:
+    url = make_url(host)
+    return url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """Pragmas of every connection, from the `DB_SQLITE_*` settings.
+
+    WAL lets readers run while a write is in progress, and `synchronous=NORMAL`
+    is durable across application crashes in WAL mode (only a power loss may
+    drop the last transactions). `busy_timeout` makes a locked database wait
+    instead of failing at once.
+    """
+
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.DB_SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.DB_SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def apply_pragmas(engine: AsyncEngine, read_only: bool = False) -> None:
+    """Run `sqlite_pragmas` on each connection `engine` opens."""
+
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
@@ -0,0 +1,33 @@
+"""
+Unit of work: one transaction, committed once, around a service operation.
+"""
+
+import contextlib
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_DEPTH = "unit_of_work_depth"
+
+
+@contextlib.asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Commit everything the block did on `session`, or roll all of it back.
+
+    Repositories only add, flush and execute; the service operation owning
+    the block decides when its changes become visible. Nested blocks join
+    the outermost one, which alone commits.
+    """
+
+    depth = session.info.get(_DEPTH, 0)
+    session.info[_DEPTH] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            await session.commit()
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH] = depth
@@ -1,5 +1,14 @@
 from app.models.user import User, APIToken
-from app.models.audio import AudioFile, AudioProcessingJob
+from app.models.audio import AudioFile, AudioProcessingJob, ArchivedProcessingJob
+from app.models.webhook import WebhookDeadLetter, WebhookDelivery
 
 
-__all__ = ["User", "APIToken", "AudioFile", "AudioProcessingJob"]
+__all__ = [
+    "User",
+    "APIToken",
+    "AudioFile",
+    "AudioProcessingJob",
+    "ArchivedProcessingJob",
+    "WebhookDelivery",
+    "WebhookDeadLetter",
+]
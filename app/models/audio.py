@@ -1,6 +1,17 @@
 import enum
 
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, func, Enum
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -11,6 +22,22 @@ class JobStatus(str, enum.Enum):
     TRANSCRIBED = "transcribed"
     SUMMARIZED = "summarized"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class PipelineStage(str, enum.Enum):
+    QUEUED = "queued"
+    TRANSCRIPTION = "transcription"
+    SUMMARIZATION = "summarization"
+    RENDERING = "rendering"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class JobPriority(str, enum.Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
 
 
 class AudioFile(Base):
@@ -31,6 +58,11 @@ class AudioFile(Base):
         back_populates="audio_file",
     )
 
+    __table_args__ = (
+        # A user's uploads, newest first (keyset pagination on created_at, id)
+        Index("ix_audio_files_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
 
 class AudioProcessingJob(Base):
     """Model to store audio processing jobs corresponds to audio file."""
@@ -38,13 +70,39 @@ class AudioProcessingJob(Base):
     __tablename__ = "processing_jobs"
 
     id = Column(String, primary_key=True)
-    audio_id = Column(String, ForeignKey("audio_files.id"))
+    audio_id = Column(String, ForeignKey("audio_files.id"), index=True)
+    # Owner of the audio, copied here so a user's history needs no join
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     status = Column(
         Enum(JobStatus, name="job_status_enum"),
         nullable=False,
         default=JobStatus.CREATED,
     )
     error_message = Column(Text, nullable=True)
+    # Stage currently running, kept after a failure or cancellation
+    stage = Column(String, nullable=True)
+
+    # Stage checkpoints, a resumed job skips every stage whose output is stored.
+    transcript_id = Column(String, nullable=True)
+    transcript = Column(Text, nullable=True)
+    notes = Column(JSON, nullable=True)
+    report_path = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Client supplied `Idempotency-Key`, scoped to the requesting user, and a
+    # hash of the request it came with
+    idempotency_key = Column(String, nullable=True, unique=True, index=True)
+    request_fingerprint = Column(String, nullable=True)
+    # `<audio_id>:<pipeline config>` while the job runs, so identical requests
+    # coalesce onto it across API processes; cleared once the job ends
+    inflight_key = Column(String, nullable=True, unique=True, index=True)
+    # Receives a signed POST once the job is summarized or has failed
+    callback_url = Column(String, nullable=True)
+    # Worker that queued or runs the job, and until when; the worker renews
+    # the lease while it lives, a restart only resumes jobs whose lease ended
+    claimed_by = Column(String, nullable=True)
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -60,3 +118,66 @@ class AudioProcessingJob(Base):
         "AudioFile",
         back_populates="processing_jobs",
     )
+
+    __table_args__ = (
+        # A user's jobs newest first, optionally of one status
+        Index("ix_processing_jobs_user_id_created_at", "user_id", "created_at", "id"),
+        Index(
+            "ix_processing_jobs_user_id_status_created_at",
+            "user_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # Unfinished jobs (claimed on restart), by status
+        Index("ix_processing_jobs_status_created_at", "status", "created_at"),
+    )
+
+
+class ArchivedProcessingJob(Base):
+    """Finished job moved out of `processing_jobs` by the archiver.
+
+    Same columns as `AudioProcessingJob`, minus `inflight_key` (always
+    cleared once a job ends) and the worker lease, plus `archived_at`.
+    Read by id, and by user in the job history and exports.
+    """
+
+    __tablename__ = "processing_jobs_archive"
+
+    id = Column(String, primary_key=True)
+    audio_id = Column(String, nullable=True)
+    user_id = Column(Integer, nullable=True)
+    status: "Column[JobStatus]" = Column(
+        Enum(JobStatus, name="job_status_enum"), nullable=False
+    )
+    error_message = Column(Text, nullable=True)
+    stage = Column(String, nullable=True)
+    transcript_id = Column(String, nullable=True)
+    transcript = Column(Text, nullable=True)
+    notes = Column(JSON, nullable=True)
+    report_path = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    idempotency_key = Column(String, nullable=True)
+    callback_url = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        # The job history pages through both tables with the same keys
+        Index(
+            "ix_processing_jobs_archive_user_id_created_at",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_processing_jobs_archive_user_id_status_created_at",
+            "user_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+    )
@@ -20,7 +20,10 @@ class APIToken(Base):
     __tablename__ = "api_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    token = Column(String, unique=True, index=True, nullable=False)
+    # Public start of the token, indexed to find its row
+    prefix = Column(String, index=True, nullable=False)
+    # Keyed hash of the whole token; the token itself is never stored
+    token_hash = Column(String, unique=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     user = relationship("User", back_populates="tokens")
@@ -0,0 +1,38 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text, func
+
+from app.db.base import Base
+
+
+class WebhookDelivery(Base):
+    """Pending callback of a finished job, removed once it is delivered."""
+
+    __tablename__ = "webhook_deliveries"
+
+    id = Column(String, primary_key=True)
+    job_id = Column(String, ForeignKey("processing_jobs.id"), nullable=False)
+    url = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # Due time of the next attempt; pushed forward while a worker sends it
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class WebhookDeadLetter(Base):
+    """Callback that kept failing after every retry."""
+
+    __tablename__ = "webhook_dead_letters"
+
+    id = Column(String, primary_key=True)
+    job_id = Column(String, ForeignKey("processing_jobs.id"), nullable=False)
+    url = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    failed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -1,11 +1,27 @@
-from typing import Optional, cast
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
-from app.models.audio import AudioProcessingJob, JobStatus
+from app.models.audio import ArchivedProcessingJob, AudioProcessingJob, JobStatus
+from app.models.webhook import WebhookDeadLetter, WebhookDelivery
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import recent_writes
 from app.models import AudioFile
 from app.repositories.base import BaseRepository
 
-from sqlalchemy import select, update
+from sqlalchemy import (
+    Select,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 
@@ -15,6 +31,43 @@ class AudioFileRepository(BaseRepository[AudioFile]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, AudioFile)
 
+    async def get_owned_paths(
+        self, audio_ids: Sequence[str], user_id: int
+    ) -> Dict[str, str]:
+        """Return `{audio_id: file_path}` for the given ids owned by the user."""
+
+        query = select(AudioFile.id, AudioFile.file_path).where(
+            AudioFile.id.in_(audio_ids), AudioFile.user_id == user_id
+        )
+
+        result = await self.db.execute(query)
+        return {audio_id: file_path for audio_id, file_path in result.all()}
+
+    def owned_page_query(
+        self,
+        user_id: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 20,
+    ) -> Select:
+        """Query of one page of the user's uploads, newest first."""
+
+        query = select(AudioFile.id, AudioFile.filename, AudioFile.created_at).where(
+            AudioFile.user_id == user_id
+        )
+        if created_from is not None:
+            query = query.where(AudioFile.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(AudioFile.created_at < created_to)
+        return self.paginate(query, after, limit)
+
+    async def list_owned(self, user_id: int, **filters: Any) -> List[Any]:
+        """Return `(id, filename, created_at)` rows of `owned_page_query`."""
+
+        result = await self.db.execute(self.owned_page_query(user_id, **filters))
+        return list(result.all())
+
 
 class AudioProcessingJobRepository(BaseRepository[AudioProcessingJob]):
     """Repository for `AudioProcessingJob` model and related helper queries."""
@@ -22,18 +75,208 @@ class AudioProcessingJobRepository(BaseRepository[AudioProcessingJob]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, AudioProcessingJob)
 
-    async def get_with_audio(self, job_id: str) -> Optional[AudioProcessingJob]:
-        """Return a job joined with its related `AudioFile` by job id."""
+    async def get_with_audio(
+        self, job_id: str, user_id: int
+    ) -> Optional[AudioProcessingJob]:
+        """Return a job of the user, with its related `AudioFile`, by job id."""
 
         query = (
             select(AudioProcessingJob)
+            .join(AudioFile, AudioFile.id == AudioProcessingJob.audio_id)
             .options(selectinload(AudioProcessingJob.audio_file))
-            .where(AudioProcessingJob.id == job_id)
+            .where(AudioProcessingJob.id == job_id, AudioFile.user_id == user_id)
         )
 
         result = await self.db.execute(query)
         return cast(Optional[AudioProcessingJob], result.scalar_one_or_none())
 
+    async def get_owned_statuses(
+        self, job_ids: Sequence[str], user_id: int
+    ) -> List[Any]:
+        """Return `(id, status, error_message, report_path)` rows for the user's jobs.
+
+        A single query on the primary key index, joined to `audio_files` for
+        the ownership check.
+        """
+
+        query = (
+            select(
+                AudioProcessingJob.id,
+                AudioProcessingJob.status,
+                AudioProcessingJob.error_message,
+                AudioProcessingJob.report_path,
+            )
+            .join(AudioFile, AudioFile.id == AudioProcessingJob.audio_id)
+            .where(AudioProcessingJob.id.in_(job_ids), AudioFile.user_id == user_id)
+        )
+
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    def owned_page_query(
+        self,
+        user_id: int,
+        status: Optional[JobStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 20,
+    ) -> Select:
+        """Query of one page of the user's jobs, archived ones included, newest first.
+
+        Both tables are read through their `(user_id, [status,] created_at,
+        id)` indexes, and the two ordered ranges merged.
+        """
+
+        anchor = None
+        if after is not None:
+            # The cursor row may have been archived since the previous page
+            anchor = func.coalesce(
+                select(AudioProcessingJob.created_at)
+                .where(AudioProcessingJob.id == after)
+                .scalar_subquery(),
+                select(ArchivedProcessingJob.created_at)
+                .where(ArchivedProcessingJob.id == after)
+                .scalar_subquery(),
+            )
+        branches = []
+        for model in (AudioProcessingJob, ArchivedProcessingJob):
+            query = select(
+                model.id,
+                model.audio_id,
+                model.status,
+                model.error_message,
+                model.created_at,
+            ).where(model.user_id == user_id)
+            if status is not None:
+                query = query.where(model.status == status)
+            if created_from is not None:
+                query = query.where(model.created_at >= created_from)
+            if created_to is not None:
+                query = query.where(model.created_at < created_to)
+            if anchor is not None:
+                query = query.where(
+                    tuple_(model.created_at, model.id) < tuple_(anchor, literal(after))
+                )
+            branches.append(query)
+        jobs = union_all(*branches).subquery()
+        return (
+            select(jobs)
+            .order_by(jobs.c.created_at.desc(), jobs.c.id.desc())
+            .limit(limit + 1)
+        )
+
+    async def list_owned(self, user_id: int, **filters: Any) -> List[Any]:
+        """Return `(id, audio_id, status, error, created_at)` rows of a page."""
+
+        result = await self.db.execute(self.owned_page_query(user_id, **filters))
+        return list(result.all())
+
+    async def list_owned_reports(
+        self,
+        user_id: int,
+        job_ids: Optional[Sequence[str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[Tuple[str, str]]:
+        """Return `(id, report_path)` of the user's rendered reports, oldest first.
+
+        Jobs are selected by id and/or by creation time (`created_to` excluded),
+        archived ones included.
+        """
+
+        live = select(
+            AudioProcessingJob.id,
+            AudioProcessingJob.report_path,
+            AudioProcessingJob.created_at,
+        ).join(AudioFile, AudioFile.id == AudioProcessingJob.audio_id)
+        archived = select(
+            ArchivedProcessingJob.id,
+            ArchivedProcessingJob.report_path,
+            ArchivedProcessingJob.created_at,
+        )
+        branches = []
+        for model, query, owner in (
+            (AudioProcessingJob, live, AudioFile.user_id),
+            (ArchivedProcessingJob, archived, ArchivedProcessingJob.user_id),
+        ):
+            query = query.where(
+                owner == user_id,
+                model.status == JobStatus.SUMMARIZED,
+                model.report_path.is_not(None),
+            )
+            if job_ids is not None:
+                query = query.where(model.id.in_(job_ids))
+            if created_from is not None:
+                query = query.where(model.created_at >= created_from)
+            if created_to is not None:
+                query = query.where(model.created_at < created_to)
+            branches.append(query)
+        reports = union_all(*branches).subquery()
+        query = select(reports.c.id, reports.c.report_path).order_by(
+            reports.c.created_at, reports.c.id
+        )
+
+        result = await self.db.execute(query)
+        return [(job_id, report_path) for job_id, report_path in result.all()]
+
+    async def get_by_keys(
+        self, idempotency_key: Optional[str], inflight_key: Optional[str]
+    ) -> Optional[AudioProcessingJob]:
+        """Return the job matching the idempotency key or in-flight key."""
+
+        conditions = []
+        if idempotency_key is not None:
+            conditions.append(AudioProcessingJob.idempotency_key == idempotency_key)
+        if inflight_key is not None:
+            conditions.append(AudioProcessingJob.inflight_key == inflight_key)
+        if not conditions:
+            return None
+
+        query = select(AudioProcessingJob).where(or_(*conditions))
+        result = await self.db.execute(query)
+        jobs = list(result.scalars().all())
+        # An idempotency key match wins over a coalesced in-flight job
+        for job in jobs:
+            if idempotency_key is not None and job.idempotency_key == idempotency_key:
+                return job
+        return jobs[0] if jobs else None
+
+    async def get_inflight(self, inflight_keys: Sequence[str]) -> Dict[str, str]:
+        """Return `{inflight_key: job_id}` for keys with a running job."""
+
+        query = select(AudioProcessingJob.inflight_key, AudioProcessingJob.id).where(
+            AudioProcessingJob.inflight_key.in_(inflight_keys)
+        )
+
+        result = await self.db.execute(query)
+        return {key: job_id for key, job_id in result.all()}
+
+    async def create_or_get_existing(
+        self, job: AudioProcessingJob
+    ) -> tuple[AudioProcessingJob, bool]:
+        """Insert `job` unless a job with the same keys exists.
+
+        Returns the stored job and whether it was created. A concurrent insert
+        from another process surfaces as a unique violation, after which the
+        transaction is rolled back and the winning job is returned instead.
+        """
+
+        job_id = cast(str, job.id)
+        idempotency_key = cast(Optional[str], job.idempotency_key)
+        inflight_key = cast(Optional[str], job.inflight_key)
+        try:
+            job = await self.create(job)
+            recent_writes.mark(job_id)
+            return job, True
+        except IntegrityError:
+            await self.db.rollback()
+
+        existing = await self.get_by_keys(idempotency_key, inflight_key)
+        if existing is None:
+            raise RuntimeError("Job insert conflicted but no existing job was found")
+        return existing, False
+
     async def update_status(
         self, job_id: str, status: JobStatus, error: Optional[str] = None
     ) -> None:
@@ -46,4 +289,182 @@ class AudioProcessingJobRepository(BaseRepository[AudioProcessingJob]):
         )
 
         await self.db.execute(query)
-        await self.db.commit()
+        recent_writes.mark(job_id)
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> None:
+        await super().create_many(rows)
+        recent_writes.mark(*(row["id"] for row in rows))
+
+    async def save_checkpoint(self, job_id: str, **values: Any) -> bool:
+        """Persist the output of a finished stage (and optionally a new status).
+
+        Returns False, without writing, when the job has been cancelled.
+        """
+
+        query = (
+            update(AudioProcessingJob)
+            .where(
+                AudioProcessingJob.id == job_id,
+                AudioProcessingJob.status != JobStatus.CANCELLED,
+            )
+            .values(**values)
+        )
+
+        result = await self.db.execute(query)
+        recent_writes.mark(job_id)
+        return bool(result.rowcount)
+
+    async def cancel(self, job_id: str, **values: Any) -> bool:
+        """Mark an unfinished job cancelled, in the same UPDATE that checks it.
+
+        Returns False, without writing, when the job has completed, failed
+        or been cancelled in the meantime.
+        """
+
+        query = (
+            update(AudioProcessingJob)
+            .where(
+                AudioProcessingJob.id == job_id,
+                AudioProcessingJob.status.not_in(
+                    [JobStatus.FAILED, JobStatus.CANCELLED]
+                ),
+                AudioProcessingJob.report_path.is_(None),
+            )
+            .values(status=JobStatus.CANCELLED, **values)
+        )
+
+        result = await self.db.execute(query)
+        recent_writes.mark(job_id)
+        return bool(result.rowcount)
+
+    async def list_incomplete(self, now: datetime) -> List[AudioProcessingJob]:
+        """Return unfinished jobs no live worker holds a lease on, with their audio."""
+
+        query = (
+            select(AudioProcessingJob)
+            .options(selectinload(AudioProcessingJob.audio_file))
+            .where(
+                AudioProcessingJob.status.not_in(
+                    [JobStatus.FAILED, JobStatus.CANCELLED]
+                ),
+                AudioProcessingJob.report_path.is_(None),
+                _lease_expired(now),
+            )
+        )
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def claim(
+        self,
+        job_id: str,
+        attempts: int,
+        lease: Dict[str, Any],
+        expired_at: Optional[datetime] = None,
+    ) -> bool:
+        """Atomically bump the attempt counter and take the job's lease.
+
+        Only one caller wins a given attempt. With `expired_at`, the job is
+        only claimed if no worker holds a lease on it at that time.
+        """
+
+        query = (
+            update(AudioProcessingJob)
+            .where(
+                AudioProcessingJob.id == job_id,
+                AudioProcessingJob.attempts == attempts,
+            )
+            .values(attempts=attempts + 1, **lease)
+        )
+        if expired_at is not None:
+            query = query.where(_lease_expired(expired_at))
+
+        result = await self.db.execute(query)
+        return bool(result.rowcount)
+
+    async def renew_leases(self, worker_id: str, until: datetime) -> int:
+        """Extend the leases `worker_id` holds on its unfinished jobs."""
+
+        query = (
+            update(AudioProcessingJob)
+            .where(
+                AudioProcessingJob.claimed_by == worker_id,
+                AudioProcessingJob.status.not_in(
+                    [JobStatus.FAILED, JobStatus.CANCELLED]
+                ),
+                AudioProcessingJob.report_path.is_(None),
+            )
+            .values(claimed_until=until)
+        )
+
+        result = await self.db.execute(query)
+        return int(result.rowcount)
+
+
+def _lease_expired(now: datetime) -> Any:
+    return or_(
+        AudioProcessingJob.claimed_until.is_(None),
+        AudioProcessingJob.claimed_until < now,
+    )
+
+
+class ArchivedProcessingJobRepository(BaseRepository[ArchivedProcessingJob]):
+    """Repository for `processing_jobs_archive`, where finished jobs end up."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, ArchivedProcessingJob)
+
+    async def archive_finished(self, before: datetime, limit: int) -> List[str]:
+        """Move up to `limit` jobs finished and created before `before`.
+
+        Copies the rows into the archive and deletes them from
+        `processing_jobs` in the caller's transaction; returns their ids.
+        Jobs that webhook deliveries or dead letters still reference stay.
+        Rows are locked and already locked ones skipped (PostgreSQL), so
+        concurrent archivers and job updates do not step on each other.
+        """
+
+        job = AudioProcessingJob
+        query = (
+            select(job.id)
+            .where(
+                # Range scans of `ix_processing_jobs_status_created_at`
+                job.status.in_(
+                    [JobStatus.SUMMARIZED, JobStatus.FAILED, JobStatus.CANCELLED]
+                ),
+                job.created_at < before,
+                # Summarized but not rendered yet: still running
+                or_(job.status != JobStatus.SUMMARIZED, job.report_path.isnot(None)),
+                ~exists().where(WebhookDelivery.job_id == job.id),
+                ~exists().where(WebhookDeadLetter.job_id == job.id),
+            )
+            .order_by(job.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        job_ids = list((await self.db.execute(query)).scalars().all())
+        if not job_ids:
+            return []
+
+        columns = [
+            column.name
+            for column in ArchivedProcessingJob.__table__.columns
+            if column.name != "archived_at"
+        ]
+        # Owners of jobs older than the denormalized `user_id` come from audio
+        values = [
+            (
+                func.coalesce(job.user_id, AudioFile.user_id)
+                if name == "user_id"
+                else job.__table__.c[name]
+            )
+            for name in columns
+        ]
+        rows = (
+            select(*values)
+            .join(AudioFile, AudioFile.id == job.audio_id, isouter=True)
+            .where(job.id.in_(job_ids))
+        )
+        await self.db.execute(insert(ArchivedProcessingJob).from_select(columns, rows))
+        await self.db.execute(delete(job).where(job.id.in_(job_ids)))
+        return job_ids
@@ -1,7 +1,7 @@
-from typing import Generic, TypeVar, Type, Optional, cast, Protocol
+from typing import Any, Dict, Generic, List, TypeVar, Type, Optional, cast, Protocol
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, delete, insert, literal, select, tuple_, update
 
 from fastapi import HTTPException, status
 
@@ -14,30 +14,64 @@ ModelType = TypeVar("ModelType", bound=HasId)
 
 
 class BaseRepository(Generic[ModelType]):
+    """Queries on one model, in the transaction of the session.
+
+    Writes are flushed but never committed here: the service wraps them in
+    `unit_of_work`, which commits once for the whole operation.
+    """
+
     def __init__(self, db: AsyncSession, model: Type[ModelType]):
         self.db = db
         self.model = model
 
-    async def get(self, id: str) -> Optional[ModelType]:
-        stmt = select(self.model).where(self.model.id == id)
+    def paginate(self, query: Select, after: Optional[str], limit: int) -> Select:
+        """Newest rows first, starting after row `after`, plus one extra row.
+
+        Keyset pagination on `(created_at, id)`: the page starts right after
+        the position of the cursor row instead of skipping an offset, so it
+        stays an index range scan however deep the page. The cursor's
+        `created_at` is read back from its row, exactly as stored.
+        """
+        model = cast(Any, self.model)
+        if after is not None:
+            anchor = select(model.created_at).where(model.id == after)
+            query = query.where(
+                tuple_(model.created_at, model.id)
+                < tuple_(anchor.scalar_subquery(), literal(after))
+            )
+        order = (model.created_at.desc(), model.id.desc())
+        return query.order_by(*order).limit(limit + 1)
+
+    async def get(self, id: str) -> ModelType:
+        model = cast(Any, self.model)
+        stmt = select(model).where(model.id == id)
         result = await self.db.execute(stmt)
         record = result.scalar_one_or_none()
         if record:
-            return cast(Optional[ModelType], record)
+            return cast(ModelType, record)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Record does not exists."
         )
 
     async def create(self, obj: ModelType) -> ModelType:
+        """Insert `obj`; server defaults come back through `RETURNING`."""
         self.db.add(obj)
-        await self.db.commit()
-        await self.db.refresh(obj)
+        await self.db.flush([obj])
         return obj
 
+    async def create_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert all rows with a single multi-row INSERT."""
+        if not rows:
+            return
+        await self.db.execute(insert(self.model).values(rows))
+
+    async def update_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Update rows by primary key, each dict holding `id` and new values."""
+        if not rows:
+            return
+        await self.db.execute(update(self.model), rows)
+
     async def delete(self, id: str) -> bool:
-        obj = await self.get(id)
-        if not obj:
-            return False
-        await self.db.delete(obj)
-        await self.db.commit()
-        return True
+        model = cast(Any, self.model)
+        result = await self.db.execute(delete(model).where(model.id == id))
+        return bool(result.rowcount)
@@ -0,0 +1,136 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.webhook import WebhookDeadLetter, WebhookDelivery
+from app.repositories.base import BaseRepository
+
+# (delivery id, job id, url, payload, attempts so far, end of the caller's lease)
+DueDelivery = Tuple[str, str, str, Dict[str, Any], int, datetime]
+
+
+class WebhookDeliveryRepository(BaseRepository[WebhookDelivery]):
+    """Repository for the webhook outbox and its dead-letter table."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, WebhookDelivery)
+
+    async def enqueue(self, job_id: str, url: str, payload: Dict[str, Any]) -> None:
+        """Store a delivery, due immediately, in the current transaction."""
+
+        delivery = WebhookDelivery(
+            id=str(uuid.uuid4()),
+            job_id=job_id,
+            url=url,
+            payload=payload,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+        await self.create(delivery)
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> List[DueDelivery]:
+        """Lease up to `limit` due deliveries to the caller.
+
+        Leasing pushes `next_attempt_at` forward with a compare-and-swap, so
+        concurrent workers never send the same delivery twice, and a worker
+        dying mid-send only delays the delivery by the lease. The end of the
+        lease is returned with each delivery: outcomes are only recorded
+        while `next_attempt_at` still holds it.
+        """
+
+        now = datetime.now(timezone.utc)
+        query = (
+            select(
+                WebhookDelivery.id,
+                WebhookDelivery.job_id,
+                WebhookDelivery.url,
+                WebhookDelivery.payload,
+                WebhookDelivery.attempts,
+                WebhookDelivery.next_attempt_at,
+            )
+            .where(WebhookDelivery.next_attempt_at <= now)
+            .order_by(WebhookDelivery.next_attempt_at)
+            .limit(limit)
+        )
+        rows = (await self.db.execute(query)).all()
+
+        leased_until = now + timedelta(seconds=lease_seconds)
+        claimed: List[DueDelivery] = []
+        for delivery_id, job_id, url, payload, attempts, due in rows:
+            result = await self.db.execute(
+                update(WebhookDelivery)
+                .where(
+                    WebhookDelivery.id == delivery_id,
+                    WebhookDelivery.next_attempt_at == due,
+                )
+                .values(next_attempt_at=leased_until)
+            )
+            if result.rowcount:
+                claimed.append(
+                    (delivery_id, job_id, url, payload, attempts, leased_until)
+                )
+        return claimed
+
+    async def mark_delivered(self, delivery_id: str, leased_until: datetime) -> bool:
+        """Remove a delivery the receiver acknowledged, if still leased."""
+
+        result = await self.db.execute(
+            delete(WebhookDelivery).where(
+                WebhookDelivery.id == delivery_id,
+                WebhookDelivery.next_attempt_at == leased_until,
+            )
+        )
+        return bool(result.rowcount)
+
+    async def reschedule(
+        self,
+        delivery_id: str,
+        leased_until: datetime,
+        attempts: int,
+        next_attempt_at: datetime,
+        error: str,
+    ) -> bool:
+        """Record a failed attempt and when to try again, if still leased."""
+
+        result = await self.db.execute(
+            update(WebhookDelivery)
+            .where(
+                WebhookDelivery.id == delivery_id,
+                WebhookDelivery.next_attempt_at == leased_until,
+            )
+            .values(
+                attempts=attempts, next_attempt_at=next_attempt_at, last_error=error
+            )
+        )
+        return bool(result.rowcount)
+
+    async def dead_letter(
+        self, delivery_id: str, leased_until: datetime, attempts: int, error: str
+    ) -> bool:
+        """Move a delivery that ran out of retries to the dead-letter table.
+
+        Nothing is moved once the lease was lost to another worker.
+        """
+
+        query = select(WebhookDelivery).where(
+            WebhookDelivery.id == delivery_id,
+            WebhookDelivery.next_attempt_at == leased_until,
+        )
+        delivery = (await self.db.execute(query)).scalar_one_or_none()
+        if delivery is None:
+            return False
+        self.db.add(
+            WebhookDeadLetter(
+                id=delivery.id,
+                job_id=delivery.job_id,
+                url=delivery.url,
+                payload=delivery.payload,
+                attempts=attempts,
+                last_error=error,
+                created_at=delivery.created_at,
+            )
+        )
+        await self.db.delete(delivery)
+        return True
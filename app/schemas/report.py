@@ -1,18 +1,85 @@
-from typing import Optional
-from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from pydantic import AnyHttpUrl, BaseModel, Field, model_validator
+
+from app.core.config import settings
+from app.models.audio import JobPriority
 
 
 class ReportCreate(BaseModel):
     audio_id: str
+    priority: JobPriority = JobPriority.INTERACTIVE
+    callback_url: Optional[AnyHttpUrl] = None
 
 
 class ReportCreateOut(BaseModel):
     job_id: str
     status: str
     message: str
+    # Verifies the signatures of the job's webhooks; only returned on creation
+    webhook_secret: Optional[str] = None
+
+
+class ReportBatchCreate(BaseModel):
+    audio_ids: List[str] = Field(
+        min_length=1, max_length=settings.REPORT_BATCH_MAX_SIZE
+    )
+    priority: JobPriority = JobPriority.BULK
+    callback_url: Optional[AnyHttpUrl] = None
+
+
+class BatchJobOut(BaseModel):
+    audio_id: str
+    job_id: str
+    webhook_secret: Optional[str] = None
+
+
+class ReportBatchCreateOut(BaseModel):
+    jobs: List[BatchJobOut]
+    status: str
+    message: str
+
+
+class JobBatchStatusQuery(BaseModel):
+    job_ids: List[str] = Field(min_length=1, max_length=settings.REPORT_BATCH_MAX_SIZE)
+
+
+class ReportExportQuery(BaseModel):
+    """Reports to export: by job id, by creation time range, or both."""
+
+    job_ids: Optional[List[str]] = Field(
+        None, min_length=1, max_length=settings.REPORT_BATCH_MAX_SIZE
+    )
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "ReportExportQuery":
+        if (self.job_ids, self.created_from, self.created_to) == (None, None, None):
+            raise ValueError("Provide job_ids or a created_from/created_to range")
+        return self
 
 
 class AudioJobStatusOut(BaseModel):
     job_id: str
     status: str
     error: Optional[str]
+    queue_position: Optional[int] = None
+    estimated_start: Optional[datetime] = None
+
+
+class AudioJobBatchStatusOut(BaseModel):
+    jobs: List[AudioJobStatusOut]
+
+
+class JobHistoryItemOut(BaseModel):
+    job_id: str
+    audio_id: str
+    status: str
+    error: Optional[str]
+    created_at: datetime
+
+
+class JobHistoryOut(BaseModel):
+    items: List[JobHistoryItemOut]
+    next_cursor: Optional[str]
@@ -0,0 +1,87 @@
+"""
+Archival of finished jobs, keeping `processing_jobs` down to recent work.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import sessionmanager
+from app.db.unit_of_work import unit_of_work
+from app.repositories.audio import ArchivedProcessingJobRepository
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+class JobArchiver:
+    """Background worker moving old finished jobs to the archive table.
+
+    Every `interval` seconds, jobs finished and created more than
+    `after_days` days ago are moved in batches of `batch_size`, each batch
+    in its own short transaction so writers are never blocked for long.
+    Claiming, resuming and status lookups then only scan recent rows;
+    `/report/status` falls back to the archive for older jobs.
+    """
+
+    def __init__(
+        self,
+        after_days: float,
+        batch_size: int,
+        interval: float,
+        session_factory: SessionFactory = sessionmanager.session,
+    ):
+        self._after = timedelta(days=after_days)
+        self._batch_size = batch_size
+        self._interval = interval
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start archiving in the background, unless archival is disabled."""
+
+        if self._interval > 0 and self._after > timedelta(0):
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def archive(self) -> int:
+        """Archive every job due now; returns how many were moved."""
+
+        before = datetime.now(timezone.utc) - self._after
+        archived = 0
+        while True:
+            async with self._session_factory() as session, unit_of_work(session):
+                job_ids = await ArchivedProcessingJobRepository(
+                    session
+                ).archive_finished(before, self._batch_size)
+            archived += len(job_ids)
+            if len(job_ids) < self._batch_size:
+                return archived
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                archived = await self.archive()
+            except Exception:
+                logger.exception("Job archival round failed")
+            else:
+                if archived:
+                    logger.info("Archived %d finished jobs", archived)
+            await asyncio.sleep(self._interval)
+
+
+archiver = JobArchiver(
+    after_days=settings.JOB_ARCHIVE_AFTER_DAYS,
+    batch_size=settings.JOB_ARCHIVE_BATCH_SIZE,
+    interval=settings.JOB_ARCHIVE_INTERVAL_SECONDS,
+)
@@ -1,19 +1,121 @@
-from typing import Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, cast
+import asyncio
+import hashlib
+import logging
 import os
 import uuid
+from datetime import datetime, timezone
 
 from app.core.config import settings
-from app.models.audio import AudioFile, AudioProcessingJob, JobStatus
-from app.repositories.audio import AudioFileRepository, AudioProcessingJobRepository
-from app.schemas.report import ReportCreate
+from app.db.session import recent_writes, sessionmanager
+from app.db.unit_of_work import unit_of_work
+from app.models.audio import (
+    AudioFile,
+    AudioProcessingJob,
+    JobPriority,
+    JobStatus,
+    PipelineStage,
+)
+from app.repositories.audio import (
+    ArchivedProcessingJobRepository,
+    AudioFileRepository,
+    AudioProcessingJobRepository,
+)
+from app.repositories.webhook import WebhookDeliveryRepository
+from app.schemas.report import ReportBatchCreate, ReportCreate, ReportExportQuery
+from app.services.events import TERMINAL_EVENTS, JobEvent, JobEventBroker, broker
+from app.services.job_leases import lease
 from app.services.notes_generation.mistral_notes_generator import MistralNotesGenerator
-from app.services.pdf_generator import PDFReportGenerator
+from app.services.render_pool import RenderPool, render_pool
+from app.services.renderers.base import ReportFormat
+from app.services.renderers.registry import RENDERERS
+from app.services.report_cache import ReportCache, report_cache
+from app.services.scheduler import JobScheduler, scheduler
 from app.services.transcription.assemblyai import AssemblyAITranscriber
-from app.utils.storage import save_uploaded_file
+from app.services.transcription.base import TranscriptionFailed
+from app.services.webhooks import WebhookDispatcher, dispatcher
+from app.utils.conditional import etag_matches, file_etag
+from app.utils.pagination import decode_cursor, page
+from app.utils.singleflight import SingleFlight
+from app.utils.zipstream import archive_name, stream_zip
+from app.utils.storage import estimate_audio_duration, save_uploaded_file
+from app.utils.urls import UnsafeURL
 
 
-from fastapi import UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import UploadFile, HTTPException
+from pydantic import AnyHttpUrl
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+
+def pipeline_inflight_key(
+    audio_id: str, priority: JobPriority, callback_url: Optional[str]
+) -> str:
+    """Key identifying a run of the current pipeline configuration on an audio.
+
+    Only requests with the same priority and callback coalesce: a job runs
+    at one priority and calls back one URL, so any other request would lose
+    its webhook or wait behind bulk work.
+    """
+
+    config = "|".join(
+        [
+            settings.DEFAULT_ASSEMBLYAI_MODEL,
+            settings.DEFAULT_MISTRAL_MODEL,
+            priority.value,
+            callback_url or "",
+        ]
+    )
+    return f"{audio_id}:{hashlib.sha256(config.encode()).hexdigest()[:16]}"
+
+
+def request_fingerprint(report_create: ReportCreate) -> str:
+    """Hash of a report request, stored with its `Idempotency-Key`."""
+
+    return hashlib.sha256(report_create.model_dump_json().encode()).hexdigest()
+
+
+def stage_deadlines(audio_path: str) -> Dict[PipelineStage, float]:
+    """Return the deadline in seconds of each pipeline stage for an audio."""
+
+    duration = estimate_audio_duration(audio_path)
+    return {
+        PipelineStage.TRANSCRIPTION: settings.TRANSCRIPTION_DEADLINE_SECONDS
+        + settings.TRANSCRIPTION_DEADLINE_PER_AUDIO_SECOND * duration,
+        PipelineStage.SUMMARIZATION: settings.SUMMARIZATION_DEADLINE_SECONDS
+        + settings.SUMMARIZATION_DEADLINE_PER_AUDIO_SECOND * duration,
+        PipelineStage.RENDERING: settings.RENDERING_DEADLINE_SECONDS
+        + settings.RENDERING_DEADLINE_PER_AUDIO_SECOND * duration,
+    }
+
+
+class JobCancelled(Exception):
+    """Raised inside a pipeline whose job was cancelled."""
+
+
+_job_creation: SingleFlight[Dict] = SingleFlight()
+
+
+def _not_cancellable(job: AudioProcessingJob) -> HTTPException:
+    ended = "completed" if job.report_path else JobStatus(job.status).value
+    return HTTPException(
+        status_code=409,
+        detail=f"Only unfinished jobs can be cancelled, this one is {ended}.",
+    )
+
+
+def _created_job(job: AudioProcessingJob, created: bool) -> Dict:
+    """Result of a `create_bg_task` attempt, shared by coalesced requests."""
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "created": created,
+        "idempotency_key": job.idempotency_key,
+        "request_fingerprint": job.request_fingerprint,
+    }
 
 
 class AudioService:
@@ -35,7 +137,8 @@ class AudioService:
                 user_id=user_id,
             )
 
-            await self.repo.create(audio)
+            async with unit_of_work(self.repo.db):
+                await self.repo.create(audio)
 
         except Exception as exc:
             raise HTTPException(
@@ -45,6 +148,38 @@ class AudioService:
 
         return audio
 
+    async def list_audio(
+        self,
+        user_id: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict:
+        """Return one page of the user's uploads, newest first."""
+
+        rows = await self.repo.list_owned(
+            user_id,
+            created_from=created_from,
+            created_to=created_to,
+            after=_cursor_key(cursor),
+            limit=limit,
+        )
+        items = [
+            {"audio_id": audio_id, "filename": filename, "created_at": created_at}
+            for audio_id, filename, created_at in rows
+        ]
+        return page(items, limit, "audio_id")
+
+
+def _cursor_key(cursor: Optional[str]) -> Optional[str]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
 
 class AudioProcessingJobService:
     """Service to manage audio processing jobs and background pipelines."""
@@ -53,42 +188,311 @@ class AudioProcessingJobService:
         self,
         repo: AudioProcessingJobRepository,
         audio_repo: AudioFileRepository,
-        background_tasks: BackgroundTasks,
+        job_scheduler: JobScheduler = scheduler,
+        events: JobEventBroker = broker,
+        webhooks: WebhookDispatcher = dispatcher,
+        renderer: RenderPool = render_pool,
+        reports: ReportCache = report_cache,
+        reader: Optional[AudioProcessingJobRepository] = None,
+        archive: Optional[ArchivedProcessingJobRepository] = None,
     ):
         self.repo = repo
+        # Read-only queries may go to a replica, unless they must see a write
+        self.reader = reader or repo
+        # Finished jobs moved out of `processing_jobs` by the archiver
+        self.archive = archive
         self.audio_repo = audio_repo
-        self.background_tasks = background_tasks
+        self.scheduler = job_scheduler
+        self.events = events
+        self.webhooks = webhooks
+        self.renderer = renderer
+        self.reports = reports
+
+    def _reader_for(self, *job_ids: str) -> AudioProcessingJobRepository:
+        """Repository reading `job_ids`: the primary if any was just written."""
+
+        if any(recent_writes.contains(job_id) for job_id in job_ids):
+            return self.repo
+        return self.reader
+
+    async def _read_job(self, job_id: str) -> AudioProcessingJob:
+        """Read a job from a replica, or from the primary if it is missing there.
+
+        `recent_writes` only knows the writes of this process: a job just
+        created through another worker may not have reached the replica.
+        """
+
+        reader = self._reader_for(job_id)
+        try:
+            return await reader.get(job_id)
+        except HTTPException:
+            if reader is self.repo:
+                raise
+            return await self.repo.get(job_id)
+
+    async def _read_owned_statuses(self, job_ids: List[str], user_id: int) -> List:
+        """`get_owned_statuses`, asking the primary for jobs a replica lacks."""
+
+        reader = self._reader_for(*job_ids)
+        rows = list(await reader.get_owned_statuses(job_ids, user_id))
+        found = {row[0] for row in rows}
+        missing = [job_id for job_id in job_ids if job_id not in found]
+        if missing and reader is not self.repo:
+            rows += await self.repo.get_owned_statuses(missing, user_id)
+        return rows
+
+    def schedule_pipeline(
+        self,
+        job_id: str,
+        user_id: int,
+        audio_path: str,
+        priority: JobPriority = JobPriority.INTERACTIVE,
+    ) -> None:
+        """Hand a job to the fair scheduler, costed by its audio duration."""
+
+        self.scheduler.submit(
+            job_id,
+            user_id,
+            lambda: _run_pipeline_job(job_id, audio_path),
+            priority=priority,
+            cost=estimate_audio_duration(audio_path),
+        )
+
+    async def _checkpoint(self, job_id: str, **values: Any) -> None:
+        """Save stage output, stopping the pipeline if the job was cancelled."""
+
+        async with unit_of_work(self.repo.db):
+            if not await self.repo.save_checkpoint(job_id, **values):
+                raise JobCancelled(job_id)
+        changes = {k: values[k] for k in ("status", "stage") if k in values}
+        if changes:
+            await self._emit(job_id, "status", **changes)
+
+    def _completed_event(self, job_id: str) -> JobEvent:
+        return {
+            "event": "completed",
+            "job_id": job_id,
+            "status": JobStatus.SUMMARIZED,
+            "download_url": f"{settings.API_PREFIX}/report/download/{job_id}",
+        }
+
+    async def _emit(self, job_id: str, event: str, **data: Any) -> None:
+        await self._publish(job_id, {"event": event, "job_id": job_id, **data})
+
+    async def _publish(self, job_id: str, event: JobEvent) -> None:
+        """Publish a job event; a broker outage never fails the pipeline."""
+
+        try:
+            await self.events.publish(job_id, event)
+        except Exception:
+            logger.warning(
+                "Could not publish %s event of job %s", event["event"], job_id
+            )
+
+    async def _finish(
+        self,
+        job_id: str,
+        callback_url: Optional[str],
+        checkpoint: Dict[str, Any],
+        **webhook: Any,
+    ) -> bool:
+        """Save the final state of a job and queue its webhook, in one commit.
+
+        Returns False, without writing, when the job has been cancelled.
+        """
+
+        async with unit_of_work(self.repo.db):
+            if not await self.repo.save_checkpoint(job_id, **checkpoint):
+                return False
+            if callback_url is None:
+                return True
+            payload = {
+                "job_id": job_id,
+                **webhook,
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+            }
+            await WebhookDeliveryRepository(self.repo.db).enqueue(
+                job_id, callback_url, payload
+            )
+        self.webhooks.wake()
+        return True
 
     async def run_audio_processing_pipeline(
         self,
         job_id: str,
         audio_path: str,
     ) -> None:
-        """Run the full processing pipeline: transcribe, summarize, and export PDF."""
+        """Run the processing pipeline: transcribe, summarize, and export PDF.
+
+        Every stage stores its output on the job, so a resumed or retried job
+        starts from the first stage that has not completed yet. Each stage
+        runs under a deadline derived from the audio duration.
+
+        Stages run as a small DAG: the transcript pages only depend on the
+        transcript, so they are laid out while the notes are being generated,
+        and rendering only adds the notes pages. Both run in the render pool.
+        """
+
+        deadlines = stage_deadlines(audio_path)
+        render_started = False
+        # The provider transcript was cancelled or errored: a retry resubmits
+        transcript_dropped = False
+        transcript_layout: Optional[asyncio.Future] = None
+
+        async def on_progress(progress: Dict[str, Any]) -> None:
+            await self._emit(job_id, "progress", progress=progress)
 
+        callback_url: Optional[str] = None
         try:
-            async with AssemblyAITranscriber() as t:
-                data = await t.transcribe(audio_path)
-                transcript = data["transcript"]
-            await self.repo.update_status(job_id, JobStatus.TRANSCRIBED)
+            job = await self.repo.get(job_id)
+            callback_url = cast(Optional[str], job.callback_url)
+            transcript_id = cast(Optional[str], job.transcript_id)
+            transcript = cast(Optional[str], job.transcript)
+            notes = cast(Optional[Dict], job.notes)
 
-            async with MistralNotesGenerator(
-                model=settings.DEFAULT_MISTRAL_MODEL
-            ) as generator:
-                notes = await generator.generate(transcript)
-            await self.repo.update_status(job_id, JobStatus.SUMMARIZED)
+            if transcript is None:
+                await self._checkpoint(job_id, stage=PipelineStage.TRANSCRIPTION)
+                async with AssemblyAITranscriber() as t:
+                    try:
+                        async with asyncio.timeout(
+                            deadlines[PipelineStage.TRANSCRIPTION]
+                        ):
+                            if transcript_id is None:
+                                transcript_id = await t.submit(audio_path, on_progress)
+                                await self._checkpoint(
+                                    job_id, transcript_id=transcript_id
+                                )
+                            data = await t.fetch(transcript_id, on_progress)
+                    except TimeoutError:
+                        if transcript_id is not None:
+                            await t.cancel(transcript_id)
+                            transcript_dropped = True
+                        raise
+                    except TranscriptionFailed:
+                        transcript_dropped = True
+                        raise
+                    transcript = data["transcript"]
+                await self._checkpoint(
+                    job_id, status=JobStatus.TRANSCRIBED, transcript=transcript
+                )
 
-            os.makedirs("reports", exist_ok=True)
-            output_path = f"{settings.REPORT_UPLOAD_DIR}/report_{job_id}.pdf"
-            PDFReportGenerator().export(
-                output_path=output_path, transcript=transcript, notes=notes
+            transcript_layout = asyncio.ensure_future(
+                self.renderer.prepare(job_id, transcript)
             )
 
+            if notes is None:
+                await self._checkpoint(job_id, stage=PipelineStage.SUMMARIZATION)
+                async with asyncio.timeout(deadlines[PipelineStage.SUMMARIZATION]):
+                    async with MistralNotesGenerator(
+                        model=settings.DEFAULT_MISTRAL_MODEL
+                    ) as generator:
+                        notes = await generator.generate(transcript)
+                await self._checkpoint(job_id, status=JobStatus.SUMMARIZED, notes=notes)
+
+            await self._checkpoint(job_id, stage=PipelineStage.RENDERING)
+            os.makedirs(settings.REPORT_UPLOAD_DIR, exist_ok=True)
+            output_path = f"{settings.REPORT_UPLOAD_DIR}/report_{job_id}.pdf"
+            async with asyncio.timeout(deadlines[PipelineStage.RENDERING]):
+                await transcript_layout
+                render_started = True
+                await self.renderer.render(
+                    job_id,
+                    output_path=output_path,
+                    transcript=transcript,
+                    notes=notes,
+                )
+            completed = self._completed_event(job_id)
+            if not await self._finish(
+                job_id,
+                callback_url,
+                {"report_path": output_path, "stage": None, "inflight_key": None},
+                event="job.completed",
+                status=JobStatus.SUMMARIZED,
+                error=None,
+                download_url=completed["download_url"],
+            ):
+                raise JobCancelled(job_id)
+            await self._emit(job_id, "status", stage=None)
+            await self._publish(job_id, completed)
+
+        except JobCancelled:
+            return
+
         except Exception as e:
-            await self.repo.update_status(job_id, JobStatus.FAILED, error=str(e))
+            if isinstance(e, TimeoutError):
+                error = "Processing stage exceeded its deadline."
+            else:
+                error = str(e)
+            # Drop whatever the failed stage left in the transaction
+            await self.repo.db.rollback()
+            failure: Dict[str, Any] = {
+                "status": JobStatus.FAILED,
+                "error_message": error,
+                "inflight_key": None,
+            }
+            if transcript_dropped:
+                failure["transcript_id"] = None
+            if await self._finish(
+                job_id,
+                callback_url,
+                failure,
+                event="job.failed",
+                status=JobStatus.FAILED,
+                error=error,
+                download_url=None,
+            ):
+                await self._emit(job_id, "failed", status=JobStatus.FAILED, error=error)
 
-    async def create_bg_task(self, report_create: ReportCreate) -> Dict:
-        """Create a processing job for the given audio."""
+        finally:
+            if transcript_layout is not None and not transcript_layout.done():
+                transcript_layout.cancel()
+            if transcript_layout is not None and not render_started:
+                self.renderer.discard(job_id)
+
+    async def _callback_url(self, url: Optional[AnyHttpUrl]) -> Optional[str]:
+        """The callback URL of a request.
+
+        Refused while webhooks are disabled, or when the URL resolves to an
+        internal address.
+        """
+
+        if url is None:
+            return None
+        if not self.webhooks.enabled:
+            raise HTTPException(
+                status_code=422, detail="Webhooks are not enabled on this server."
+            )
+        try:
+            await self.webhooks.check_url(str(url))
+        except UnsafeURL as exc:
+            raise HTTPException(
+                status_code=422, detail=f"Invalid callback_url: {exc}"
+            ) from exc
+        return str(url)
+
+    def _webhook_secret(
+        self, job_id: str, callback_url: Optional[str]
+    ) -> Optional[str]:
+        if callback_url is None:
+            return None
+        return self.webhooks.secret_for(job_id, callback_url)
+
+    async def create_bg_task(
+        self,
+        report_create: ReportCreate,
+        requester_id: int,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict:
+        """Create a processing job for the given audio.
+
+        Requests repeating an `Idempotency-Key`, or asking for the same audio,
+        priority and callback while a job for it is still running, get that
+        job back instead of starting new work. Concurrent requests in this process are coalesced
+        in memory, and a unique in-flight key coalesces them across processes.
+
+        Keys are scoped to the requesting user and remember the request they
+        came with: reusing one for a different request is rejected with 422.
+        """
 
         audio_id = report_create.audio_id
         audio_file = await self.audio_repo.get(audio_id)
@@ -98,38 +502,417 @@ class AudioProcessingJobService:
                 status_code=404, detail=f"Audio file with id:{audio_id} not found"
             )
 
-        file_path = audio_file.file_path
-        job = AudioProcessingJob(
-            id=str(uuid.uuid4()), audio_id=audio_id, status=JobStatus.CREATED
+        file_path = cast(str, audio_file.file_path)
+        user_id = cast(int, audio_file.user_id)
+        callback_url = await self._callback_url(report_create.callback_url)
+        scoped_key = f"{requester_id}:{idempotency_key}" if idempotency_key else None
+        fingerprint = request_fingerprint(report_create) if scoped_key else None
+        inflight_key = pipeline_inflight_key(
+            audio_id, report_create.priority, callback_url
         )
-        job = await self.repo.create(job)
-        job_id = job.id
 
-        self.background_tasks.add_task(
-            self.run_audio_processing_pipeline, job_id, file_path
+        async def create() -> Dict:
+            async with unit_of_work(self.repo.db):
+                existing = await self.repo.get_by_keys(scoped_key, inflight_key)
+                if existing is not None:
+                    return _created_job(existing, created=False)
+
+                job = AudioProcessingJob(
+                    id=str(uuid.uuid4()),
+                    audio_id=audio_id,
+                    user_id=user_id,
+                    status=JobStatus.CREATED,
+                    idempotency_key=scoped_key,
+                    request_fingerprint=fingerprint,
+                    inflight_key=inflight_key,
+                    callback_url=callback_url,
+                    **lease(),
+                )
+                job, created = await self.repo.create_or_get_existing(job)
+            if created:
+                self.schedule_pipeline(
+                    cast(str, job.id), user_id, file_path, report_create.priority
+                )
+            return _created_job(job, created)
+
+        job, shared = await _job_creation.do(inflight_key, create)
+        # Checked after coalescing: a shared job may carry another request's key.
+        # Keys stored without a fingerprint match any request
+        if (
+            scoped_key is not None
+            and job["idempotency_key"] == scoped_key
+            and job["request_fingerprint"] not in (None, fingerprint)
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if job["created"] and not shared:
+            message = "Your report is being generated."
+        else:
+            message = "A job for this request already exists."
+
+        return {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "message": message,
+            "webhook_secret": self._webhook_secret(job["job_id"], callback_url),
+        }
+
+    async def create_bg_tasks(self, batch: ReportBatchCreate, user_id: int) -> Dict:
+        """Create processing jobs for many audio files with one insert."""
+
+        audio_ids = list(dict.fromkeys(batch.audio_ids))
+        paths = await self.audio_repo.get_owned_paths(audio_ids, user_id)
+
+        missing = [audio_id for audio_id in audio_ids if audio_id not in paths]
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Audio files not found: {', '.join(missing)}",
+            )
+
+        callback_url = await self._callback_url(batch.callback_url)
+        inflight_keys = {
+            a: pipeline_inflight_key(a, batch.priority, callback_url) for a in audio_ids
+        }
+        running = await self.repo.get_inflight(list(inflight_keys.values()))
+
+        jobs = [
+            {
+                "id": str(uuid.uuid4()),
+                "audio_id": audio_id,
+                "user_id": user_id,
+                "status": JobStatus.CREATED,
+                "inflight_key": inflight_keys[audio_id],
+                "callback_url": callback_url,
+                **lease(),
+            }
+            for audio_id in audio_ids
+            if inflight_keys[audio_id] not in running
+        ]
+        try:
+            async with unit_of_work(self.repo.db):
+                await self.repo.create_many(jobs)
+        except IntegrityError as exc:
+            raise HTTPException(
+                status_code=409,
+                detail="Some of these audio files were just submitted, please retry.",
+            ) from exc
+
+        for job in jobs:
+            self.schedule_pipeline(
+                job["id"], user_id, paths[job["audio_id"]], batch.priority
+            )
+
+        created_ids = {job["audio_id"]: job["id"] for job in jobs}
+        job_ids = {
+            audio_id: created_ids.get(audio_id) or running[inflight_keys[audio_id]]
+            for audio_id in audio_ids
+        }
+        return {
+            "jobs": [
+                {
+                    "audio_id": audio_id,
+                    "job_id": job_id,
+                    "webhook_secret": self._webhook_secret(job_id, callback_url),
+                }
+                for audio_id, job_id in job_ids.items()
+            ],
+            "status": JobStatus.CREATED,
+            "message": "Your reports are being generated.",
+        }
+
+    async def retry_job(self, job_id: str, user_id: int) -> Dict:
+        """Reschedule a failed job of the user from its last completed stage."""
+
+        job = await self.repo.get_with_audio(job_id, user_id)
+        if job is None:
+            raise HTTPException(
+                status_code=404, detail=f"Job with id:{job_id} not found"
+            )
+
+        if job.status not in (JobStatus.FAILED, JobStatus.CANCELLED):
+            raise HTTPException(
+                status_code=409, detail="Only failed or cancelled jobs can be retried."
+            )
+
+        if job.notes is not None:
+            resume_status = JobStatus.SUMMARIZED
+        elif job.transcript is not None:
+            resume_status = JobStatus.TRANSCRIBED
+        else:
+            resume_status = JobStatus.CREATED
+        file_path = job.audio_file.file_path
+
+        async with unit_of_work(self.repo.db):
+            if not await self.repo.claim(job_id, cast(int, job.attempts), lease()):
+                raise HTTPException(
+                    status_code=409, detail="Job is already being retried."
+                )
+            await self.repo.update_status(job_id, resume_status)
+        await self._emit(job_id, "status", status=resume_status)
+
+        self.schedule_pipeline(job_id, user_id, file_path)
+
+        return {
+            "job_id": job_id,
+            "status": resume_status,
+            "message": "Your report generation has been resumed.",
+        }
+
+    async def cancel_job(self, job_id: str, user_id: int) -> Dict:
+        """Cancel a queued or running job of the user and record its stage."""
+
+        job = await self.repo.get_with_audio(job_id, user_id)
+        if job is None:
+            raise HTTPException(
+                status_code=404, detail=f"Job with id:{job_id} not found"
+            )
+
+        if job.status in (JobStatus.FAILED, JobStatus.CANCELLED) or job.report_path:
+            raise _not_cancellable(job)
+
+        transcript_id = job.transcript_id
+        stopped_at = job.stage or PipelineStage.QUEUED
+        cancel_transcript = (
+            transcript_id is not None and stopped_at == PipelineStage.TRANSCRIPTION
+        )
+        values: Dict[str, Any] = {}
+        if cancel_transcript:
+            # Cancelled below, a retry must submit the audio again
+            values["transcript_id"] = None
+        # Marking the job first also stops pipelines running in other processes
+        # at their next checkpoint
+        async with unit_of_work(self.repo.db):
+            cancelled = await self.repo.cancel(
+                job_id,
+                error_message=f"Cancelled during {stopped_at}.",
+                inflight_key=None,
+                **values,
+            )
+        if not cancelled:
+            # The job ended since it was read
+            self.repo.db.expire_all()
+            raise _not_cancellable(await self.repo.get(job_id))
+        await self.scheduler.cancel(job_id)
+
+        await self._emit(
+            job_id, "cancelled", status=JobStatus.CANCELLED, stage=stopped_at
         )
 
+        if cancel_transcript:
+            async with AssemblyAITranscriber() as t:
+                await t.cancel(cast(str, transcript_id))
+
         return {
             "job_id": job_id,
-            "status": JobStatus.CREATED,
-            "message": "Your report is being generated.",
+            "status": JobStatus.CANCELLED,
+            "message": f"Job cancelled during {stopped_at}.",
         }
 
-    async def get_job_status(self, job_id: str) -> Dict:
-        """Return the current status and any error message for a audio job id."""
+    async def stream_job_events(
+        self, job_id: str, user_id: int
+    ) -> AsyncIterator[JobEvent]:
+        """Return an iterator over a job snapshot, then its events until it ends.
+
+        The subscription is opened before the snapshot is read so no
+        transition in between is lost. The database session is released
+        after the snapshot; the stream itself never touches the pool.
+        """
+
+        queue = self.events.subscribe(job_id)
+        try:
+            rows = await self._read_owned_statuses([job_id], user_id)
+            await self.reader.db.close()
+            await self.repo.db.close()
+        except BaseException:
+            self.events.unsubscribe(job_id, queue)
+            raise
+
+        if not rows:
+            self.events.unsubscribe(job_id, queue)
+            raise HTTPException(
+                status_code=404, detail=f"Job with id:{job_id} not found"
+            )
+        return self._iter_job_events(job_id, rows[0], queue)
+
+    async def _iter_job_events(
+        self, job_id: str, row: Any, queue: "asyncio.Queue[JobEvent]"
+    ) -> AsyncIterator[JobEvent]:
+        try:
+            _, job_status, error, report_path = row
+            if report_path is not None:
+                yield self._completed_event(job_id)
+                return
+            if job_status == JobStatus.FAILED:
+                yield {"event": "failed", "job_id": job_id, "error": error}
+                return
+            if job_status == JobStatus.CANCELLED:
+                yield {"event": "cancelled", "job_id": job_id, "error": error}
+                return
+            yield {"event": "status", "job_id": job_id, "status": job_status}
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), settings.EVENT_KEEPALIVE_SECONDS
+                    )
+                except TimeoutError:
+                    yield {"event": "keepalive", "job_id": job_id}
+                    continue
+                yield event
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            self.events.unsubscribe(job_id, queue)
 
-        job = await self.repo.get(job_id)
+    async def get_job_status(
+        self,
+        job_id: str,
+        wait: Optional[float] = None,
+        since: Optional[JobStatus] = None,
+    ) -> Dict:
+        """Return the current status and any error message for a audio job id.
+
+        Jobs archived since they finished are looked up in the archive.
+        With `wait`, the call long-polls: it returns once the status differs
+        from `since` (the current status when omitted) or after `wait`
+        seconds. The wait is on job events, not on repeated queries.
+        """
+
+        job = await self._get_job(job_id, wait, since)
         if job is None:
             raise HTTPException(
                 status_code=404, detail=f"Job with id:{job_id} not found"
             )
 
-        return {"job_id": job_id, "status": job.status, "error": job.error_message}
+        queue_position, estimated_start = self.scheduler.queue_info(job_id)
+        return {
+            "job_id": job_id,
+            "status": job.status,
+            "error": job.error_message,
+            "queue_position": queue_position,
+            "estimated_start": estimated_start,
+        }
+
+    async def _get_job(
+        self,
+        job_id: str,
+        wait: Optional[float] = None,
+        since: Optional[JobStatus] = None,
+    ) -> Any:
+        """The job, from `processing_jobs` or else from the archive."""
+
+        try:
+            if not wait:
+                return await self._read_job(job_id)
+            return await self._wait_for_status_change(job_id, wait, since)
+        except HTTPException:
+            # `get` raises on a missing row; it may have been archived
+            if self.archive is None:
+                raise
+            return await self.archive.get(job_id)
+
+    async def _wait_for_status_change(
+        self, job_id: str, wait: float, since: Optional[JobStatus]
+    ) -> AudioProcessingJob:
+        # Subscribe before reading so a transition in between is not missed
+        queue = self.events.subscribe(job_id)
+        try:
+            job = await self._read_job(job_id)
+            if job.report_path is not None:
+                return job
+            if job.status in (JobStatus.FAILED, JobStatus.CANCELLED):
+                return job
+            if since is not None and job.status != since:
+                return job
+            since = job.status
+            # Give the connections back to the pool while the request waits
+            await self.reader.db.close()
+            await self.repo.db.close()
+
+            try:
+                async with asyncio.timeout(wait):
+                    while True:
+                        event = await queue.get()
+                        if event["event"] in TERMINAL_EVENTS:
+                            break
+                        if event.get("status", since) != since:
+                            break
+            except TimeoutError:
+                pass
+        finally:
+            self.events.unsubscribe(job_id, queue)
+
+        # The change that ended the wait was most likely just written
+        return await self.repo.get(job_id)
+
+    async def get_job_statuses(self, job_ids: List[str], user_id: int) -> Dict:
+        """Return the status of many jobs owned by the user in one query."""
+
+        rows = await self._read_owned_statuses(job_ids, user_id)
+        jobs = []
+        for job_id, job_status, error, _ in rows:
+            queue_position, estimated_start = self.scheduler.queue_info(job_id)
+            jobs.append(
+                {
+                    "job_id": job_id,
+                    "status": job_status,
+                    "error": error,
+                    "queue_position": queue_position,
+                    "estimated_start": estimated_start,
+                }
+            )
+        return {"jobs": jobs}
+
+    async def list_jobs(
+        self,
+        user_id: int,
+        status: Optional[JobStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict:
+        """Return one page of the user's jobs, newest first."""
+
+        rows = await self.reader.list_owned(
+            user_id,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            after=_cursor_key(cursor),
+            limit=limit,
+        )
+        items = [
+            {
+                "job_id": job_id,
+                "audio_id": audio_id,
+                "status": job_status,
+                "error": error,
+                "created_at": created_at,
+            }
+            for job_id, audio_id, job_status, error, created_at in rows
+        ]
+        return page(items, limit, "job_id")
+
+    async def download_report(
+        self,
+        job_id: str,
+        report_format: ReportFormat = ReportFormat.PDF,
+        if_none_match: Optional[str] = None,
+    ) -> Response:
+        """Return FileResponse for the generated report if the job completed.
 
-    async def download_report(self, job_id: str) -> FileResponse:
-        """Return FileResponse for the generated report if the job completed."""
+        The PDF rendered by the pipeline is served as is; other formats are
+        rendered from the stored notes and transcript on first request.
+        Archived jobs are served as well. Responses carry a strong ETag of the file content: a matching
+        `If-None-Match` gets a 304, and `Range` / `If-Range` requests get
+        partial content.
+        """
 
-        job = await self.repo.get(job_id)
+        job = await self._get_job(job_id)
 
         if not job:
             raise HTTPException(
@@ -143,19 +926,112 @@ class AudioProcessingJobService:
                 detail=f"Audio processing failed, error: {job.error_message}",
             )
 
-        if job.status != JobStatus.SUMMARIZED:
+        if job.status == JobStatus.CANCELLED:
+            raise HTTPException(status_code=409, detail=job.error_message)
+
+        if job.status != JobStatus.SUMMARIZED or job.report_path is None:
             raise HTTPException(
                 status_code=202,
                 detail="Report is still being generated. Please try again in a few moments.",
             )
 
-        file_path = f"{settings.REPORT_UPLOAD_DIR}/report_{job_id}.pdf"
+        renderer = RENDERERS[report_format]
+        file_path = job.report_path
+        stat_result = None
+
+        if report_format == ReportFormat.PDF:
+            try:
+                stat_result = os.stat(file_path)
+            except FileNotFoundError:
+                pass
+
+        if stat_result is None:
+            if job.transcript is None or job.notes is None:
+                raise HTTPException(status_code=404, detail="File missing on server")
+            file_path = await self.reports.get(
+                report_format, transcript=job.transcript, notes=job.notes
+            )
+            stat_result = os.stat(file_path)
 
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=404, detail="File missing on server")
+        headers = {
+            "ETag": await file_etag(file_path, stat_result),
+            "Cache-Control": settings.REPORT_CACHE_CONTROL,
+        }
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
 
         return FileResponse(
             path=file_path,
-            filename=f"meeting_summary_{job_id}.pdf",
-            media_type="application/pdf",
+            headers=headers,
+            filename=f"meeting_summary_{job_id}.{report_format.value}",
+            media_type=renderer.media_type,
+            stat_result=stat_result,
+        )
+
+    async def export_reports(
+        self, query: ReportExportQuery, user_id: int
+    ) -> StreamingResponse:
+        """Stream a ZIP of the user's rendered reports selected by `query`.
+
+        The archive is built while it is sent, reading each PDF in chunks,
+        so memory does not grow with the number or size of the reports.
+        """
+
+        reports = await self.reader.list_owned_reports(
+            user_id,
+            job_ids=query.job_ids,
+            created_from=query.created_from,
+            created_to=query.created_to,
+        )
+        if not reports:
+            raise HTTPException(status_code=404, detail="No reports to export")
+
+        # A sync iterator: Starlette reads the files in its thread pool
+        return StreamingResponse(
+            stream_zip((archive_name(job_id, path), path) for job_id, path in reports),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="reports.zip"'},
+        )
+
+
+async def _run_pipeline_job(job_id: str, audio_path: str) -> None:
+    """Run a scheduled pipeline on its own database session."""
+
+    async with sessionmanager.session() as session:
+        service = AudioProcessingJobService(
+            AudioProcessingJobRepository(session), AudioFileRepository(session)
+        )
+        await service.run_audio_processing_pipeline(job_id, audio_path)
+
+
+async def resume_interrupted_jobs() -> int:
+    """Reschedule jobs left unfinished by a crashed or restarted worker.
+
+    Runs at startup and then periodically in the lease keeper. Only jobs
+    whose lease expired are resumed: jobs queued or running in
+    live workers keep being renewed by them. Each job is claimed through its
+    attempt counter, so when several workers start at once only one of them
+    resumes a given job.
+    """
+
+    now = datetime.now(timezone.utc)
+    async with sessionmanager.session() as session, unit_of_work(session):
+        repo = AudioProcessingJobRepository(session)
+        service = AudioProcessingJobService(repo, AudioFileRepository(session))
+        jobs = cast(
+            List[Tuple[str, int, str, int]],
+            [
+                (job.id, job.audio_file.user_id, job.audio_file.file_path, job.attempts)
+                for job in await repo.list_incomplete(now)
+            ],
         )
+        claimed: List[Tuple[str, int, str]] = [
+            (job_id, user_id, audio_path)
+            for job_id, user_id, audio_path, attempts in jobs
+            if await repo.claim(job_id, attempts, lease(), expired_at=now)
+        ]
+
+    for job_id, user_id, audio_path in claimed:
+        service.schedule_pipeline(job_id, user_id, audio_path, JobPriority.BULK)
+
+    return len(claimed)
@@ -2,27 +2,151 @@
 Authentication service.
 """
 
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Tuple, cast
+from typing import Any, Callable, Deque, Optional, Tuple, TypeVar, cast
 
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token, verify_password
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    get_password_hash,
+    verify_password,
+)
 from app.models.user import User
 from app.schemas.token import TokenPayload
+from app.utils.lru_cache import LRUCache
+
+_T = TypeVar("_T")
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool.
+
+    bcrypt takes 100-300 ms per call and releases the GIL, so running it on
+    threads keeps the event loop free. At most `max_pending` calls run or
+    wait at once; beyond that callers get a 503 with a Retry-After derived
+    from the backlog and the measured hashing time, rather than queueing
+    without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        # Moving average of the duration of one call, in seconds
+        self._seconds_per_call = 0.2
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is likely worked off."""
+
+        backlog = self._pending / self._workers * self._seconds_per_call
+        return max(1, math.ceil(backlog))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        if self._pending >= self._max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, try again later",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def _timed(self, fn: Callable[..., _T], *args: Any) -> _T:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._seconds_per_call += (elapsed - self._seconds_per_call) * 0.1
+
+
+class LoginAttemptLimiter:
+    """Sliding-window limit of login attempts per username.
+
+    Every attempt counts, including concurrent ones still being verified,
+    and a successful login clears the username. Keeps at most `capacity`
+    usernames, so a spray of random names cannot grow it without bound.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: float, capacity: int):
+        self._max_attempts = max_attempts
+        self._window = window_seconds
+        self._attempts = LRUCache(capacity)
+
+    def attempt(self, username: str) -> None:
+        """Record an attempt, or raise 429 when the username is over its limit."""
+
+        now = time.monotonic()
+        entry = self._attempts.get(username)
+        if entry is None:
+            entry = {"times": deque()}
+            self._attempts.put(username, entry)
+        times: Deque[float] = entry["times"]
+        while times and times[0] <= now - self._window:
+            times.popleft()
+        if len(times) >= self._max_attempts:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(math.ceil(times[0] + self._window - now))},
+            )
+        times.append(now)
+
+    def reset(self, username: str) -> None:
+        self._attempts.pop(username, None)
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
+login_limiter = LoginAttemptLimiter(
+    settings.LOGIN_MAX_ATTEMPTS, settings.LOGIN_ATTEMPT_WINDOW_SECONDS, 100_000
+)
 
 
 async def authenticate_user(
     db: AsyncSession, username: str, password: str
 ) -> Optional[User]:
-    """Authenticate a user by username and password."""
+    """Authenticate a user by username and password.
+
+    Attempts are limited per username, and bcrypt runs on the hasher's pool.
+    """
+    login_limiter.attempt(username)
     result = await db.execute(select(User).filter(User.username == username))
     user = cast(Optional[User], result.scalar_one_or_none())
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
+        return None
+    # Return the connection to the pool rather than holding it while the
+    # hash waits for a bcrypt thread; `user` stays loaded, detached
+    await db.close()
+    if not await password_hasher.verify(password, cast(str, user.hashed_password)):
         return None
+    login_limiter.reset(username)
     return user
 
 
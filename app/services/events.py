@@ -0,0 +1,185 @@
+"""
+Publish/subscribe of processing job progress events.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JobEvent = Dict[str, Any]
+
+# Events after which a job does not change anymore
+TERMINAL_EVENTS = {"completed", "failed", "cancelled"}
+
+
+class JobEventBroker:
+    """In-process pub/sub of job events, keyed by job id.
+
+    Every subscriber gets its own bounded queue; when a slow subscriber falls
+    behind, its oldest events are dropped rather than blocking publishers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self._queue_size = queue_size
+        self._subscribers: Dict[str, Set["asyncio.Queue[JobEvent]"]] = {}
+
+    async def start(self) -> None:
+        """Open any connection the broker needs."""
+
+    async def close(self) -> None:
+        """Release connections opened by `start`."""
+
+    def subscribe(self, job_id: str) -> "asyncio.Queue[JobEvent]":
+        """Return a queue receiving the events of `job_id`."""
+
+        queue: "asyncio.Queue[JobEvent]" = asyncio.Queue(self._queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: "asyncio.Queue[JobEvent]") -> None:
+        """Stop delivering events of `job_id` to `queue`."""
+
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    async def publish(self, job_id: str, event: JobEvent) -> None:
+        """Send an event to the subscribers of `job_id`."""
+
+        self._deliver(job_id, event)
+
+    def _deliver(self, job_id: str, event: JobEvent) -> None:
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+class PostgresJobEventBroker(JobEventBroker):
+    """Broker fanning events out to every node through Postgres LISTEN/NOTIFY.
+
+    When the LISTEN connection is lost (server restart, failover, idle
+    timeout) it is opened again with exponential backoff; events notified
+    while it is down are not received by this node.
+    """
+
+    CHANNEL = "job_events"
+
+    def __init__(
+        self,
+        dsn: str,
+        queue_size: int = 100,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        super().__init__(queue_size)
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._listener: Optional[Any] = None
+        self._publishers: Optional[Any] = None
+        self._reconnecting: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._closed = False
+        await self._listen()
+        self._publishers = await asyncpg.create_pool(self._dsn, min_size=1, max_size=4)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        listener = await asyncpg.connect(self._dsn)
+        try:
+            await listener.add_listener(self.CHANNEL, self._on_notify)
+        except BaseException:
+            listener.terminate()
+            raise
+        listener.add_termination_listener(self._on_terminate)
+        self._listener = listener
+
+    def _on_terminate(self, connection: Any) -> None:
+        if self._closed or connection is not self._listener:
+            return
+        self._listener = None
+        if self._reconnecting is None or self._reconnecting.done():
+            logger.warning("Lost the connection listening for job events")
+            self._reconnecting = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self._reconnect_delay
+        while not self._closed:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+            except Exception:
+                delay = min(delay * 2, self._max_reconnect_delay)
+                logger.warning(
+                    "Listening for job events failed, retrying in %.0fs",
+                    delay,
+                    exc_info=True,
+                )
+            else:
+                logger.info("Listening for job events again")
+                return
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+            self._reconnecting = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+        if self._publishers is not None:
+            await self._publishers.close()
+            self._publishers = None
+
+    async def publish(self, job_id: str, event: JobEvent) -> None:
+        if self._publishers is None:
+            # Not started (e.g. in a one-off script), deliver in this process only
+            self._deliver(job_id, event)
+            return
+
+        payload = json.dumps({"job_id": job_id, "event": event}, default=str)
+        await self._publishers.execute(
+            "SELECT pg_notify($1, $2)", self.CHANNEL, payload
+        )
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        message = json.loads(payload)
+        self._deliver(message["job_id"], message["event"])
+
+
+def create_event_broker() -> JobEventBroker:
+    """Build the broker selected by `settings.EVENT_BROKER`."""
+
+    if settings.EVENT_BROKER == "postgres":
+        if settings.DB_PGBOUNCER:
+            # LISTEN belongs to a server session, which PgBouncer in
+            # transaction mode does not keep for a client connection
+            raise ValueError(
+                "EVENT_BROKER=postgres does not work through PgBouncer in "
+                "transaction mode (DB_PGBOUNCER=true)"
+            )
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        return PostgresJobEventBroker(dsn, settings.EVENT_QUEUE_SIZE)
+    return JobEventBroker(settings.EVENT_QUEUE_SIZE)
+
+
+broker = create_event_broker()
+
+
+def format_sse(event: JobEvent) -> str:
+    """Serialize an event as a Server-Sent Events message."""
+
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
@@ -0,0 +1,95 @@
+"""
+Leases of the jobs a worker has queued or is running.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import sessionmanager
+from app.db.unit_of_work import unit_of_work
+from app.repositories.audio import AudioProcessingJobRepository
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+# Claims and reschedules the jobs whose lease expired; returns how many
+ResumeJobs = Callable[[], Awaitable[int]]
+
+# Identifies this process in `processing_jobs.claimed_by`
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def lease(worker_id: str = WORKER_ID) -> Dict[str, Any]:
+    """Column values giving `worker_id` the lease of a job, from now on."""
+
+    until = datetime.now(timezone.utc) + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+    return {"claimed_by": worker_id, "claimed_until": until}
+
+
+class LeaseKeeper:
+    """Renews the leases of this worker's unfinished jobs in the background.
+
+    One UPDATE every `lease_seconds / 3` covers every job the worker has
+    queued or is running. Once a worker dies its leases run out; keepers
+    started with `resume` look for such jobs at startup and after every
+    renewal, so they are picked up by a worker that is already running as
+    well as by the next one to start. Jobs of live workers are left alone.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: float,
+        worker_id: str = WORKER_ID,
+        session_factory: SessionFactory = sessionmanager.session,
+    ):
+        self._lease = timedelta(seconds=lease_seconds)
+        self._worker_id = worker_id
+        self._session_factory = session_factory
+        self._resume: Optional[ResumeJobs] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def start(self, resume: Optional[ResumeJobs] = None) -> None:
+        self._resume = resume
+        if resume is not None:
+            await resume()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def renew(self) -> int:
+        """Extend every lease of this worker; returns how many were renewed."""
+
+        until = datetime.now(timezone.utc) + self._lease
+        async with self._session_factory() as session, unit_of_work(session):
+            return await AudioProcessingJobRepository(session).renew_leases(
+                self._worker_id, until
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._lease.total_seconds() / 3)
+            try:
+                await self.renew()
+            except Exception:
+                logger.exception("Renewing job leases failed")
+            if self._resume is None:
+                continue
+            try:
+                await self._resume()
+            except Exception:
+                logger.exception("Resuming jobs with expired leases failed")
+
+
+lease_keeper = LeaseKeeper(lease_seconds=settings.JOB_LEASE_SECONDS)
@@ -70,7 +70,13 @@ class MistralNotesGenerator(BaseNotesGenerator):
     async def __aenter__(self) -> "MistralNotesGenerator":
         """Initialize async HTTP client for Mistral API calls."""
 
-        self._client = httpx.AsyncClient(headers=self._headers, timeout=None)
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            timeout=httpx.Timeout(
+                settings.PROVIDER_READ_TIMEOUT,
+                connect=settings.PROVIDER_CONNECT_TIMEOUT,
+            ),
+        )
         return self
 
     async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
@@ -1,8 +1,22 @@
-from typing import List, Dict
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
+from collections import deque
+from io import BytesIO
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
+    Flowable,
     SimpleDocTemplate,
+    PageBreak,
     Paragraph,
     Spacer,
     ListFlowable,
@@ -10,10 +24,171 @@ from reportlab.platypus import (
 )
 from reportlab.lib.units import inch
 
+from app.services.report_templates import ReportTemplate, get_template
+
+# Frame padding SimpleDocTemplate uses on every side of its page frame
+_FRAME_PADDING = 6
+_FUZZ = 1e-6
+
+# Utterances typeset together in one transcript flowable
+TRANSCRIPT_BLOCK_UTTERANCES = 50
+# Transcript pages laid out by `prepare_transcript`; the rest is laid out
+# while the document is built
+PREPARED_TRANSCRIPT_PAGES = 50
+# Flowables buffered ahead of the document builder
+_STORY_WINDOW = 16
+
+
+class LaidOutPage(Flowable):
+    """A page of flowables that were already wrapped to the page frame.
+
+    Drawing it does not line-break its paragraphs again, so the expensive
+    part of typesetting can run before the rest of the document is known.
+    """
+
+    def __init__(self, items: List[Tuple[Flowable, float, float]]):
+        super().__init__()
+        # (flowable, offset from the top of the page, height)
+        self._items = items
+        self._height = max((top + h for _, top, h in items), default=0)
+
+    def wrap(self, availWidth: float, availHeight: float) -> Tuple[float, float]:
+        return availWidth, self._height
+
+    def draw(self) -> None:
+        for flowable, top, height in self._items:
+            flowable.drawOn(self.canv, 0, self._height - top - height)
+
+
+class TranscriptBlock(Flowable):
+    """Several transcript utterances typeset as plain left-aligned lines.
+
+    Utterances are plain text in a single font, so line breaking only needs
+    word widths (cached across blocks by the caller) instead of the full
+    `Paragraph` machinery. Splitting reuses the broken lines.
+    """
+
+    def __init__(
+        self,
+        style: ParagraphStyle,
+        gap: float,
+        measure: Callable[[str], float],
+        utterances: Sequence[str] = (),
+        rows: Optional[List[Tuple[str, float]]] = None,
+    ):
+        super().__init__()
+        self.style = style
+        self._gap = gap
+        self._measure = measure
+        self._utterances = utterances
+        # (line text, space below it), set once broken to a width
+        self._rows = rows
+        self._width: Optional[float] = None if rows is None else 0.0
+
+    def _break(self, width: float) -> List[Tuple[str, float]]:
+        space = self._measure(" ")
+        rows: List[Tuple[str, float]] = []
+        for utterance in self._utterances:
+            line: List[str] = []
+            used = 0.0
+            for word in utterance.split():
+                w = self._measure(word)
+                if line and used + space + w > width:
+                    rows.append((" ".join(line), 0.0))
+                    line, used = [], 0.0
+                used += w + space if line else w
+                line.append(word)
+            rows.append((" ".join(line), self._gap))
+        return rows
+
+    def _rows_height(self, rows: List[Tuple[str, float]]) -> float:
+        if not rows:
+            return 0.0
+        leading = float(self.style.leading)
+        return len(rows) * leading + sum(gap for _, gap in rows[:-1])
+
+    def wrap(self, availWidth: float, availHeight: float) -> Tuple[float, float]:
+        if self._rows is None or self._width not in (0.0, availWidth):
+            self._rows = self._break(availWidth)
+            self._width = availWidth
+        self.width = availWidth
+        self.height = self._rows_height(self._rows)
+        return self.width, self.height
+
+    def getSpaceAfter(self) -> float:
+        return self._rows[-1][1] if self._rows else 0.0
+
+    def split(self, availWidth: float, availHeight: float) -> List[Flowable]:
+        self.wrap(availWidth, availHeight)
+        assert self._rows is not None
+        fit, used = 0, 0.0
+        for _, gap in self._rows:
+            if used + self.style.leading > availHeight + _FUZZ:
+                break
+            used += self.style.leading + gap
+            fit += 1
+        if fit == 0 or fit == len(self._rows):
+            return []
+        return [
+            TranscriptBlock(
+                self.style, self._gap, self._measure, rows=self._rows[:fit]
+            ),
+            TranscriptBlock(
+                self.style, self._gap, self._measure, rows=self._rows[fit:]
+            ),
+        ]
+
+    def draw(self) -> None:
+        canv = self.canv
+        canv.setFont(self.style.fontName, self.style.fontSize)
+        canv.setFillColor(self.style.textColor)
+        y = self.height - self.style.fontSize
+        for text, gap in self._rows or ():
+            canv.drawString(0, y, text)
+            y -= self.style.leading + gap
+
+
+class LazyStory(list):
+    """Story list that pulls flowables from an iterator as the build consumes it.
+
+    `doc.build` only looks at the head of the story and deletes flowables
+    once drawn, so keeping a small window filled bounds memory no matter
+    how long the document is.
+    """
+
+    def __init__(self, flowables: Iterable[Flowable], window: int = _STORY_WINDOW):
+        super().__init__()
+        self._source = iter(flowables)
+        self._window = window
+        self._fill()
+
+    def _fill(self) -> None:
+        missing = self._window - list.__len__(self)
+        if missing > 0:
+            self.extend(islice(self._source, missing))
+
+    def __len__(self) -> int:
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index: Any) -> Any:
+        self._fill()
+        return list.__getitem__(self, index)
+
 
 class PDFReportGenerator:
     """Utility to build PDF reports from transcript and structured notes."""
 
+    def __init__(self, template: Optional[ReportTemplate] = None) -> None:
+        # Styles, fonts and word widths are compiled once per process
+        self.template = template or get_template()
+        self.styles = self.template.styles
+        self.utterance_style = self.styles["Normal"]
+        self.measure_word = self.template.measure_word
+
+    def _document(self, output: Any) -> SimpleDocTemplate:
+        return SimpleDocTemplate(output, **self.template.document_kwargs())
+
     def _section(self, title: str, items: List, styles: Dict) -> List:
         """Create a titled section with bullet items for the PDF story."""
 
@@ -39,12 +214,113 @@ class PDFReportGenerator:
         blocks.append(Spacer(1, 0.3 * inch))
         return blocks
 
-    def export(self, *, transcript: str, notes: dict, output_path: str) -> None:
-        """Render the full report PDF at `output_path` using `notes` and `transcript`."""
+    def prepare_transcript(self, transcript: str) -> Iterator[Flowable]:
+        """Lay out the transcript section into pages, independently of the notes.
+
+        The section starts on a new page, so its layout does not depend on
+        how long the notes are and can be computed while they are being
+        generated. The first `PREPARED_TRANSCRIPT_PAGES` pages are laid out
+        now; later ones lazily, while `export` consumes the result, passed to
+        it as `transcript_pages`.
+        """
+
+        pages = self._paginate(self._transcript_story(transcript))
+        prepared = list(islice(pages, 2 * PREPARED_TRANSCRIPT_PAGES))
+        return chain(prepared, pages)
+
+    def _transcript_story(self, transcript: str) -> Iterator[Flowable]:
+        """Yield the transcript section, several utterances per flowable."""
+
+        yield Paragraph("Transcript", self.styles["Heading2"])
+        yield Spacer(1, 0.2 * inch)
+
+        group: List[str] = []
+        for line in _iter_lines(transcript):
+            if not line.strip():
+                continue
+            group.append(line)
+            if len(group) == TRANSCRIPT_BLOCK_UTTERANCES:
+                yield self._transcript_block(group)
+                group = []
+        if group:
+            yield self._transcript_block(group)
+
+    def _transcript_block(self, utterances: List[str]) -> TranscriptBlock:
+        return TranscriptBlock(
+            self.utterance_style,
+            0.15 * inch,
+            self.measure_word,
+            utterances=utterances,
+        )
+
+    def _paginate(self, story: Iterable[Flowable]) -> Iterator[Flowable]:
+        """Wrap and split flowables into page-sized `LaidOutPage`s, lazily."""
+
+        doc = self._document(BytesIO())
+        width = doc.width - 2 * _FRAME_PADDING
+        height = doc.height - 2 * _FRAME_PADDING
 
-        doc = SimpleDocTemplate(output_path, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
+        items: List[Tuple[Flowable, float, float]] = []
+        # Distance from the top of the page to the free space, like Frame._y
+        y = 0.0
+        source = iter(story)
+        # Split remainders waiting to be placed before the next story item
+        pending: deque = deque()
+
+        while True:
+            if pending:
+                flowable = pending.popleft()
+            else:
+                flowable = next(source, None)
+                if flowable is None:
+                    break
+
+            space = flowable.getSpaceBefore() if items else 0.0
+            available = height - y - space
+            h = flowable.wrap(width, available)[1] if available > 0 else height
+            if h <= available + _FUZZ:
+                items.append((flowable, y + space, h))
+                y += space + h + flowable.getSpaceAfter()
+                continue
+
+            parts = flowable.split(width, available) if available > 0 else []
+            if parts and parts[0] is not flowable:
+                pending.extendleft(reversed(parts))
+            elif items:
+                # Nothing more fits: close the page and retry on a fresh one
+                pending.appendleft(flowable)
+                yield LaidOutPage(items)
+                yield PageBreak()
+                items, y = [], 0.0
+            else:
+                # Taller than a page and unsplittable; building reports it
+                items.append((flowable, 0.0, h))
+                y = height
+
+        if items:
+            yield LaidOutPage(items)
+
+    def export(
+        self,
+        *,
+        transcript: str,
+        notes: dict,
+        output_path: str,
+        transcript_pages: Optional[Iterable[Flowable]] = None,
+    ) -> None:
+        """Render the full report PDF at `output_path` using `notes` and `transcript`.
+
+        `transcript_pages` is the output of `prepare_transcript`, when it was
+        computed ahead of time. Transcript pages are typeset and drawn one
+        after the other, so memory does not grow with the meeting length.
+        """
+
+        if transcript_pages is None:
+            transcript_pages = self._paginate(self._transcript_story(transcript))
+
+        doc = self._document(output_path)
+        styles = self.styles
+        story: List[Flowable] = []
 
         # Title
         story.append(Paragraph(notes["title"], styles["Title"]))
@@ -66,22 +342,22 @@ class PDFReportGenerator:
         story.extend(self._section("Action Items", notes["action_items"], styles))
 
         # Transcript
-        story.append(Spacer(1, 0.5 * inch))
-        story.append(Paragraph("Transcript", styles["Heading2"]))
-        story.append(Spacer(1, 0.2 * inch))
+        story.append(PageBreak())
 
-        for line in transcript.splitlines():
-            story.append(Paragraph(line, styles["Normal"]))
-            story.append(Spacer(1, 0.15 * inch))
+        doc.build(
+            LazyStory(chain(story, transcript_pages)),
+            onFirstPage=self.template.draw_page,
+            onLaterPages=self.template.draw_page,
+        )
 
-        doc.build(story)
 
-    def _block(self, text: str, styles: Dict) -> List:
-        """Split text into paragraph blocks suitable for the PDF story."""
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of `text` without materializing them all at once."""
 
-        blocks = []
-        for line in text.splitlines():
-            if line.strip():
-                blocks.append(Paragraph(line, styles["Normal"]))
-                blocks.append(Spacer(1, 0.15 * inch))
-        return blocks
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+        yield text[start:end].rstrip("\r")
+        start = end + 1
@@ -0,0 +1,131 @@
+"""
+In-process cache of the users that requests authenticate as.
+"""
+
+import time
+from typing import Any, Dict, Optional, Set, cast
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import get_history
+
+from app.core.config import settings
+from app.models.user import APIToken, User
+from app.utils.lru_cache import LRUCache
+
+# Session.info key of the cache keys to drop once the session commits
+_PENDING = "principal_cache_invalidations"
+# Pending marker for bulk UPDATE/DELETE statements, whose rows are unknown
+_ALL = "*"
+
+
+def _user_key(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def _token_key(token_hash: str) -> str:
+    return f"token:{token_hash}"
+
+
+class PrincipalCache:
+    """TTL- and size-bounded cache of users resolved from credentials.
+
+    Users are cached by id as plain column values, and API tokens by
+    stored hash as the id of their user, so a token never outlives changes
+    to its user. Each hit returns a fresh detached `User`, never an object
+    shared between requests. Entries are dropped when a session commits
+    changes to the user or token (see the ORM events below); other
+    processes see those changes within `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: float, capacity: int):
+        self._ttl = ttl_seconds
+        self._entries = LRUCache(capacity)
+
+    def get_user(self, user_id: Any) -> Optional[User]:
+        values = self._get(_user_key(user_id))
+        if values is None:
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put_user(self, user: User) -> None:
+        values = {column.key: getattr(user, column.key) for column in User.__table__.c}
+        self._put(_user_key(user.id), values)
+
+    def get_token_user_id(self, token_hash: str) -> Optional[int]:
+        entry = self._get(_token_key(token_hash))
+        return None if entry is None else entry["user_id"]
+
+    def put_token(self, token_hash: str, user_id: int) -> None:
+        self._put(_token_key(token_hash), {"user_id": user_id})
+
+    def invalidate(self, key: str) -> None:
+        if key == _ALL:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return cast(Dict[str, Any], entry["value"])
+
+    def _put(self, key: str, value: Dict[str, Any]) -> None:
+        if self._ttl > 0:
+            self._entries.put(
+                key, {"value": value, "expires_at": time.monotonic() + self._ttl}
+            )
+
+
+principal_cache = PrincipalCache(
+    settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_SIZE
+)
+
+
+def _invalidate_on_commit(session: Optional[Session], keys: Set[str]) -> None:
+    # Dropped now and again after the commit, so a request reading the old
+    # row meanwhile cannot keep it cached
+    for key in keys:
+        principal_cache.invalidate(key)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).update(keys)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper: Any, connection: Any, target: User) -> None:
+    _invalidate_on_commit(object_session(target), {_user_key(target.id)})
+
+
+@event.listens_for(APIToken, "after_update")
+@event.listens_for(APIToken, "after_delete")
+def _token_changed(mapper: Any, connection: Any, target: APIToken) -> None:
+    history = get_history(target, "token_hash")
+    hashes = {target.token_hash, *history.deleted}
+    _invalidate_on_commit(object_session(target), {_token_key(h) for h in hashes if h})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_change(state: Any) -> None:
+    if (state.is_update or state.is_delete) and state.bind_mapper in (
+        inspect(User),
+        inspect(APIToken),
+    ):
+        _invalidate_on_commit(state.session, {_ALL})
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for key in session.info.pop(_PENDING, ()):
+        principal_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,159 @@
+"""
+PDF rendering in worker processes, away from the event loop.
+"""
+
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.renderers.base import ReportFormat, report_notes
+from app.services.renderers.registry import get_renderer
+from app.services.report_templates import warm_templates
+
+# Transcript layouts prepared in this process, by job id. Lives in the worker
+# processes; also used by the in-process fallback.
+_prepared: "OrderedDict[str, Iterator[Any]]" = OrderedDict()
+
+
+def _prepare(key: str, transcript: str, cache_size: int) -> None:
+    _prepared[key] = PDFReportGenerator().prepare_transcript(transcript)
+    while len(_prepared) > cache_size:
+        _prepared.popitem(last=False)
+
+
+def _render(key: str, transcript: str, notes: Dict, output_path: str) -> None:
+    PDFReportGenerator().export(
+        transcript=transcript,
+        notes=report_notes(notes),
+        output_path=output_path,
+        # Evicted or never prepared: `export` lays the transcript out itself
+        transcript_pages=_prepared.pop(key, None),
+    )
+
+
+def _render_as(
+    report_format: ReportFormat,
+    template_name: str,
+    transcript: str,
+    notes: Dict,
+    output_path: str,
+) -> None:
+    get_renderer(report_format, template_name).render(
+        transcript=transcript, notes=notes, output_path=output_path
+    )
+
+
+def _discard(key: str) -> None:
+    _prepared.pop(key, None)
+
+
+class RenderPool:
+    """Runs `PDFReportGenerator` in single-worker processes.
+
+    Only plain data (transcript text, notes dict, paths) crosses the process
+    boundary. A job is pinned to one worker, so the transcript layout it
+    prepares while the notes are generated is still in memory when its
+    report is rendered. At most `max_concurrency` calls run or wait in the
+    workers at once. With `processes=0` everything runs in a thread instead.
+    """
+
+    def __init__(self, processes: int, max_concurrency: int, cache_size: int = 4):
+        self._processes = processes
+        self._cache_size = cache_size
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._workers: List[Executor] = []
+        self._pinned: Dict[str, int] = {}
+
+    async def prepare(self, key: str, transcript: str) -> None:
+        """Lay out the transcript of job `key` ahead of its rendering."""
+
+        await self._run(key, _prepare, key, transcript, self._cache_size)
+
+    async def render(
+        self, key: str, *, transcript: str, notes: Dict, output_path: str
+    ) -> None:
+        """Render the report of job `key` to `output_path`."""
+
+        try:
+            await self._run(key, _render, key, transcript, notes, output_path)
+        finally:
+            self._pinned.pop(key, None)
+
+    async def render_as(
+        self,
+        key: str,
+        report_format: ReportFormat,
+        *,
+        template_name: str,
+        transcript: str,
+        notes: Dict,
+        output_path: str,
+    ) -> None:
+        """Render a report in any format, from stored notes and transcript."""
+
+        try:
+            await self._run(
+                key,
+                _render_as,
+                report_format,
+                template_name,
+                transcript,
+                notes,
+                output_path,
+            )
+        finally:
+            self._pinned.pop(key, None)
+
+    def discard(self, key: str) -> None:
+        """Drop the prepared layout of a job that will not be rendered."""
+
+        worker = self._pinned.pop(key, None)
+        if worker is None:
+            _discard(key)
+        else:
+            self._workers[worker].submit(_discard, key)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+
+        for worker in self._workers:
+            worker.shutdown(wait=False, cancel_futures=True)
+        self._workers.clear()
+        self._pinned.clear()
+
+    def _worker_for(self, key: str) -> Optional[Executor]:
+        if self._processes <= 0:
+            return None
+        if not self._workers:
+            # Spawn rather than fork: the API process runs threads and a loop
+            context = multiprocessing.get_context("spawn")
+            self._workers = [
+                ProcessPoolExecutor(
+                    max_workers=1, mp_context=context, initializer=warm_templates
+                )
+                for _ in range(self._processes)
+            ]
+        if key not in self._pinned:
+            load = [0] * len(self._workers)
+            for worker in self._pinned.values():
+                load[worker] += 1
+            self._pinned[key] = load.index(min(load))
+        return self._workers[self._pinned[key]]
+
+    async def _run(self, key: str, fn: Any, *args: Any) -> None:
+        async with self._slots:
+            worker = self._worker_for(key)
+            if worker is None:
+                await asyncio.to_thread(fn, *args)
+            else:
+                await asyncio.get_running_loop().run_in_executor(worker, fn, *args)
+
+
+render_pool = RenderPool(
+    processes=settings.PDF_RENDER_PROCESSES,
+    max_concurrency=settings.PDF_RENDER_MAX_CONCURRENCY,
+)
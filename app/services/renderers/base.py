@@ -0,0 +1,87 @@
+import enum
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.services.report_templates import ReportTemplate, get_template
+
+# Titled list sections of the notes, in report order
+NOTES_SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("Topics Discussed", "topics_discussed"),
+    ("Decisions Made", "decisions_made"),
+    ("Action Items", "action_items"),
+)
+# Title of a report whose notes have none
+DEFAULT_TITLE = "Meeting Report"
+
+
+class ReportFormat(str, enum.Enum):
+    PDF = "pdf"
+    HTML = "html"
+    MARKDOWN = "md"
+    DOCX = "docx"
+    JSON = "json"
+
+
+class BaseReportRenderer(ABC):
+    """Writes a report built from the notes and transcript of a job to a file."""
+
+    format: ReportFormat
+    media_type: str
+
+    def __init__(self, template: Optional[ReportTemplate] = None) -> None:
+        self.template = template or get_template()
+
+    def render(
+        self, *, transcript: Optional[str], notes: Optional[Dict], output_path: str
+    ) -> None:
+        """Write the report for `notes` and `transcript` to `output_path`."""
+
+        self.write(
+            transcript=transcript or "",
+            notes=report_notes(notes),
+            output_path=output_path,
+        )
+
+    @abstractmethod
+    def write(self, *, transcript: str, notes: Dict, output_path: str) -> None:
+        """Write the report for notes normalised by `report_notes`."""
+        pass
+
+
+def report_notes(notes: Optional[Dict]) -> Dict:
+    """Return `notes` with every field a report prints present and typed.
+
+    Models may omit a field or return null for it: the title falls back to
+    `DEFAULT_TITLE`, the summary to an empty string and each section to an
+    empty list, whose null items are dropped. Other fields are kept as is.
+    """
+
+    notes = notes or {}
+    normalised = {
+        **notes,
+        "title": _text(notes.get("title")) or DEFAULT_TITLE,
+        "summary": _text(notes.get("summary")),
+    }
+    for _, key in NOTES_SECTIONS:
+        normalised[key] = _items(notes.get(key))
+    return normalised
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _items(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [str(item) for item in value if item is not None]
+
+
+def transcript_lines(transcript: str) -> Iterator[str]:
+    """Yield the non-blank utterances of a transcript."""
+
+    for line in transcript.splitlines():
+        if line.strip():
+            yield line
@@ -0,0 +1,115 @@
+import zipfile
+from typing import IO, Dict
+from xml.sax.saxutils import escape
+
+from app.services.renderers.base import (
+    NOTES_SECTIONS,
+    BaseReportRenderer,
+    ReportFormat,
+    transcript_lines,
+)
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    "</Types>"
+)
+
+_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+
+def _style(style_id: str, name: str, size: int, bold: bool) -> str:
+    weight = "<w:b/>" if bold else ""
+    return (
+        f'<w:style w:type="paragraph" w:styleId="{style_id}">'
+        f'<w:name w:val="{name}"/><w:basedOn w:val="Normal"/>'
+        '<w:pPr><w:spacing w:before="240" w:after="120"/></w:pPr>'
+        f'<w:rPr>{weight}<w:sz w:val="{size}"/></w:rPr></w:style>'
+    )
+
+
+def _paragraph(text: str, style: str = "") -> str:
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return (
+        f'<w:p>{props}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+    )
+
+
+class DOCXRenderer(BaseReportRenderer):
+    """Word document, written straight into the zip container.
+
+    Only the handful of package parts Word needs are produced, so no
+    document library is required.
+    """
+
+    format = ReportFormat.DOCX
+    media_type = (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+
+    def write(self, *, transcript: str, notes: Dict, output_path: str) -> None:
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as docx:
+            docx.writestr("[Content_Types].xml", _CONTENT_TYPES)
+            docx.writestr("_rels/.rels", _PACKAGE_RELS)
+            docx.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+            docx.writestr("word/styles.xml", self._styles())
+            with docx.open("word/document.xml", "w") as part:
+                self._write_document(part, transcript, notes)
+
+    def _styles(self) -> str:
+        base = self.template.styles["Normal"]
+        # Word sizes are in half points
+        size = round(base.fontSize * 2)
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:styles xmlns:w="{_W}">'
+            '<w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+            '<w:name w:val="Normal"/><w:pPr><w:spacing w:after="120"/></w:pPr>'
+            f'<w:rPr><w:sz w:val="{size}"/></w:rPr></w:style>'
+            + _style("Title", "Title", size * 2, True)
+            + _style("Heading2", "heading 2", round(size * 1.4), True)
+            + "</w:styles>"
+        )
+
+    def _write_document(self, part: IO[bytes], transcript: str, notes: Dict) -> None:
+        def write(xml: str) -> None:
+            part.write(xml.encode("utf-8"))
+
+        write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{_W}"><w:body>'
+        )
+        write(_paragraph(notes["title"], "Title"))
+        write(_paragraph("Summary", "Heading2"))
+        write(_paragraph(notes["summary"]))
+        for heading, key in NOTES_SECTIONS:
+            write(_paragraph(heading, "Heading2"))
+            for item in notes[key] or ["None."]:
+                write(_paragraph(f"• {item}"))
+        write(_paragraph("Transcript", "Heading2"))
+        for line in transcript_lines(transcript):
+            write(_paragraph(line))
+        write("</w:body></w:document>")
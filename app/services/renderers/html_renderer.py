@@ -0,0 +1,39 @@
+from html import escape
+from typing import Dict
+
+from app.services.renderers.base import (
+    NOTES_SECTIONS,
+    BaseReportRenderer,
+    ReportFormat,
+    transcript_lines,
+)
+
+
+class HTMLRenderer(BaseReportRenderer):
+    """Standalone HTML page, written line by line."""
+
+    format = ReportFormat.HTML
+    media_type = "text/html"
+
+    def write(self, *, transcript: str, notes: Dict, output_path: str) -> None:
+        title = escape(notes["title"])
+        with open(output_path, "w", encoding="utf-8") as out:
+            out.write(
+                '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                f"<title>{title}</title>\n</head>\n<body>\n<h1>{title}</h1>\n"
+            )
+            out.write(f"<h2>Summary</h2>\n<p>{escape(notes['summary'])}</p>\n")
+            for heading, key in NOTES_SECTIONS:
+                out.write(f"<h2>{heading}</h2>\n")
+                items = notes[key]
+                if items:
+                    out.write("<ul>\n")
+                    for item in items:
+                        out.write(f"<li>{escape(item)}</li>\n")
+                    out.write("</ul>\n")
+                else:
+                    out.write("<p>None.</p>\n")
+            out.write("<h2>Transcript</h2>\n")
+            for line in transcript_lines(transcript):
+                out.write(f"<p>{escape(line)}</p>\n")
+            out.write("</body>\n</html>\n")
@@ -0,0 +1,13 @@
+import json
+from typing import Dict
+
+from app.services.renderers.base import BaseReportRenderer, ReportFormat
+
+
+class JSONRenderer(BaseReportRenderer):
+    format = ReportFormat.JSON
+    media_type = "application/json"
+
+    def write(self, *, transcript: str, notes: Dict, output_path: str) -> None:
+        with open(output_path, "w", encoding="utf-8") as out:
+            json.dump({**notes, "transcript": transcript}, out, ensure_ascii=False)
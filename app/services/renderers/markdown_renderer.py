@@ -0,0 +1,28 @@
+from typing import Dict
+
+from app.services.renderers.base import (
+    NOTES_SECTIONS,
+    BaseReportRenderer,
+    ReportFormat,
+    transcript_lines,
+)
+
+
+class MarkdownRenderer(BaseReportRenderer):
+    format = ReportFormat.MARKDOWN
+    media_type = "text/markdown"
+
+    def write(self, *, transcript: str, notes: Dict, output_path: str) -> None:
+        with open(output_path, "w", encoding="utf-8") as out:
+            out.write(f"# {notes['title']}\n\n## Summary\n\n{notes['summary']}\n\n")
+            for heading, key in NOTES_SECTIONS:
+                out.write(f"## {heading}\n\n")
+                items = notes[key]
+                for item in items:
+                    out.write(f"- {item}\n")
+                if not items:
+                    out.write("None.\n")
+                out.write("\n")
+            out.write("## Transcript\n\n")
+            for line in transcript_lines(transcript):
+                out.write(f"{line}\n\n")
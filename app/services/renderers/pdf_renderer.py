@@ -0,0 +1,14 @@
+from typing import Dict
+
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.renderers.base import BaseReportRenderer, ReportFormat
+
+
+class PDFRenderer(BaseReportRenderer):
+    format = ReportFormat.PDF
+    media_type = "application/pdf"
+
+    def write(self, *, transcript: str, notes: Dict, output_path: str) -> None:
+        PDFReportGenerator(self.template).export(
+            transcript=transcript, notes=notes, output_path=output_path
+        )
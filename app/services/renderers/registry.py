@@ -0,0 +1,28 @@
+from typing import Dict, Optional, Type
+
+from app.services.renderers.base import BaseReportRenderer, ReportFormat
+from app.services.renderers.docx_renderer import DOCXRenderer
+from app.services.renderers.html_renderer import HTMLRenderer
+from app.services.renderers.json_renderer import JSONRenderer
+from app.services.renderers.markdown_renderer import MarkdownRenderer
+from app.services.renderers.pdf_renderer import PDFRenderer
+from app.services.report_templates import get_template
+
+RENDERERS: Dict[ReportFormat, Type[BaseReportRenderer]] = {
+    renderer.format: renderer
+    for renderer in (
+        PDFRenderer,
+        HTMLRenderer,
+        MarkdownRenderer,
+        DOCXRenderer,
+        JSONRenderer,
+    )
+}
+
+
+def get_renderer(
+    report_format: ReportFormat, template_name: Optional[str] = None
+) -> BaseReportRenderer:
+    """Return a renderer of `report_format` using the named template."""
+
+    return RENDERERS[ReportFormat(report_format)](get_template(template_name))
@@ -0,0 +1,81 @@
+"""
+Reports rendered on demand, cached on disk by content and template.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from typing import Dict
+
+from app.core.config import settings
+from app.services.render_pool import RenderPool, render_pool
+from app.services.renderers.base import ReportFormat
+from app.services.report_templates import get_template
+from app.utils.singleflight import SingleFlight
+
+
+def content_hash(transcript: str, notes: Dict) -> str:
+    """Hash of everything a report is built from."""
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(notes, sort_keys=True).encode())
+    digest.update(b"\0")
+    digest.update(transcript.encode())
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Renders each (content, template version, format) once.
+
+    Files are named after that key, so jobs with identical notes and
+    transcript share their outputs, and a new template version renders
+    again instead of serving stale files. A render is written to a
+    temporary name and moved into place, so a file in the cache is always
+    complete; concurrent requests for the same key wait for one render.
+    """
+
+    def __init__(self, directory: str, renderer: RenderPool):
+        self.directory = directory
+        self.renderer = renderer
+        self._renders: SingleFlight[str] = SingleFlight()
+
+    def path_for(
+        self, report_format: ReportFormat, transcript: str, notes: Dict
+    ) -> str:
+        template = get_template()
+        key = f"{content_hash(transcript, notes)[:32]}-{template.version}"
+        return os.path.join(self.directory, f"{key}.{report_format.value}")
+
+    async def get(
+        self, report_format: ReportFormat, *, transcript: str, notes: Dict
+    ) -> str:
+        """Return the path of the report, rendering it on first request."""
+
+        path = self.path_for(report_format, transcript, notes)
+        if os.path.exists(path):
+            return path
+
+        async def render() -> str:
+            os.makedirs(self.directory, exist_ok=True)
+            partial = f"{path}.{uuid.uuid4().hex}.part"
+            try:
+                await self.renderer.render_as(
+                    os.path.basename(path),
+                    report_format,
+                    template_name=get_template().name,
+                    transcript=transcript,
+                    notes=notes,
+                    output_path=partial,
+                )
+                os.replace(partial, path)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            return path
+
+        result, _ = await self._renders.do(path, render)
+        return result
+
+
+report_cache = ReportCache(settings.REPORT_CACHE_DIR, render_pool)
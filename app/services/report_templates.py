@@ -0,0 +1,149 @@
+"""
+Named report templates: page setup, styles and fonts, loaded once per process.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from reportlab.lib.pagesizes import A4, LETTER
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from app.core.config import settings
+
+# Registered name of the TTF family used when `REPORT_FONT_PATH` is set
+REPORT_FONT = "ReportSans"
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Declarative description of a report template."""
+
+    name: str
+    version: int
+    pagesize: Tuple[float, float] = A4
+    margin: float = inch
+    font_scale: float = 1.0
+    footer: bool = True
+
+
+@dataclass
+class ReportTemplate:
+    """A compiled template, shared by every render of this process."""
+
+    spec: TemplateSpec
+    styles: StyleSheet1
+    measure_word: Callable[[str], float] = field(repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the output of the template may change."""
+
+        return f"{self.spec.name}-v{self.spec.version}"
+
+    def document_kwargs(self) -> Dict[str, Any]:
+        margin = self.spec.margin
+        return {
+            "pagesize": self.spec.pagesize,
+            "leftMargin": margin,
+            "rightMargin": margin,
+            "topMargin": margin,
+            "bottomMargin": margin,
+        }
+
+    def draw_page(self, canv: Any, doc: Any) -> None:
+        """Draw the fixed elements of every page."""
+
+        if not self.spec.footer:
+            return
+        style = self.styles["Normal"]
+        canv.saveState()
+        canv.setFont(style.fontName, style.fontSize * 0.8)
+        canv.setFillColor(style.textColor)
+        canv.drawCentredString(
+            self.spec.pagesize[0] / 2, self.spec.margin / 2, f"Page {doc.page}"
+        )
+        canv.restoreState()
+
+
+TEMPLATES: Dict[str, TemplateSpec] = {
+    spec.name: spec
+    for spec in (
+        TemplateSpec(name="default", version=1),
+        TemplateSpec(name="compact", version=1, margin=0.6 * inch, font_scale=0.9),
+        TemplateSpec(name="letter", version=1, pagesize=LETTER),
+    )
+}
+
+_compiled: Dict[str, ReportTemplate] = {}
+_lock = threading.Lock()
+
+
+def _register_fonts() -> Optional[str]:
+    """Register the configured TTF family once; returns its name if any."""
+
+    if not settings.REPORT_FONT_PATH:
+        return None
+    if REPORT_FONT not in pdfmetrics.getRegisteredFontNames():
+        bold_path = settings.REPORT_FONT_BOLD_PATH or settings.REPORT_FONT_PATH
+        pdfmetrics.registerFont(TTFont(REPORT_FONT, settings.REPORT_FONT_PATH))
+        pdfmetrics.registerFont(TTFont(f"{REPORT_FONT}-Bold", bold_path))
+        pdfmetrics.registerFontFamily(
+            REPORT_FONT,
+            normal=REPORT_FONT,
+            bold=f"{REPORT_FONT}-Bold",
+            italic=REPORT_FONT,
+            boldItalic=f"{REPORT_FONT}-Bold",
+        )
+    return REPORT_FONT
+
+
+def _compile(spec: TemplateSpec) -> ReportTemplate:
+    styles = getSampleStyleSheet()
+    font = _register_fonts()
+    for style in styles.byName.values():
+        if hasattr(style, "fontSize"):
+            style.fontSize *= spec.font_scale
+            style.leading *= spec.font_scale
+        if font and getattr(style, "fontName", "").startswith("Helvetica"):
+            bold = "Bold" in style.fontName
+            style.fontName = f"{font}-Bold" if bold else font
+
+    normal = styles["Normal"]
+    # Meetings reuse a small vocabulary; measure every word once per process
+    measure_word = lru_cache(maxsize=65536)(
+        lambda word: pdfmetrics.stringWidth(word, normal.fontName, normal.fontSize)
+    )
+    return ReportTemplate(spec=spec, styles=styles, measure_word=measure_word)
+
+
+def get_template(name: Optional[str] = None) -> ReportTemplate:
+    """Return the compiled template `name` (default: `REPORT_TEMPLATE`)."""
+
+    name = name or settings.REPORT_TEMPLATE
+    template = _compiled.get(name)
+    if template is not None:
+        return template
+
+    spec = TEMPLATES.get(name)
+    if spec is None:
+        raise ValueError(f"Unknown report template: {name}")
+    with _lock:
+        if name not in _compiled:
+            _compiled[name] = _compile(spec)
+        return _compiled[name]
+
+
+def warm_templates() -> None:
+    """Compile every template (and register fonts) ahead of the first render."""
+
+    for name in TEMPLATES:
+        get_template(name)
@@ -0,0 +1,218 @@
+"""
+Fair scheduling of audio processing pipelines.
+"""
+
+import asyncio
+import functools
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.audio import JobPriority
+
+PipelineFactory = Callable[[], Coroutine[Any, Any, None]]
+
+
+@dataclass
+class _QueuedJob:
+    job_id: str
+    user_id: int
+    priority: JobPriority
+    cost: float
+    factory: PipelineFactory
+    seq: int
+
+
+@dataclass
+class _UserState:
+    pending: List[_QueuedJob] = field(default_factory=list)
+    running: int = 0
+    virtual_finish: float = 0.0
+
+
+class JobScheduler:
+    """In-process weighted fair queue in front of pipeline execution.
+
+    Every user has a virtual finish time that grows with the estimated cost
+    (audio seconds) of the jobs dispatched for them, divided by the weight of
+    the job's priority class. The next job dispatched is the one with the
+    smallest virtual finish tag, so a user with hundreds of queued
+    recordings cannot starve others. Within a user, interactive jobs go
+    before bulk ones and shorter recordings before longer ones.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_user_concurrency: int,
+        weights: Dict[JobPriority, float],
+        seconds_per_cost: float,
+    ):
+        self._max_concurrency = max_concurrency
+        self._per_user_concurrency = per_user_concurrency
+        self._weights = weights
+        self._seconds_per_cost = seconds_per_cost
+        self._users: Dict[int, _UserState] = {}
+        self._queued: Dict[str, _QueuedJob] = {}
+        self._running: Dict[str, Tuple["asyncio.Task[None]", _QueuedJob, float]] = {}
+        self._virtual_time = 0.0
+        self._seq = 0
+
+    def submit(
+        self,
+        job_id: str,
+        user_id: int,
+        factory: PipelineFactory,
+        priority: JobPriority = JobPriority.INTERACTIVE,
+        cost: float = 0.0,
+    ) -> None:
+        """Queue a pipeline and start it as soon as capacity allows."""
+
+        if job_id in self._queued or job_id in self._running:
+            return
+
+        self._seq += 1
+        entry = _QueuedJob(
+            job_id, user_id, priority, max(cost, 1.0), factory, self._seq
+        )
+        self._users.setdefault(user_id, _UserState()).pending.append(entry)
+        self._queued[job_id] = entry
+        self._dispatch()
+
+    def queue_info(self, job_id: str) -> Tuple[Optional[int], Optional[datetime]]:
+        """Return the 1-based queue position and estimated start of a queued job."""
+
+        if job_id not in self._queued:
+            return None, None
+
+        ahead = 0.0
+        for position, entry in enumerate(self._planned_order(), start=1):
+            if entry.job_id == job_id:
+                break
+            ahead += entry.cost * self._seconds_per_cost
+
+        now = time.monotonic()
+        remaining = sum(
+            max(entry.cost * self._seconds_per_cost - (now - started), 0.0)
+            for _, entry, started in self._running.values()
+        )
+        wait = (ahead + remaining) / self._max_concurrency
+        return position, datetime.now(timezone.utc) + timedelta(seconds=wait)
+
+    async def cancel(self, job_id: str) -> bool:
+        """Drop a queued job or cancel its running pipeline task."""
+
+        entry = self._queued.pop(job_id, None)
+        if entry is not None:
+            state = self._users[entry.user_id]
+            state.pending.remove(entry)
+            if not state.pending and not state.running:
+                del self._users[entry.user_id]
+            return True
+
+        running = self._running.get(job_id)
+        if running is None:
+            return False
+        task = running[0]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel running pipelines; their checkpoints let them resume later."""
+
+        tasks = [task for task, _, _ in self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._users.clear()
+        self._queued.clear()
+
+    def _weight(self, entry: _QueuedJob) -> float:
+        return self._weights.get(entry.priority, 1.0)
+
+    def _next_for_user(self, state: _UserState) -> _QueuedJob:
+        return min(state.pending, key=lambda e: (-self._weight(e), e.cost, e.seq))
+
+    def _select(
+        self, users: Dict[int, _UserState], virtual_time: float, respect_caps: bool
+    ) -> Optional[Tuple[_QueuedJob, float, float]]:
+        """Pick the eligible job with the smallest virtual finish tag."""
+
+        best: Optional[Tuple[_QueuedJob, float, float]] = None
+        for state in users.values():
+            if not state.pending:
+                continue
+            if respect_caps and state.running >= self._per_user_concurrency:
+                continue
+            entry = self._next_for_user(state)
+            start = max(virtual_time, state.virtual_finish)
+            finish = start + entry.cost / self._weight(entry)
+            if best is None or (finish, entry.seq) < (best[2], best[0].seq):
+                best = (entry, start, finish)
+        return best
+
+    def _dispatch(self) -> None:
+        while len(self._running) < self._max_concurrency:
+            picked = self._select(self._users, self._virtual_time, respect_caps=True)
+            if picked is None:
+                return
+            entry, start, finish = picked
+            state = self._users[entry.user_id]
+            state.pending.remove(entry)
+            state.running += 1
+            state.virtual_finish = finish
+            self._virtual_time = start
+            del self._queued[entry.job_id]
+
+            task = asyncio.create_task(entry.factory())
+            self._running[entry.job_id] = (task, entry, time.monotonic())
+            task.add_done_callback(functools.partial(self._on_done, entry))
+
+    def _on_done(self, entry: _QueuedJob, task: "asyncio.Task[None]") -> None:
+        _, _, started = self._running.pop(entry.job_id)
+        # Keep the runtime estimate close to what pipelines actually take
+        observed = (time.monotonic() - started) / entry.cost
+        self._seconds_per_cost = 0.8 * self._seconds_per_cost + 0.2 * observed
+
+        state = self._users.get(entry.user_id)
+        if state is not None:
+            state.running -= 1
+            if not state.pending and not state.running:
+                del self._users[entry.user_id]
+        self._dispatch()
+
+    def _planned_order(self) -> List[_QueuedJob]:
+        """Simulate dispatch order of queued jobs, ignoring concurrency caps."""
+
+        users = {
+            user_id: _UserState(
+                pending=list(state.pending), virtual_finish=state.virtual_finish
+            )
+            for user_id, state in self._users.items()
+        }
+        virtual_time = self._virtual_time
+        order: List[_QueuedJob] = []
+        while len(order) < len(self._queued):
+            picked = self._select(users, virtual_time, respect_caps=False)
+            if picked is None:
+                break
+            entry, start, finish = picked
+            users[entry.user_id].pending.remove(entry)
+            users[entry.user_id].virtual_finish = finish
+            virtual_time = start
+            order.append(entry)
+        return order
+
+
+scheduler = JobScheduler(
+    max_concurrency=settings.PIPELINE_MAX_CONCURRENCY,
+    per_user_concurrency=settings.PIPELINE_PER_USER_CONCURRENCY,
+    weights={
+        JobPriority.INTERACTIVE: settings.PIPELINE_INTERACTIVE_WEIGHT,
+        JobPriority.BULK: settings.PIPELINE_BULK_WEIGHT,
+    },
+    seconds_per_cost=settings.PIPELINE_SECONDS_PER_AUDIO_SECOND,
+)
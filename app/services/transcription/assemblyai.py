@@ -1,9 +1,16 @@
 import asyncio
-from typing import Dict, Any, List
+import os
+from typing import AsyncIterator, Dict, Any, List, Optional
 import httpx
 
 from app.core.config import settings
-from app.services.transcription.base import BaseTranscriber
+from app.services.transcription.base import (
+    BaseTranscriber,
+    ProgressCallback,
+    TranscriptionFailed,
+)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class AssemblyAITranscriber(BaseTranscriber):
@@ -23,7 +30,10 @@ class AssemblyAITranscriber(BaseTranscriber):
     async def __aenter__(self) -> "AssemblyAITranscriber":
         self._client = httpx.AsyncClient(
             headers=self.headers,
-            timeout=None,
+            timeout=httpx.Timeout(
+                settings.PROVIDER_READ_TIMEOUT,
+                connect=settings.PROVIDER_CONNECT_TIMEOUT,
+            ),
         )
         return self
 
@@ -32,26 +42,49 @@ class AssemblyAITranscriber(BaseTranscriber):
             await self._client.aclose()
 
     async def transcribe(self, audio_path: str) -> Dict:
-        audio_url = await self._upload_audio(audio_path)
-        transcript_id = await self._request_transcription(audio_url)
-        transcript_data = await self._poll_transcription(transcript_id)
+        transcript_id = await self.submit(audio_path)
+        return await self.fetch(transcript_id)
+
+    async def submit(
+        self, audio_path: str, on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        audio_url = await self._upload_audio(audio_path, on_progress)
+        return await self._request_transcription(audio_url)
+
+    async def fetch(
+        self, transcript_id: str, on_progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        transcript_data = await self._poll_transcription(transcript_id, on_progress)
 
         return {
             "transcript": self._format_diarized_text(transcript_data),
             "language_code": transcript_data.get("language_code"),
         }
 
-    async def _upload_audio(self, audio_path: str) -> str:
+    async def cancel(self, transcript_id: str) -> None:
         """
-        Upload an audio file to AssemblyAI and return its hosted URL.
+        Best-effort deletion of a transcript on the AssemblyAI side.
         """
         assert self._client is not None
-        with open(audio_path, "rb") as file:
-            audio_bytes = file.read()
+        try:
+            response = await self._client.delete(
+                f"{self._base_url}/transcript/{transcript_id}"
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            # Transcripts still being processed cannot always be deleted
+            pass
 
+    async def _upload_audio(
+        self, audio_path: str, on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        Upload an audio file to AssemblyAI and return its hosted URL.
+        """
+        assert self._client is not None
         response = await self._client.post(
             f"{self._base_url}/upload",
-            content=audio_bytes,
+            content=self._read_chunks(audio_path, on_progress),
         )
         response.raise_for_status()
         data = response.json()
@@ -72,11 +105,34 @@ class AssemblyAITranscriber(BaseTranscriber):
         data = response.json()
         return str(data["id"])
 
-    async def _poll_transcription(self, transcript_id: str) -> Dict[str, Any]:
+    async def _read_chunks(
+        self, audio_path: str, on_progress: Optional[ProgressCallback] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the audio file, reporting upload progress in 10% steps.
+        """
+        total = os.path.getsize(audio_path)
+        sent = 0
+        reported = -1
+        with open(audio_path, "rb") as file:
+            while chunk := file.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
+                sent += len(chunk)
+                percent = sent * 100 // total if total else 100
+                if on_progress and percent // 10 > reported:
+                    reported = percent // 10
+                    await on_progress(
+                        {"step": "upload", "percent": percent, "bytes": sent}
+                    )
+
+    async def _poll_transcription(
+        self, transcript_id: str, on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """
         Poll AssemblyAI until transcription completes or fails.
         """
         assert self._client is not None
+        last_status = None
         while True:
             response = await self._client.get(
                 f"{self._base_url}/transcript/{transcript_id}"
@@ -85,10 +141,13 @@ class AssemblyAITranscriber(BaseTranscriber):
             data: Dict[str, Any] = response.json()
 
             status = data.get("status")
+            if on_progress and status != last_status:
+                last_status = status
+                await on_progress({"step": "transcription", "provider_status": status})
             if status == "completed":
                 return data
             if status == "error":
-                raise RuntimeError(f"AssemblyAI error: {data.get('error')}")
+                raise TranscriptionFailed(f"AssemblyAI error: {data.get('error')}")
 
             await asyncio.sleep(self._poll_interval_seconds)
 
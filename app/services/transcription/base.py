@@ -1,8 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Receives progress updates such as upload percentage or provider status
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class TranscriptionFailed(RuntimeError):
+    """The provider gave up on a transcript; fetching it again cannot succeed."""
 
 
 class BaseTranscriber(ABC):
     @abstractmethod
     async def transcribe(self, audio_path: str) -> Dict:
         pass
+
+    @abstractmethod
+    async def submit(
+        self, audio_path: str, on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """Start a transcription and return the provider transcript id."""
+        pass
+
+    @abstractmethod
+    async def fetch(
+        self, transcript_id: str, on_progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """Wait for a submitted transcription and return its result."""
+        pass
+
+    async def cancel(self, transcript_id: str) -> None:
+        """Cancel a submitted transcription; a no-op for providers without support."""
+        return None
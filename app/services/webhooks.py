@@ -0,0 +1,272 @@
+"""
+Signed, retried delivery of job completion webhooks.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import json
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import sessionmanager
+from app.db.unit_of_work import unit_of_work
+from app.repositories.webhook import DueDelivery, WebhookDeliveryRepository
+from app.utils.urls import UnsafeURL, ensure_public_url
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+DELIVERY_HEADER = "X-Webhook-Id"
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+def callback_secret(key: str, job_id: str, url: str) -> str:
+    """Return the secret signing the webhooks of one job to one URL.
+
+    It is derived from the server key rather than stored, and handed to the
+    client that registered the callback: receivers can verify their own
+    webhooks, but no others.
+    """
+
+    digest = hmac.new(key.encode(), f"{job_id}\n{url}".encode(), hashlib.sha256)
+    return f"whsec_{digest.hexdigest()}"
+
+
+def sign_payload(secret: str, timestamp: int, body: bytes) -> str:
+    """Return the signature of a webhook body sent at `timestamp`.
+
+    Receivers recompute `HMAC-SHA256(secret, "<timestamp>.<body>")` with the
+    `webhook_secret` returned when the job was created, and compare it with
+    the `X-Webhook-Signature` header; including the timestamp lets them
+    reject replayed requests.
+    """
+
+    message = str(timestamp).encode() + b"." + body
+    digest = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+class WebhookDispatcher:
+    """Background worker sending queued webhook deliveries.
+
+    Deliveries are stored in the `webhook_deliveries` table, so they survive
+    restarts and can be sent by any worker. Failed attempts are retried with
+    exponential backoff and jitter; after `max_attempts` the delivery moves
+    to `webhook_dead_letters`. At most `concurrency` requests are in flight.
+
+    Without a `secret` webhooks are disabled: the worker does not start and
+    jobs asking for a callback are refused. Unless `allow_private_urls`,
+    callbacks must resolve to public addresses only, checked when a job is
+    accepted and again before each attempt.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        concurrency: int = 8,
+        max_attempts: int = 6,
+        backoff_base: float = 2.0,
+        backoff_max: float = 600.0,
+        timeout: float = 10.0,
+        poll_interval: float = 5.0,
+        allow_private_urls: bool = False,
+        session_factory: SessionFactory = sessionmanager.session,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._secret = secret
+        self._concurrency = concurrency
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._timeout = timeout
+        self._poll_interval = poll_interval
+        self._allow_private_urls = allow_private_urls
+        self._session_factory = session_factory
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._secret)
+
+    def secret_for(self, job_id: str, url: str) -> str:
+        """Secret signing the webhooks of `job_id` sent to `url`."""
+
+        return callback_secret(self._secret, job_id, url)
+
+    async def check_url(self, url: str) -> None:
+        """Raise `UnsafeURL` if webhooks must not be sent to `url`."""
+
+        if not self._allow_private_urls:
+            await ensure_public_url(url)
+
+    async def start(self) -> None:
+        """Start sending deliveries in the background."""
+
+        if not self.enabled:
+            logger.warning("WEBHOOK_SECRET is not set, webhooks are disabled")
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background worker; unsent deliveries stay queued."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def wake(self) -> None:
+        """Send newly queued deliveries now instead of at the next poll."""
+
+        self._wakeup.set()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay in seconds before retrying after `attempts` failed attempts."""
+
+        delay = min(self._backoff_base * 2.0 ** (attempts - 1), self._backoff_max)
+        # Full jitter in the upper half spreads retries of a burst of failures
+        return delay * random.uniform(0.5, 1.0)
+
+    async def deliver_due(self) -> int:
+        """Send every delivery due now; returns how many were attempted."""
+
+        batch = self._concurrency * 4
+        # Deliveries wait for one of `concurrency` slots: the last of a batch
+        # is sent after ceil(batch / concurrency) - 1 others, plus a margin
+        lease_seconds = (math.ceil(batch / self._concurrency) + 1) * self._timeout
+        async with self._session_factory() as session, unit_of_work(session):
+            due = await WebhookDeliveryRepository(session).claim_due(
+                batch, lease_seconds=lease_seconds
+            )
+        if not due:
+            return 0
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def send(delivery: DueDelivery) -> Tuple[DueDelivery, Optional[str]]:
+            async with semaphore:
+                return delivery, await self._send(delivery)
+
+        results = await asyncio.gather(*(send(delivery) for delivery in due))
+        await self._record(results)
+        return len(due)
+
+    async def _send(self, delivery: DueDelivery) -> Optional[str]:
+        """POST one delivery; returns None on success, else the error."""
+
+        delivery_id, job_id, url, payload, _, _ = delivery
+        # The name may have been pointed at an internal address since
+        try:
+            await self.check_url(url)
+        except UnsafeURL as exc:
+            return str(exc)
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+        timestamp = int(time.time())
+        secret = self.secret_for(job_id, url)
+        headers = {
+            "Content-Type": "application/json",
+            DELIVERY_HEADER: delivery_id,
+            TIMESTAMP_HEADER: str(timestamp),
+            SIGNATURE_HEADER: sign_payload(secret, timestamp, body),
+        }
+        try:
+            response = await self._get_client().post(url, content=body, headers=headers)
+        except httpx.HTTPError as exc:
+            return f"{type(exc).__name__}: {exc}"
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}"
+
+    async def _record(self, results: List[Tuple[DueDelivery, Optional[str]]]) -> None:
+        # The outcomes of a whole batch are committed at once. An outcome is
+        # dropped when the lease expired and another worker took the delivery
+        async with self._session_factory() as session, unit_of_work(session):
+            repo = WebhookDeliveryRepository(session)
+            for (delivery_id, _, url, _, attempts, leased_until), error in results:
+                if error is None:
+                    recorded = await repo.mark_delivered(delivery_id, leased_until)
+                    if not recorded:
+                        self._log_lost_lease(delivery_id)
+                    continue
+
+                attempts += 1
+                if attempts >= self._max_attempts:
+                    logger.warning(
+                        "Giving up on webhook %s to %s after %d attempts: %s",
+                        delivery_id,
+                        url,
+                        attempts,
+                        error,
+                    )
+                    recorded = await repo.dead_letter(
+                        delivery_id, leased_until, attempts, error
+                    )
+                else:
+                    retry_at = datetime.now(timezone.utc) + timedelta(
+                        seconds=self.backoff(attempts)
+                    )
+                    recorded = await repo.reschedule(
+                        delivery_id, leased_until, attempts, retry_at, error
+                    )
+                if not recorded:
+                    self._log_lost_lease(delivery_id)
+
+    @staticmethod
+    def _log_lost_lease(delivery_id: str) -> None:
+        logger.warning(
+            "Lease on webhook %s expired before its outcome was recorded",
+            delivery_id,
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=self._timeout,
+                follow_redirects=False,
+            )
+        return self._client
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                sent = await self.deliver_due()
+            except Exception:
+                logger.exception("Webhook delivery round failed")
+                sent = 0
+            if sent:
+                # A full batch may have left more deliveries due
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            self._wakeup.clear()
+
+
+dispatcher = WebhookDispatcher(
+    secret=settings.WEBHOOK_SECRET,
+    concurrency=settings.WEBHOOK_CONCURRENCY,
+    max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+    backoff_base=settings.WEBHOOK_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+    timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+    poll_interval=settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+    allow_private_urls=settings.WEBHOOK_ALLOW_PRIVATE_URLS,
+)
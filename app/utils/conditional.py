@@ -0,0 +1,47 @@
+"""
+Content-derived ETags and conditional GET helpers for stored files.
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import Optional, cast
+
+from app.utils.lru_cache import LRUCache
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Digests by path, modification time and size: a file is hashed once per
+# process until it changes
+_etags = LRUCache(capacity=4096)
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def file_etag(path: str, stat_result: os.stat_result) -> str:
+    """Return a strong ETag derived from the content of the file at `path`."""
+
+    key = f"{path}:{stat_result.st_mtime_ns}:{stat_result.st_size}"
+    cached = _etags.get(key)
+    if cached is None:
+        cached = {"etag": f'"{await asyncio.to_thread(_hash_file, path)}"'}
+        _etags.put(key, cached)
+    return cast(str, cached["etag"])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an `If-None-Match` header matches `etag` (weak comparison)."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,33 @@
+"""
+Opaque cursors of keyset-paginated lists.
+"""
+
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def encode_cursor(key: str) -> str:
+    """Cursor resuming a list after the row with primary key `key`."""
+
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Primary key encoded in `cursor`; ValueError when it is malformed."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def page(items: Sequence[Dict[str, Any]], limit: int, key: str) -> Dict[str, Any]:
+    """Build a page from up to `limit + 1` rows, the extra one meaning "more"."""
+
+    rows: List[Dict[str, Any]] = list(items[:limit])
+    next_cursor: Optional[str] = None
+    if len(items) > limit:
+        next_cursor = encode_cursor(rows[-1][key])
+    return {"items": rows, "next_cursor": next_cursor}
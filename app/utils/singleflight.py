@@ -0,0 +1,45 @@
+"""
+Single-flight execution of concurrent calls sharing a key.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlight(Generic[_T]):
+    """Run one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Future[_T]"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[_T]]) -> Tuple[_T, bool]:
+        """Await `fn()` or, if a call for `key` is already running, its result.
+
+        Returns the result and whether it was shared with an earlier caller.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._calls
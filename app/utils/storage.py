@@ -1,4 +1,5 @@
 import uuid
+import wave
 from pathlib import Path
 
 from fastapi import UploadFile
@@ -24,6 +25,21 @@ def is_valid_audio_file(filename: str) -> bool:
     return extension in settings.ALLOWED_AUDIO_EXTENSIONS
 
 
+def estimate_audio_duration(file_path: str) -> float:
+    """Return the audio duration in seconds, estimated from size when not WAV."""
+    path = Path(file_path)
+    if not path.exists():
+        return 0.0
+
+    if get_file_extension(file_path) == ".wav":
+        try:
+            with wave.open(str(path), "rb") as audio:
+                return audio.getnframes() / float(audio.getframerate())
+        except (wave.Error, EOFError):
+            pass
+    return path.stat().st_size / settings.AUDIO_BYTES_PER_SECOND
+
+
 async def save_uploaded_file(file: UploadFile, user_id: int) -> tuple[str, str]:
     """
     Save uploaded file to disk and return (file_path, filename).
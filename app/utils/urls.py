@@ -0,0 +1,47 @@
+"""
+Checks keeping server-side requests to client-supplied URLs off internal networks.
+"""
+
+import asyncio
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+
+class UnsafeURL(ValueError):
+    """Raised for a URL the server must not send requests to."""
+
+
+def is_public_address(address: str) -> bool:
+    """Whether `address` is a globally routable unicast IP address.
+
+    Loopback, private (RFC 1918, unique local), link-local (including cloud
+    metadata at 169.254.169.254), shared, reserved and multicast addresses
+    are not. IPv4 addresses mapped into IPv6 are judged as IPv4.
+    """
+
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def ensure_public_url(url: str) -> None:
+    """Resolve the host of `url`; raise `UnsafeURL` unless every address is public.
+
+    Every address is checked, so a name also resolving to an internal
+    address is refused even if a public one comes first.
+    """
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise UnsafeURL("URL must be an absolute http or https URL")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parts.hostname, port, type=socket.SOCK_STREAM
+        )
+    except (ValueError, OSError) as exc:
+        raise UnsafeURL(f"Host {parts.hostname} cannot be resolved") from exc
+    if not all(is_public_address(str(info[4][0])) for info in infos):
+        raise UnsafeURL(f"Host {parts.hostname} resolves to a non-public address")
@@ -0,0 +1,69 @@
+"""
+ZIP archives streamed while they are built, without staging them.
+"""
+
+import io
+import os
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Sink(io.RawIOBase):
+    """Unseekable write target collecting what `ZipFile` writes until drained.
+
+    Being unseekable makes `ZipFile` put sizes and CRCs in data descriptors
+    after each member instead of seeking back to its header.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(
+    files: Iterable[Tuple[str, str]], chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield a ZIP of `(archive name, path)` files, reading each in chunks.
+
+    At most about one chunk is held at a time, however many and however
+    large the files are. Members are stored uncompressed (reports are
+    already compressed PDFs); files missing on disk are skipped.
+    """
+
+    return (chunk for chunk in _zip_chunks(files, chunk_size) if chunk)
+
+
+def _zip_chunks(files: Iterable[Tuple[str, str]], chunk_size: int) -> Iterator[bytes]:
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+        for name, path in files:
+            try:
+                info = zipfile.ZipInfo.from_file(path, arcname=name)
+            except FileNotFoundError:
+                continue
+            with open(path, "rb") as source, archive.open(info, "w") as member:
+                while chunk := source.read(chunk_size):
+                    member.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def archive_name(job_id: str, path: str) -> str:
+    """Name of a report inside an export archive."""
+
+    return f"meeting_summary_{job_id}{os.path.splitext(path)[1]}"
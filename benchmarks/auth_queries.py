@@ -0,0 +1,116 @@
+"""
+Count database queries per authenticated request, with and without the
+principal cache.
+
+Runs the app in process against a throwaway SQLite database and sends the
+same requests with `AUTH_CACHE_TTL_SECONDS=0` (every request resolves its
+user from the database) and with the cache enabled.
+
+Usage: python -m benchmarks.auth_queries [--requests 200]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+os.environ.setdefault("VERSION", "benchmark")
+os.environ["DB_ENGINE"] = "sqlite"
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "auth_queries.sqlite3")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.core.security import (  # noqa: E402
+    api_token_prefix,
+    create_access_token,
+    generate_api_token,
+    get_password_hash,
+    hash_api_token,
+)
+from app.db.base import Base  # noqa: E402
+from app.db.session import sessionmanager  # noqa: E402
+from app.models.audio import AudioFile, AudioProcessingJob  # noqa: E402
+from app.models.user import APIToken, User  # noqa: E402
+from app.services.principal_cache import PrincipalCache  # noqa: E402
+from main import app  # noqa: E402
+
+
+async def _setup() -> Tuple[Dict[str, str], Dict[str, str], str]:
+    async with sessionmanager.connect() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with sessionmanager.session() as session:
+        user = User(username="bench", hashed_password=get_password_hash("secret"))
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        api_token = generate_api_token()
+        audio = AudioFile(
+            id=str(uuid.uuid4()), filename="a.mp3", file_path="/a.mp3", user_id=user.id
+        )
+        job_id = str(uuid.uuid4())
+        job = AudioProcessingJob(id=job_id, audio_id=audio.id)
+        jwt_headers = {
+            "Authorization": f"Bearer {create_access_token('bench', str(user.id))}"
+        }
+        token = APIToken(
+            prefix=api_token_prefix(api_token),
+            token_hash=hash_api_token(api_token),
+            user_id=user.id,
+        )
+        session.add_all([token, audio, job])
+        await session.commit()
+        return jwt_headers, {"X-API-Token": api_token}, job_id
+
+
+async def _measure(
+    client: AsyncClient, url: str, headers: Dict[str, str], requests: int
+) -> Tuple[float, float]:
+    queries: List[Any] = []
+
+    def count(*args: Any) -> None:
+        queries.append(args)
+
+    engine = sessionmanager._engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return len(queries) / requests, elapsed / requests * 1000
+
+
+async def main(requests: int) -> None:
+    jwt_headers, token_headers, job_id = await _setup()
+    cases = [
+        ("GET /auth/me (JWT)", "/auth/me", jwt_headers),
+        ("GET /auth/api-me (API token)", "/auth/api-me", token_headers),
+        ("GET /report/status (JWT)", f"/report/status/{job_id}", jwt_headers),
+    ]
+
+    print(f"{'request':<30} {'cache':>6} {'queries/req':>12} {'ms/req':>8}")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for ttl in (0, 30):
+            deps.principal_cache = PrincipalCache(ttl, 10000)
+            for name, url, headers in cases:
+                per_request, ms = await _measure(client, url, headers, requests)
+                label = "on" if ttl else "off"
+                print(f"{name:<30} {label:>6} {per_request:>12.2f} {ms:>8.2f}")
+
+    await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,118 @@
+"""
+Benchmark a burst of concurrent logins: throughput and event-loop lag.
+
+Compares bcrypt run inline on the event loop (the previous behaviour) with
+the bounded `PasswordHasher` thread pool. Runs the app in process against a
+throwaway SQLite database.
+
+Usage: python -m benchmarks.login_burst [--logins 64] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, TypeVar
+
+os.environ.setdefault("VERSION", "benchmark")
+os.environ["DB_ENGINE"] = "sqlite"
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "login_burst.sqlite3")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import sessionmanager  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import auth  # noqa: E402
+from main import app  # noqa: E402
+
+_T = TypeVar("_T")
+
+
+class InlineHasher(auth.PasswordHasher):
+    """bcrypt on the event loop, as before the thread pool."""
+
+    async def _run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        return fn(*args)
+
+
+async def _burst(logins: int, concurrency: int) -> Dict[str, Any]:
+    lag = 0.0
+    statuses: Counter = Counter()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def heartbeat() -> None:
+        nonlocal lag
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - before - 0.005)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def login() -> None:
+            async with slots:
+                try:
+                    response = await client.post(
+                        "/auth/login",
+                        json={"username": "bench", "password": "secret"},
+                    )
+                except Exception as exc:
+                    # e.g. database pool timeouts while the loop is blocked
+                    statuses[type(exc).__name__] += 1
+                else:
+                    statuses[response.status_code] += 1
+
+        beat = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        beat.cancel()
+
+    return {
+        "logins/s": statuses[200] / elapsed,
+        "max loop lag ms": lag * 1000,
+        "statuses": dict(statuses),
+    }
+
+
+async def main(logins: int, concurrency: int) -> None:
+    async with sessionmanager.connect() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with sessionmanager.session() as session:
+        session.add(User(username="bench", hashed_password=get_password_hash("secret")))
+        await session.commit()
+
+    # Only the hashing is measured here, not the per-username limit
+    auth.login_limiter = auth.LoginAttemptLimiter(logins + 1, 60, 10)
+    hashers = {
+        "inline": InlineHasher(1, logins),
+        "thread pool": auth.PasswordHasher(
+            settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+        ),
+    }
+    print(f"{logins} logins, {concurrency} concurrent")
+    for name, hasher in hashers.items():
+        auth.password_hasher = hasher
+        result = await _burst(logins, concurrency)
+        print(
+            f"{name:<12} {result['logins/s']:>8.1f} logins/s"
+            f"  max loop lag {result['max loop lag ms']:>7.1f} ms"
+            f"  statuses {result['statuses']}"
+        )
+        hasher.shutdown()
+
+    await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency))
@@ -0,0 +1,138 @@
+"""
+Count sessions opened and pool checkouts per rejected request.
+
+Runs the app in process against a throwaway SQLite database and sends
+requests that fail authentication (no credentials, malformed or expired
+JWTs, oversized API tokens), concurrently, next to an accepted request and
+a valid JWT of an unknown user for reference.
+
+Usage: python -m benchmarks.rejected_requests [--requests 500] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+os.environ.setdefault("VERSION", "benchmark")
+os.environ["DB_ENGINE"] = "sqlite"
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(), "rejected.sqlite3")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import get_db, get_read_db, sessionmanager  # noqa: E402
+from app.models.user import User  # noqa: E402
+from main import app  # noqa: E402
+
+sessions: List[AsyncSession] = []
+
+
+async def _counting_db() -> AsyncGenerator[AsyncSession, None]:
+    async with sessionmanager.session() as session:
+        sessions.append(session)
+        yield session
+
+
+async def _counting_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with sessionmanager.read_session() as session:
+        sessions.append(session)
+        yield session
+
+
+def _checkouts() -> int:
+    metrics: Dict[str, Any] = sessionmanager.pool_metrics()
+    return int(metrics.get("checkouts", 0)) + int(
+        metrics.get("reader", {}).get("checkouts", 0)
+    )
+
+
+async def _setup() -> int:
+    async with sessionmanager.connect() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with sessionmanager.session() as session:
+        user = User(username="bench", hashed_password=get_password_hash("secret"))
+        session.add(user)
+        await session.commit()
+        return int(user.id)
+
+
+async def _measure(
+    client: AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    requests: int,
+    concurrency: int,
+) -> Tuple[int, float, float, float]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send() -> int:
+        async with slots:
+            return (await client.get(url, headers=headers)).status_code
+
+    sessions.clear()
+    checkouts = _checkouts()
+    start = time.perf_counter()
+    codes = await asyncio.gather(*(send() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return (
+        codes[0],
+        len(sessions) / requests,
+        (_checkouts() - checkouts) / requests,
+        elapsed / requests * 1000,
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    user_id = await _setup()
+    expired = create_access_token("bench", str(user_id), timedelta(minutes=-1))
+    cases = [
+        ("no credentials", "/auth/me", {}),
+        ("not a Bearer token", "/auth/me", {"Authorization": "Basic Ym9iOng="}),
+        ("malformed JWT", "/auth/me", {"Authorization": "Bearer abc.def"}),
+        ("expired JWT", "/auth/me", {"Authorization": f"Bearer {expired}"}),
+        ("malformed JWT, status", "/report/status/x", {"Authorization": "Bearer x"}),
+        ("oversized API token", "/auth/api-me", {"X-API-Token": "x" * 1000}),
+        (
+            "unknown user (JWT)",
+            "/auth/me",
+            {"Authorization": f"Bearer {create_access_token('bench', '0')}"},
+        ),
+        (
+            "accepted (cached user)",
+            "/auth/me",
+            {"Authorization": f"Bearer {create_access_token('bench', str(user_id))}"},
+        ),
+    ]
+
+    app.dependency_overrides[get_db] = _counting_db
+    app.dependency_overrides[get_read_db] = _counting_read_db
+    print(
+        f"{'request':<26} {'status':>6} {'sessions/req':>13}"
+        f" {'checkouts/req':>14} {'ms/req':>8}"
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url, headers in cases:
+            code, per_session, per_checkout, ms = await _measure(
+                client, url, headers, requests, concurrency
+            )
+            print(
+                f"{name:<26} {code:>6} {per_session:>13.2f}"
+                f" {per_checkout:>14.2f} {ms:>8.3f}"
+            )
+
+    await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
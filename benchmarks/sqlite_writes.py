@@ -0,0 +1,175 @@
+"""
+Benchmark concurrent writes to SQLite: uploads, job creation, status updates.
+
+Compares a plain `sqlite+aiosqlite` engine (rollback journal, pooled
+connections all writing) with the tuned profile of `DatabaseSessionManager`
+(WAL, pragmas, a single writer connection). Each profile gets a fresh
+database file; failed operations (e.g. "database is locked") are counted.
+
+Usage: python -m benchmarks.sqlite_writes [--operations 300] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+import uuid
+from collections import Counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Union
+
+os.environ.setdefault("VERSION", "benchmark")
+
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import DatabaseSessionManager, engine_options  # noqa: E402
+from app.db.unit_of_work import unit_of_work  # noqa: E402
+from app.models.audio import AudioFile, AudioProcessingJob, JobStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.audio import (  # noqa: E402
+    AudioFileRepository,
+    AudioProcessingJobRepository,
+)
+
+SessionFactory = Callable[[], "contextlib.AbstractAsyncContextManager[AsyncSession]"]
+
+
+class PlainSQLite:
+    """The engine as configured before: no pragmas, every connection writes."""
+
+    def __init__(self, url: str):
+        self._engine = create_async_engine(url)
+        self._sessionmaker = async_sessionmaker(bind=self._engine)
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with self._sessionmaker() as session:
+            yield session
+
+    async def close(self) -> None:
+        await self._engine.dispose()
+
+
+async def _setup(session_factory: SessionFactory, jobs: int) -> List[str]:
+    async with session_factory() as session:
+        await session.run_sync(lambda s: Base.metadata.create_all(s.connection()))
+        user = User(username="bench", hashed_password="x")
+        session.add(user)
+        await session.flush()
+        audio = AudioFile(
+            id=str(uuid.uuid4()), filename="a.mp3", file_path="a.mp3", user_id=user.id
+        )
+        job_ids = [str(uuid.uuid4()) for _ in range(jobs)]
+        session.add(audio)
+        session.add_all(
+            AudioProcessingJob(id=job_id, audio_id=audio.id, status=JobStatus.CREATED)
+            for job_id in job_ids
+        )
+        await session.commit()
+        return job_ids
+
+
+async def _measure(
+    operations: int,
+    concurrency: int,
+    operation: Callable[[int], Awaitable[None]],
+) -> Dict[str, Any]:
+    slots = asyncio.Semaphore(concurrency)
+    outcomes: Counter = Counter()
+
+    async def run(i: int) -> None:
+        async with slots:
+            try:
+                await operation(i)
+            except Exception as exc:
+                outcomes[type(getattr(exc, "orig", exc)).__name__] += 1
+            else:
+                outcomes["ok"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(i) for i in range(operations)))
+    elapsed = time.perf_counter() - start
+    return {"ops/s": outcomes["ok"] / elapsed, "outcomes": dict(outcomes)}
+
+
+async def _profile(
+    session_factory: SessionFactory, operations: int, concurrency: int
+) -> Dict[str, Dict[str, Any]]:
+    job_ids = await _setup(session_factory, operations)
+    async with session_factory() as session:
+        job = await session.get(AudioProcessingJob, job_ids[0])
+        assert job is not None
+        audio_id = job.audio_id
+
+    async def upload(i: int) -> None:
+        async with session_factory() as session, unit_of_work(session):
+            await AudioFileRepository(session).create(
+                AudioFile(
+                    id=str(uuid.uuid4()),
+                    filename=f"{i}.mp3",
+                    file_path=f"{i}.mp3",
+                    user_id=1,
+                )
+            )
+
+    async def create_job(i: int) -> None:
+        async with session_factory() as session, unit_of_work(session):
+            repo = AudioProcessingJobRepository(session)
+            # Reads, then writes: the shape of `create_bg_task`
+            await repo.get_inflight([f"bench:{i}"])
+            await repo.create_or_get_existing(
+                AudioProcessingJob(
+                    id=str(uuid.uuid4()),
+                    audio_id=audio_id,
+                    status=JobStatus.CREATED,
+                    inflight_key=f"bench:{i}",
+                )
+            )
+
+    async def update_status(i: int) -> None:
+        async with session_factory() as session, unit_of_work(session):
+            await AudioProcessingJobRepository(session).update_status(
+                job_ids[i], JobStatus.TRANSCRIBED
+            )
+
+    return {
+        "upload": await _measure(operations, concurrency, upload),
+        "create job": await _measure(operations, concurrency, create_job),
+        "update_status": await _measure(operations, concurrency, update_status),
+    }
+
+
+async def main(operations: int, concurrency: int) -> None:
+    directory = tempfile.mkdtemp()
+    plain_url = f"sqlite+aiosqlite:///{os.path.join(directory, 'plain.sqlite3')}"
+    tuned_url = f"sqlite+aiosqlite:///{os.path.join(directory, 'tuned.sqlite3')}"
+    profiles: Dict[str, Union[PlainSQLite, DatabaseSessionManager]] = {
+        "plain": PlainSQLite(plain_url),
+        "tuned": DatabaseSessionManager(
+            tuned_url, engine_options(tuned_url), single_writer=True
+        ),
+    }
+
+    print(f"{operations} operations of each kind, {concurrency} concurrent")
+    for name, manager in profiles.items():
+        results = await _profile(manager.session, operations, concurrency)
+        for operation, result in results.items():
+            print(
+                f"{name:<6} {operation:<14} {result['ops/s']:>8.1f} ops/s"
+                f"  outcomes {result['outcomes']}"
+            )
+        await manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--operations", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.operations, args.concurrency))
@@ -0,0 +1,103 @@
+"""
+Benchmark transcript rendering of `PDFReportGenerator` on long meetings.
+
+Compares the current renderer with the previous approach (one `Paragraph`
+and one `Spacer` per transcript line, all built up front). Every case runs
+in a fresh interpreter so peak memory is measured in isolation.
+
+Usage: python -m benchmarks.transcript_layout [--lines 1000 10000 100000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+NOTES = {
+    "title": "Benchmark meeting",
+    "summary": "Synthetic meeting used to benchmark transcript rendering.",
+    "topics_discussed": ["Roadmap", "Hiring"],
+    "decisions_made": ["Ship on Friday"],
+    "action_items": ["Send the minutes"],
+}
+
+WORDS = "so the plan for next quarter is to ship the new onboarding flow first".split()
+
+
+def make_transcript(lines: int) -> str:
+    """Return `lines` utterances of varying length from three speakers."""
+
+    return "\n".join(
+        f"Speaker {'ABC'[i % 3]}: " + " ".join(WORDS[: 4 + (i * 7) % len(WORDS)] * 2)
+        for i in range(lines)
+    )
+
+
+def render_legacy(transcript: str, output_path: str) -> None:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    story = [Paragraph("Transcript", styles["Heading2"]), Spacer(1, 0.2 * inch)]
+    for line in transcript.splitlines():
+        story.append(Paragraph(line, styles["Normal"]))
+        story.append(Spacer(1, 0.15 * inch))
+    SimpleDocTemplate(output_path, pagesize=A4).build(story)
+
+
+def render_current(transcript: str, output_path: str) -> None:
+    from app.services.pdf_generator import PDFReportGenerator
+
+    PDFReportGenerator().export(
+        transcript=transcript, notes=NOTES, output_path=output_path
+    )
+
+
+def run_case(approach: str, lines: int) -> Dict:
+    transcript = make_transcript(lines)
+    render = render_legacy if approach == "legacy" else render_current
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "report.pdf")
+        start = time.perf_counter()
+        render(transcript, output_path)
+        seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"seconds": seconds, "peak_mb": peak_kb / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--approach", choices=["legacy", "current"])
+    args = parser.parse_args()
+
+    if args.approach:
+        print(json.dumps(run_case(args.approach, args.lines[0])))
+        return
+
+    print(f"{'lines':>8} {'approach':>8} {'seconds':>9} {'peak MB':>9}")
+    for lines in args.lines:
+        for approach in ("legacy", "current"):
+            result = subprocess.run(
+                [sys.executable, "-m", "benchmarks.transcript_layout"]
+                + ["--approach", approach, "--lines", str(lines)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            case = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{lines:>8} {approach:>8} {case['seconds']:>9.2f}"
+                f" {case['peak_mb']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,15 @@ from app.api.report import router as report_router
 from app.core.config import settings
 from typing import AsyncGenerator
 from app.db.session import sessionmanager
+from app.services.archiver import archiver
+from app.services.audio import resume_interrupted_jobs
+from app.services.auth import password_hasher
+from app.services.events import broker
+from app.services.job_leases import lease_keeper
+from app.services.render_pool import render_pool
+from app.services.report_templates import warm_templates
+from app.services.scheduler import scheduler
+from app.services.webhooks import dispatcher
 from contextlib import asynccontextmanager
 import bcrypt
 
@@ -27,7 +36,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Function that handles startup and shutdown events.
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
+    await broker.start()
+    # Route reads to replicas once their health and lag are known
+    await sessionmanager.start(settings.DB_REPLICA_CHECK_INTERVAL_SECONDS)
+    # Compile report styles and fonts now rather than in the first render
+    warm_templates()
+    await dispatcher.start()
+    # Keep the leases of the jobs this worker queues alive and pick up, from
+    # their last stage, jobs whose worker died: now and then periodically
+    await lease_keeper.start(
+        resume_interrupted_jobs if settings.RESUME_INTERRUPTED_JOBS else None
+    )
+    await archiver.start()
     yield
+    await archiver.close()
+    await scheduler.shutdown()
+    await lease_keeper.close()
+    await dispatcher.close()
+    render_pool.shutdown()
+    password_hasher.shutdown()
+    await broker.close()
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
@@ -40,6 +68,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
+    lifespan=lifespan,
 )
 
 # Set up CORS
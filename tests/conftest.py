@@ -7,14 +7,20 @@ from app.core.config import settings
 from app.db.base import Base
 
 # Import all models here for autogenerate support
-from app.db.session import AsyncSession, DatabaseSessionManager, get_db
+from app.db.session import (
+    AsyncSession,
+    DatabaseSessionManager,
+    engine_options,
+    get_db,
+    get_read_db,
+)
 
 # DONT REMOVE
 from app.models.user import APIToken, User
 from main import app
 
 TEST_DATABASE_URL = settings.TEST_DATABASE_URL
-test_db = DatabaseSessionManager(TEST_DATABASE_URL)
+test_db = DatabaseSessionManager(TEST_DATABASE_URL, engine_options(TEST_DATABASE_URL))
 
 
 @pytest_asyncio.fixture(scope="session", autouse=True)
@@ -33,6 +39,7 @@ async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
 
 # Inject override into app
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 
 @pytest_asyncio.fixture
@@ -1,6 +1,8 @@
+from typing import Any, List
+
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token, get_password_hash
@@ -8,6 +10,8 @@ from app.models.user import User
 from app.models.audio import AudioFile
 from unittest.mock import AsyncMock, patch
 
+from tests.conftest import test_db
+
 
 @pytest.mark.asyncio
 @patch("app.utils.storage.save_uploaded_file", new_callable=AsyncMock)
@@ -44,3 +48,80 @@ async def test_upload_audio_unauthorized(async_client: AsyncClient) -> None:
     files = {"file": ("test.mp3", b"dummy", "audio/mpeg")}
     response = await async_client.post("/audio/upload", files=files)
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+@patch("app.utils.storage.save_uploaded_file", new_callable=AsyncMock)
+async def test_upload_audio_round_trips(
+    mock_save: AsyncMock, async_client: AsyncClient, session: AsyncSession
+) -> None:
+    mock_save.return_value = ("/tmp/test.mp3", "test.mp3")
+    user = User(username="roundtripuser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user.id))}"}
+    # Warm the principal cache: only the upload itself is counted
+    await async_client.get("/auth/me", headers=headers)
+
+    statements: List[str] = []
+    commits: List[Any] = []
+    engine = test_db._engine.sync_engine
+
+    def _record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    def _commit(conn: Any) -> None:
+        commits.append(conn)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    event.listen(engine, "commit", _commit)
+    files = {"file": ("test.mp3", b"dummy audio content", "audio/mpeg")}
+    response = await async_client.post("/audio/upload", files=files, headers=headers)
+    event.remove(engine, "before_cursor_execute", _record)
+    event.remove(engine, "commit", _commit)
+
+    assert response.status_code == 201
+    # The created row comes back with the INSERT: no refresh SELECT
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO audio_files")
+    assert "RETURNING" in statements[0]
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_audio_is_paginated_per_user(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    owner = User(username="listowner", hashed_password=get_password_hash("secret"))
+    other = User(username="listother", hashed_password=get_password_hash("secret"))
+    session.add_all([owner, other])
+    await session.commit()
+    uploads = [
+        AudioFile(id=f"list-{i}", filename=f"{i}.mp3", file_path="/tmp/a.mp3")
+        for i in range(3)
+    ]
+    for audio in uploads:
+        audio.user_id = owner.id
+    session.add_all(
+        [
+            *uploads,
+            AudioFile(id="list-x", filename="x.mp3", file_path="x", user_id=other.id),
+        ]
+    )
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(owner.id))}"}
+
+    first = (
+        await async_client.get("/audio/", params={"limit": 2}, headers=headers)
+    ).json()
+    second = (
+        await async_client.get(
+            "/audio/",
+            params={"limit": 2, "cursor": first["next_cursor"]},
+            headers=headers,
+        )
+    ).json()
+
+    assert len(first["items"]) == 2 and second["next_cursor"] is None
+    listed = [item["audio_id"] for item in first["items"] + second["items"]]
+    assert sorted(listed) == ["list-0", "list-1", "list-2"]
@@ -1,15 +1,29 @@
-import secrets
-from typing import cast, Optional, Any
+import asyncio
+from datetime import timedelta
+from typing import Any, AsyncGenerator, List, Optional, cast
 
 import pytest
 import pytest_asyncio
-from fastapi import status
+from fastapi import HTTPException, status
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, get_password_hash
+from app.db.pool import MeteredQueuePool
+from app.db.session import get_db, get_read_db
+from app.core.config import settings
+from app.core.security import (
+    api_token_hash_key,
+    api_token_prefix,
+    create_access_token,
+    generate_api_token,
+    get_password_hash,
+    hash_api_token,
+)
 from app.models.user import APIToken, User
+from app.services.auth import LoginAttemptLimiter, PasswordHasher
+from main import app
+from tests.conftest import override_get_db, test_db
 
 
 @pytest_asyncio.fixture
@@ -34,8 +48,12 @@ async def jwt_token(test_user: User) -> str:
 
 @pytest_asyncio.fixture
 async def api_token(test_user: User, session: AsyncSession) -> str:
-    token_str = secrets.token_hex(32)
-    token = APIToken(token=token_str, user_id=test_user.id)
+    token_str = generate_api_token()
+    token = APIToken(
+        prefix=api_token_prefix(token_str),
+        token_hash=hash_api_token(token_str),
+        user_id=test_user.id,
+    )
     session.add(token)
     await session.commit()
     return token_str
@@ -66,6 +84,27 @@ async def test_signup_duplicate_username(
     )
 
 
+@pytest.mark.asyncio
+async def test_signup_hashes_without_holding_a_connection(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    checked_out: List[int] = []
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def hash(password: str) -> str:
+        checked_out.append(cast(MeteredQueuePool, test_db._engine.pool).checkedout())
+        return await PasswordHasher.hash(hasher, password)
+
+    monkeypatch.setattr("app.api.auth.password_hasher.hash", hash)
+    response = await async_client.post(
+        "auth/signup", json={"username": "hashfirst", "password": "pass1234"}
+    )
+    hasher.shutdown()
+
+    assert response.status_code == 201
+    assert checked_out == [0]
+
+
 @pytest.mark.asyncio
 async def test_login_success(async_client: AsyncClient, test_user: User) -> None:
     response = await async_client.post(
@@ -145,6 +184,24 @@ async def test_read_users_api_me(async_client: AsyncClient, api_token: str) -> N
     assert "username" in data
 
 
+@pytest.mark.asyncio
+async def test_legacy_api_tokens_are_accepted(
+    async_client: AsyncClient, test_user: User, session: AsyncSession
+) -> None:
+    token_str = "legacy_Token-issued.before/hex"
+    token = APIToken(
+        prefix=api_token_prefix(token_str),
+        token_hash=hash_api_token(token_str),
+        user_id=test_user.id,
+    )
+    session.add(token)
+    await session.commit()
+
+    response = await async_client.get("auth/api-me", headers={"X-API-Token": token_str})
+    assert response.status_code == 200
+    assert response.json()["username"] == test_user.username
+
+
 @pytest.mark.asyncio
 async def test_me_unauthorized(async_client: AsyncClient) -> None:
     response = await async_client.get("auth/me")
@@ -155,3 +212,182 @@ async def test_me_unauthorized(async_client: AsyncClient) -> None:
 async def test_api_me_unauthorized(async_client: AsyncClient) -> None:
     response = await async_client.get("auth/api-me")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_principals_are_cached_until_changed(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    user = User(username="cacheduser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    token_str = generate_api_token()
+    token = APIToken(
+        prefix=api_token_prefix(token_str),
+        token_hash=hash_api_token(token_str),
+        user_id=user.id,
+    )
+    jwt_headers = {
+        "Authorization": f"Bearer {create_access_token('test', str(user.id))}"
+    }
+    token_headers = {"X-API-Token": token_str}
+    session.add(token)
+    await session.commit()
+
+    queries: List[Any] = []
+
+    def count(*args: Any) -> None:
+        queries.append(args)
+
+    engine = test_db._engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for url, headers in [("auth/me", jwt_headers), ("auth/api-me", token_headers)]:
+            response = await async_client.get(url, headers=headers)
+            assert response.json()["username"] == "cacheduser"
+            queries.clear()
+            response = await async_client.get(url, headers=headers)
+            assert response.json()["username"] == "cacheduser"
+            assert queries == []
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    # Committed changes drop the cached entries
+    await session.refresh(user)
+    user.username = "renameduser"  # type: ignore[assignment]
+    await session.commit()
+    response = await async_client.get("auth/me", headers=jwt_headers)
+    assert response.json()["username"] == "renameduser"
+
+    await session.refresh(token)
+    await session.delete(token)
+    await session.commit()
+    response = await async_client.get("auth/api-me", headers=token_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_sheds_load_beyond_its_queue() -> None:
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    hashed = get_password_hash("secret")
+    pending = [asyncio.create_task(hasher.verify("secret", hashed)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.verify("secret", hashed)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers is not None
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+    assert await asyncio.gather(*pending) == [True, True]
+    assert await hasher.verify("wrong", hashed) is False
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_login_attempts_are_limited_per_username(
+    async_client: AsyncClient, test_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "app.services.auth.login_limiter", LoginAttemptLimiter(2, 60, 100)
+    )
+    wrong = {"username": "testuser", "password": "wrong"}
+    right = {"username": "testuser", "password": "secret123"}
+
+    # A successful login clears the failures before it
+    assert (await async_client.post("auth/login", json=wrong)).status_code == 401
+    assert (await async_client.post("auth/login", json=right)).status_code == 200
+
+    assert (await async_client.post("auth/login", json=wrong)).status_code == 401
+    assert (await async_client.post("auth/login", json=wrong)).status_code == 401
+    response = await async_client.post("auth/login", json=right)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+    other = {"username": "someoneelse", "password": "wrong"}
+    assert (await async_client.post("auth/login", json=other)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_api_tokens_are_stored_hashed_and_revocable(
+    async_client: AsyncClient, jwt_token: str, session: AsyncSession
+) -> None:
+    response = await async_client.post(
+        "auth/api-token", headers={"Authorization": jwt_token}
+    )
+    token_str = response.json()["api_token"]
+    prefix = response.json()["prefix"]
+    assert token_str.startswith(prefix)
+
+    result = await session.execute(select(APIToken).where(APIToken.prefix == prefix))
+    record = result.scalar_one()
+    assert record.token_hash == hash_api_token(token_str)
+    assert token_str not in (record.prefix, record.token_hash)
+
+    headers = {"X-API-Token": token_str}
+    assert (await async_client.get("auth/api-me", headers=headers)).status_code == 200
+    forged = {"X-API-Token": prefix + "0" * (len(token_str) - len(prefix))}
+    assert (await async_client.get("auth/api-me", headers=forged)).status_code == 401
+
+    response = await async_client.delete(
+        f"auth/api-token/{prefix}", headers={"Authorization": jwt_token}
+    )
+    assert response.status_code == 204
+    assert (await async_client.get("auth/api-me", headers=headers)).status_code == 401
+
+    response = await async_client.delete(
+        f"auth/api-token/{prefix}", headers={"Authorization": jwt_token}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rejected_requests_hold_no_connection(async_client: AsyncClient) -> None:
+    sessions: List[Any] = []
+
+    async def counting_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with test_db.session() as session:
+            sessions.append(session)
+            yield session
+
+    expired = create_access_token("test", "1", expires_delta=timedelta(minutes=-1))
+    rejected = [
+        ("/auth/me", {}),
+        ("/auth/me", {"Authorization": "Basic dXNlcjpwYXNz"}),
+        ("/auth/me", {"Authorization": "Bearer not-a-jwt"}),
+        ("/auth/me", {"Authorization": f"Bearer {expired}"}),
+        ("/report/status/some-job", {"Authorization": "Bearer not-a-jwt"}),
+        ("/audio/", {}),
+        ("/auth/api-me", {}),
+        ("/auth/api-me", {"X-API-Token": "x" * 1000}),
+    ]
+    pool = cast(MeteredQueuePool, test_db._engine.pool)
+    checkouts = pool.wait_stats.checkouts
+    overrides = app.dependency_overrides
+    overrides[get_db] = overrides[get_read_db] = counting_get_db
+    try:
+        for url, headers in rejected:
+            response = await async_client.get(url, headers=headers)
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED, url
+    finally:
+        overrides[get_db] = overrides[get_read_db] = override_get_db
+
+    # Credentials are checked before any session is opened
+    assert sessions == []
+    assert pool.wait_stats.checkouts == checkouts
+
+
+def test_api_token_hash_key_is_never_the_jwt_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "API_TOKEN_HASH_KEY", "")
+    derived = api_token_hash_key()
+    assert derived != settings.SECRET_KEY.encode()
+    assert len(derived) == 32
+
+    monkeypatch.setattr(settings, "SECRET_KEY", "another-jwt-key")
+    assert api_token_hash_key() != derived
+
+    monkeypatch.setattr(settings, "API_TOKEN_HASH_KEY", "a-dedicated-key")
+    assert api_token_hash_key() == b"a-dedicated-key"
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import uuid
+from typing import Any, List, Tuple, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.security import create_access_token, get_password_hash
+from app.models.audio import AudioFile, AudioProcessingJob, JobStatus
+from app.models.user import User
+from app.repositories.audio import AudioFileRepository, AudioProcessingJobRepository
+from app.services.audio import AudioProcessingJobService
+from app.services.events import JobEventBroker, PostgresJobEventBroker
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_to_subscribers_and_drops_oldest() -> None:
+    broker = JobEventBroker(queue_size=2)
+    queue = broker.subscribe("job-1")
+    other = broker.subscribe("job-2")
+
+    for i in range(3):
+        await broker.publish("job-1", {"event": "progress", "n": i})
+
+    assert [queue.get_nowait()["n"] for _ in range(2)] == [1, 2]
+    assert other.empty()
+
+    broker.unsubscribe("job-1", queue)
+    await broker.publish("job-1", {"event": "progress", "n": 3})
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_listens_again_after_losing_its_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    listeners: List[Any] = []
+    attempts = 0
+
+    async def _connect(dsn: str) -> Any:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 2:
+            raise OSError("server is restarting")
+        listener = MagicMock(add_listener=AsyncMock(), close=AsyncMock())
+        listeners.append(listener)
+        return listener
+
+    monkeypatch.setattr("asyncpg.connect", _connect)
+    monkeypatch.setattr("asyncpg.create_pool", AsyncMock())
+    broker = PostgresJobEventBroker("postgresql://db/app", reconnect_delay=0.01)
+    await broker.start()
+    (on_terminate,) = listeners[0].add_termination_listener.call_args.args
+
+    on_terminate(listeners[0])
+    for _ in range(100):
+        if len(listeners) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert attempts == 3
+    listeners[1].add_listener.assert_awaited_once_with(
+        PostgresJobEventBroker.CHANNEL, broker._on_notify
+    )
+    await broker.close()
+    listeners[1].close.assert_awaited_once()
+
+
+async def _create_job(session: AsyncSession, username: str) -> Tuple[int, str]:
+    user = User(username=username, hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_id = cast(int, user.id)
+
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user_id
+    )
+    job = AudioProcessingJob(
+        id=str(uuid.uuid4()), audio_id=audio.id, status=JobStatus.CREATED
+    )
+    job_id = cast(str, job.id)
+    session.add_all([audio, job])
+    await session.commit()
+    return user_id, job_id
+
+
+def _override_service(broker: JobEventBroker) -> None:
+    def _service(db: deps.DBSessionDep) -> AudioProcessingJobService:
+        return AudioProcessingJobService(
+            AudioProcessingJobRepository(db),
+            AudioFileRepository(db),
+            MagicMock(queue_info=MagicMock(return_value=(None, None))),
+            broker,
+        )
+
+    app.dependency_overrides[deps.get_audio_processing_job_service] = _service
+
+
+@pytest.mark.asyncio
+async def test_sse_streams_events_until_completion(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    user_id, job_id = await _create_job(session, "sseuser")
+    broker = JobEventBroker()
+    _override_service(broker)
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user_id))}"}
+
+    request = asyncio.create_task(
+        async_client.get(f"/report/events/{job_id}", headers=headers)
+    )
+    while job_id not in broker._subscribers:
+        await asyncio.sleep(0.01)
+
+    await broker.publish(job_id, {"event": "status", "stage": "transcription"})
+    await broker.publish(job_id, {"event": "progress", "progress": {"percent": 50}})
+    await broker.publish(
+        job_id, {"event": "completed", "download_url": f"/report/download/{job_id}"}
+    )
+    response = await request
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [m for m in response.text.split("\n\n") if m]
+    names = [m.split("\n")[0] for m in messages]
+    assert names == [
+        "event: status",
+        "event: status",
+        "event: progress",
+        "event: completed",
+    ]
+    assert json.loads(messages[0].split("data: ")[1])["status"] == "created"
+    assert job_id not in broker._subscribers
+
+    other = {"Authorization": f"Bearer {create_access_token('test', str(user_id + 1))}"}
+    response = await async_client.get(f"/report/events/{job_id}", headers=other)
+    assert response.status_code in (401, 404)
+
+    app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
+
+
+@pytest.mark.asyncio
+async def test_status_long_poll_returns_on_change_or_timeout(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    user_id, job_id = await _create_job(session, "longpolluser")
+    broker = JobEventBroker()
+    _override_service(broker)
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user_id))}"}
+    url = f"/report/status/{job_id}"
+
+    # Nothing happens: the status is returned unchanged once the wait is over
+    response = await async_client.get(url, params={"wait": 0.05}, headers=headers)
+    assert response.json()["status"] == "created"
+    assert job_id not in broker._subscribers
+
+    # The status already differs from `since`: no waiting at all
+    response = await async_client.get(
+        url, params={"wait": 30, "since": "transcribed"}, headers=headers
+    )
+    assert response.json()["status"] == "created"
+
+    request = asyncio.create_task(
+        async_client.get(url, params={"wait": 30}, headers=headers)
+    )
+    while job_id not in broker._subscribers:
+        await asyncio.sleep(0.01)
+
+    # Progress alone does not end the wait, a status transition does
+    await broker.publish(job_id, {"event": "progress", "progress": {"percent": 10}})
+    await asyncio.sleep(0.05)
+    assert not request.done()
+
+    await session.execute(
+        update(AudioProcessingJob)
+        .where(AudioProcessingJob.id == job_id)
+        .values(status=JobStatus.TRANSCRIBED)
+    )
+    await session.commit()
+    await broker.publish(job_id, {"event": "status", "status": JobStatus.TRANSCRIBED})
+
+    response = await request
+    assert response.status_code == 200
+    assert response.json()["status"] == "transcribed"
+
+    response = await async_client.get(url, params={"wait": 3600}, headers=headers)
+    assert response.status_code == 422
+
+    app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
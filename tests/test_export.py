@@ -0,0 +1,99 @@
+import io
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import cast
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.audio import AudioFile, AudioProcessingJob, JobStatus
+from app.models.user import User
+from app.utils.zipstream import stream_zip
+
+
+def test_stream_zip_holds_one_chunk_at_a_time(tmp_path: Path) -> None:
+    files = []
+    for i in range(20):
+        path = tmp_path / f"{i}.pdf"
+        path.write_bytes(bytes([i]) * 300_000)
+        files.append((f"report_{i}.pdf", str(path)))
+    files.append(("missing.pdf", str(tmp_path / "missing.pdf")))
+
+    chunks = list(stream_zip(iter(files), chunk_size=64 * 1024))
+
+    # Chunk sizes stay bounded while the archive holds 6 MB
+    assert max(len(chunk) for chunk in chunks) < 64 * 1024 + 1024
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [name for name, _ in files[:-1]]
+        assert archive.read("report_3.pdf") == bytes([3]) * 300_000
+
+
+async def _user(session: AsyncSession, username: str) -> int:
+    user = User(username=username, hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return cast(int, user.id)
+
+
+@pytest.mark.asyncio
+async def test_export_streams_the_users_reports(
+    async_client: AsyncClient, session: AsyncSession, tmp_path: Path
+) -> None:
+    user_id = await _user(session, "exportuser")
+    other_id = await _user(session, "exportother")
+    now = datetime.now(timezone.utc)
+
+    jobs = []
+    for i, (owner, age) in enumerate([(user_id, 10), (user_id, 1), (other_id, 1)]):
+        report = tmp_path / f"report_{i}.pdf"
+        report.write_bytes(b"%PDF-" + bytes([i]) * 1000)
+        audio = AudioFile(
+            id=str(uuid.uuid4()), filename="a.mp3", file_path="/a.mp3", user_id=owner
+        )
+        job = AudioProcessingJob(
+            id=str(uuid.uuid4()),
+            audio_id=audio.id,
+            status=JobStatus.SUMMARIZED,
+            report_path=str(report),
+            created_at=now - timedelta(days=age),
+        )
+        jobs.append(job.id)
+        session.add_all([audio, job])
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user_id))}"}
+
+    response = await async_client.post(
+        "/report/export", json={"job_ids": jobs}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == [
+            f"meeting_summary_{jobs[0]}.pdf",
+            f"meeting_summary_{jobs[1]}.pdf",
+        ]
+        assert archive.read(f"meeting_summary_{jobs[1]}.pdf") == (
+            b"%PDF-" + bytes([1]) * 1000
+        )
+
+    response = await async_client.post(
+        "/report/export",
+        json={"created_from": (now - timedelta(days=2)).isoformat()},
+        headers=headers,
+    )
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == [f"meeting_summary_{jobs[1]}.pdf"]
+
+    response = await async_client.post(
+        "/report/export", json={"job_ids": [jobs[2]]}, headers=headers
+    )
+    assert response.status_code == 404
+
+    response = await async_client.post("/report/export", json={}, headers=headers)
+    assert response.status_code == 422
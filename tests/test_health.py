@@ -1,5 +1,11 @@
+from pathlib import Path
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import exc
+
+from app.core.config import settings
+from app.db.session import DatabaseSessionManager, engine_options
 
 
 @pytest.mark.asyncio
@@ -7,3 +13,51 @@ async def test_read_main(async_client: AsyncClient) -> None:
     response = await async_client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pool.sqlite3'}"
+    options = {**engine_options(url), "pool_size": 1, "max_overflow": 0}
+    manager = DatabaseSessionManager(url, {**options, "pool_timeout": 0.05})
+
+    async with manager.connect():
+        metrics = manager.pool_metrics()
+        assert metrics["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            async with manager.connect():
+                pass
+
+    metrics = manager.pool_metrics()
+    assert metrics["checked_out"] == 0
+    assert metrics["checkouts"] == 1
+    assert metrics["timeouts"] == 1
+    assert metrics["wait_seconds_total"] >= 0.05
+    await manager.close()
+
+    # Only served where enabled
+    response = await async_client.get("/health/db")
+    assert response.status_code == 404
+    monkeypatch.setattr(settings, "DB_POOL_METRICS_ENDPOINT", True)
+    response = await async_client.get("/health/db")
+    assert response.status_code == 200
+    assert response.json()["pool"] == "MeteredQueuePool"
+
+
+def test_pgbouncer_mode_disables_prepared_statement_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = "postgresql+asyncpg://user:pass@db:6432/app"
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    connect_args = engine_options(url)["connect_args"]
+    assert connect_args["server_settings"] == {"statement_timeout": "5000"}
+
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    connect_args = engine_options(url)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["command_timeout"] == 5
+    assert "server_settings" not in connect_args
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.render_pool import RenderPool
+from app.services.report_templates import get_template
+
+NOTES = {
+    "title": "Meeting Report",
+    "summary": "Summary",
+    "topics_discussed": ["Budget"],
+    "decisions_made": [],
+    "action_items": ["Send minutes"],
+}
+
+
+@pytest.mark.asyncio
+async def test_render_in_worker_process_keeps_event_loop_responsive(
+    tmp_path: Path,
+) -> None:
+    pool = RenderPool(processes=1, max_concurrency=1)
+    transcript = "\n".join(f"Speaker {i % 2}: " + "words " * 30 for i in range(3000))
+    output = tmp_path / "report.pdf"
+
+    # Start the worker first so process start-up is not measured
+    await pool.prepare("warmup", "Speaker A: hello")
+    pool.discard("warmup")
+
+    lag = 0.0
+
+    async def heartbeat() -> None:
+        nonlocal lag
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - before - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        await pool.prepare("job-1", transcript)
+        await pool.render(
+            "job-1", transcript=transcript, notes=NOTES, output_path=str(output)
+        )
+    finally:
+        beat.cancel()
+        pool.shutdown()
+
+    assert output.read_bytes().startswith(b"%PDF")
+    assert lag < 0.05
+
+
+def test_templates_are_compiled_once_per_process(tmp_path: Path) -> None:
+    template = get_template("compact")
+    assert get_template("compact") is template
+    assert template.measure_word("budget") < get_template("default").measure_word(
+        "budget"
+    )
+    with pytest.raises(ValueError):
+        get_template("missing")
+
+    output = tmp_path / "report.pdf"
+    PDFReportGenerator(template).export(
+        transcript="Speaker A: hello", notes=NOTES, output_path=str(output)
+    )
+    assert output.read_bytes().startswith(b"%PDF")
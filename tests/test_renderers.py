@@ -0,0 +1,243 @@
+import hashlib
+import json
+import uuid
+import zipfile
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.security import create_access_token, get_password_hash
+from app.models.audio import AudioFile, AudioProcessingJob, JobStatus
+from app.models.user import User
+from app.repositories.audio import AudioFileRepository, AudioProcessingJobRepository
+from app.services.audio import AudioProcessingJobService
+from app.services.render_pool import RenderPool
+from app.services.renderers.base import DEFAULT_TITLE, ReportFormat
+from app.services.renderers.registry import get_renderer
+from app.services.report_cache import ReportCache
+from main import app
+
+NOTES = {
+    "title": "Meeting Report",
+    "summary": "Budget <review>",
+    "topics_discussed": ["Budget"],
+    "decisions_made": [],
+    "action_items": ["Send minutes"],
+}
+TRANSCRIPT = "Speaker A: hello & welcome\nSpeaker B: thanks"
+
+
+@pytest.mark.parametrize("report_format", list(ReportFormat))
+def test_every_format_renders_notes_and_transcript(
+    report_format: ReportFormat, tmp_path: Path
+) -> None:
+    output = tmp_path / f"report.{report_format.value}"
+    get_renderer(report_format).render(
+        transcript=TRANSCRIPT, notes=NOTES, output_path=str(output)
+    )
+    data = output.read_bytes()
+
+    if report_format == ReportFormat.PDF:
+        assert data.startswith(b"%PDF")
+    elif report_format == ReportFormat.DOCX:
+        with zipfile.ZipFile(output) as docx:
+            document = docx.read("word/document.xml").decode()
+        assert "Budget &lt;review&gt;" in document
+        assert "hello &amp; welcome" in document
+    elif report_format == ReportFormat.JSON:
+        assert json.loads(data) == {**NOTES, "transcript": TRANSCRIPT}
+    elif report_format == ReportFormat.HTML:
+        assert "<p>Budget &lt;review&gt;</p>" in data.decode()
+    else:
+        assert "## Action Items\n\n- Send minutes" in data.decode()
+
+
+@pytest.mark.parametrize("report_format", list(ReportFormat))
+def test_every_format_renders_a_null_section_as_empty(
+    report_format: ReportFormat, tmp_path: Path
+) -> None:
+    output = tmp_path / f"report.{report_format.value}"
+    notes = {**NOTES, "decisions_made": None}
+    get_renderer(report_format).render(
+        transcript=TRANSCRIPT, notes=notes, output_path=str(output)
+    )
+    data = output.read_bytes()
+
+    if report_format == ReportFormat.PDF:
+        assert data.startswith(b"%PDF")
+    elif report_format == ReportFormat.DOCX:
+        with zipfile.ZipFile(output) as docx:
+            document = docx.read("word/document.xml").decode()
+        assert "• None." in document
+    elif report_format == ReportFormat.JSON:
+        assert json.loads(data)["decisions_made"] == []
+    elif report_format == ReportFormat.HTML:
+        assert "<h2>Decisions Made</h2>\n<p>None.</p>" in data.decode()
+    else:
+        assert "## Decisions Made\n\nNone.\n" in data.decode()
+
+
+@pytest.mark.parametrize("report_format", list(ReportFormat))
+def test_every_format_renders_notes_with_every_optional_field_null(
+    report_format: ReportFormat, tmp_path: Path
+) -> None:
+    output = tmp_path / f"report.{report_format.value}"
+    notes = dict.fromkeys(NOTES)
+    get_renderer(report_format).render(
+        transcript=None, notes=notes, output_path=str(output)
+    )
+    data = output.read_bytes()
+
+    if report_format == ReportFormat.PDF:
+        assert data.startswith(b"%PDF")
+    elif report_format == ReportFormat.DOCX:
+        with zipfile.ZipFile(output) as docx:
+            document = docx.read("word/document.xml").decode()
+        assert f">{DEFAULT_TITLE}<" in document
+        assert document.count("• None.") == 3
+    elif report_format == ReportFormat.JSON:
+        assert json.loads(data) == {
+            "title": DEFAULT_TITLE,
+            "summary": "",
+            "topics_discussed": [],
+            "decisions_made": [],
+            "action_items": [],
+            "transcript": "",
+        }
+    elif report_format == ReportFormat.HTML:
+        assert f"<h1>{DEFAULT_TITLE}</h1>" in data.decode()
+        assert data.decode().count("<p>None.</p>") == 3
+    else:
+        assert data.decode().startswith(f"# {DEFAULT_TITLE}\n\n## Summary\n\n\n")
+        assert data.decode().count("None.") == 3
+
+
+@pytest.mark.asyncio
+async def test_download_renders_other_formats_once(
+    async_client: AsyncClient, session: AsyncSession, tmp_path: Path
+) -> None:
+    user = User(username="formatuser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_id = user.id
+
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user_id
+    )
+    jobs = [
+        AudioProcessingJob(
+            id=str(uuid.uuid4()),
+            audio_id=audio.id,
+            status=JobStatus.SUMMARIZED,
+            transcript=TRANSCRIPT,
+            notes=NOTES,
+            report_path=str(tmp_path / "missing.pdf"),
+        )
+        for _ in range(2)
+    ]
+    job_ids = [job.id for job in jobs]
+    session.add_all([audio, *jobs])
+    await session.commit()
+
+    cache = ReportCache(str(tmp_path / "cache"), RenderPool(0, 2))
+    renders = []
+    render_as = cache.renderer.render_as
+
+    async def counting_render_as(*args, **kwargs) -> None:  # type: ignore
+        renders.append(args[1])
+        await render_as(*args, **kwargs)
+
+    cache.renderer.render_as = counting_render_as  # type: ignore
+
+    def _service(db: deps.DBSessionDep) -> AudioProcessingJobService:
+        return AudioProcessingJobService(
+            AudioProcessingJobRepository(db), AudioFileRepository(db), reports=cache
+        )
+
+    app.dependency_overrides[deps.get_audio_processing_job_service] = _service
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user_id))}"}
+
+    # Identical content shares one rendered file, across requests and jobs
+    for job_id in job_ids * 2:
+        response = await async_client.get(
+            f"/report/download/{job_id}", params={"format": "md"}, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/markdown")
+        assert f"meeting_summary_{job_id}.md" in response.headers["content-disposition"]
+        assert response.text.startswith("# Meeting Report")
+    assert renders == [ReportFormat.MARKDOWN]
+
+    # The pipeline PDF is gone: it is rendered again from the stored content
+    response = await async_client.get(f"/report/download/{job_ids[0]}", headers=headers)
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+    assert renders == [ReportFormat.MARKDOWN, ReportFormat.PDF]
+
+    response = await async_client.get(
+        f"/report/download/{job_ids[0]}", params={"format": "rtf"}, headers=headers
+    )
+    assert response.status_code == 422
+
+    app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
+
+
+@pytest.mark.asyncio
+async def test_download_supports_etag_and_range(
+    async_client: AsyncClient, session: AsyncSession, tmp_path: Path
+) -> None:
+    user = User(username="rangeuser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_id = user.id
+
+    report = tmp_path / "report.pdf"
+    get_renderer(ReportFormat.PDF).render(
+        transcript=TRANSCRIPT, notes=NOTES, output_path=str(report)
+    )
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user_id
+    )
+    job = AudioProcessingJob(
+        id=str(uuid.uuid4()),
+        audio_id=audio.id,
+        status=JobStatus.SUMMARIZED,
+        report_path=str(report),
+    )
+    url = f"/report/download/{job.id}"
+    session.add_all([audio, job])
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user_id))}"}
+
+    response = await async_client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag == f'"{hashlib.sha256(report.read_bytes()).hexdigest()}"'
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+    response = await async_client.get(
+        url, headers={**headers, "If-None-Match": f'"other", W/{etag}'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = await async_client.get(
+        url, headers={**headers, "Range": "bytes=0-3", "If-Range": etag}
+    )
+    assert response.status_code == 206
+    assert response.content == b"%PDF"
+    assert response.headers["content-range"].startswith("bytes 0-3/")
+
+    # A stale If-Range gets the whole, current file
+    response = await async_client.get(
+        url, headers={**headers, "Range": "bytes=0-3", "If-Range": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert response.content == report.read_bytes()
@@ -0,0 +1,115 @@
+import uuid
+from pathlib import Path
+from typing import cast
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.db.replicas import RecentWrites
+from app.db.session import DatabaseSessionManager, recent_writes
+from app.services.events import JobEventBroker
+from app.models.audio import AudioFile, AudioProcessingJob, JobStatus
+from app.models.user import User
+from app.repositories.audio import AudioProcessingJobRepository
+from app.services.audio import AudioProcessingJobService
+
+
+async def _database_name(manager: DatabaseSessionManager) -> str:
+    async with manager.read_session() as session:
+        return str((await session.execute(text("SELECT name FROM whoami"))).scalar())
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_healthy_replicas_within_lag(tmp_path: Path) -> None:
+    urls = {}
+    for name in ("primary", "replica"):
+        urls[name] = f"sqlite+aiosqlite:///{tmp_path / name}.sqlite3"
+        setup = DatabaseSessionManager(urls[name])
+        async with setup.connect() as connection:
+            await connection.execute(text("CREATE TABLE whoami (name TEXT)"))
+            await connection.execute(text(f"INSERT INTO whoami VALUES ('{name}')"))
+        await setup.close()
+
+    manager = DatabaseSessionManager(
+        urls["primary"], replicas=[urls["replica"]], max_replica_lag=5
+    )
+    # Not checked yet: the replica is not trusted
+    assert await _database_name(manager) == "primary"
+
+    await manager.start(check_interval=60)
+    assert await _database_name(manager) == "replica"
+    assert manager.pool_metrics()["replicas"][0]["healthy"]
+
+    replica = manager._replicas.replicas[0]
+    replica.lag = 30
+    assert await _database_name(manager) == "primary"
+
+    replica.lag = 0
+    await replica.engine.dispose()
+    replica.engine = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/db")
+    await manager._replicas.check(timeout=1)
+    assert not replica.healthy
+    assert await _database_name(manager) == "primary"
+
+    await manager.close()
+
+
+def test_jobs_just_written_are_read_from_the_primary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    primary, replica = MagicMock(), MagicMock()
+    service = AudioProcessingJobService(primary, MagicMock(), reader=replica)
+
+    assert service._reader_for("job-1") is replica
+    recent_writes.mark("job-1")
+    assert service._reader_for("job-1") is primary
+    assert service._reader_for("job-2", "job-1") is primary
+    assert service._reader_for("job-2") is replica
+
+    expired = RecentWrites(window=-1)
+    expired.mark("job-1")
+    assert not expired.contains("job-1")
+
+
+@pytest.mark.asyncio
+async def test_jobs_missing_on_a_replica_are_read_from_the_primary(
+    session: AsyncSession, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = User(username="replicamiss", hashed_password=get_password_hash("s"))
+    session.add(user)
+    await session.commit()
+    user_id = cast(int, user.id)
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/a.mp3", user_id=user_id
+    )
+    job_id = str(uuid.uuid4())
+    session.add_all([audio, AudioProcessingJob(id=job_id, audio_id=audio.id)])
+    await session.commit()
+    # The job was created through another worker: this one has no record of it
+    monkeypatch.setattr("app.services.audio.recent_writes", RecentWrites(window=60))
+
+    # A replica that has not received the job yet
+    replica = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path}/replica.sqlite3")
+    async with replica.connect() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with replica.session() as replica_session:
+        service = AudioProcessingJobService(
+            AudioProcessingJobRepository(session),
+            MagicMock(),
+            job_scheduler=MagicMock(queue_info=MagicMock(return_value=(None, None))),
+            events=JobEventBroker(),
+            reader=AudioProcessingJobRepository(replica_session),
+        )
+
+        assert (await service.get_job_status(job_id))["status"] == JobStatus.CREATED
+        polled = await service.get_job_status(job_id, wait=0.01)
+        assert polled["status"] == JobStatus.CREATED
+        statuses = await service.get_job_statuses([job_id], user_id)
+        assert [job["job_id"] for job in statuses["jobs"]] == [job_id]
+        events = await service.stream_job_events(job_id, user_id)
+        assert (await anext(events))["status"] == JobStatus.CREATED
+    await replica.close()
@@ -1,16 +1,43 @@
-from typing import Dict
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, cast
+import uuid
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from unittest.mock import AsyncMock
+from unittest.mock import ANY, AsyncMock, MagicMock
 from types import SimpleNamespace
 
+from app.core.config import settings
 from app.core.security import get_password_hash, create_access_token
+from app.db.unit_of_work import unit_of_work
+from app.models.audio import (
+    ArchivedProcessingJob,
+    AudioFile,
+    AudioProcessingJob,
+    JobPriority,
+    JobStatus,
+)
 from app.models.user import User
+from app.models.webhook import WebhookDeadLetter
+from app.repositories.audio import AudioFileRepository, AudioProcessingJobRepository
+from app.services.archiver import JobArchiver
+from app.services.audio import AudioProcessingJobService, resume_interrupted_jobs
+from app.services.job_leases import WORKER_ID, LeaseKeeper
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.render_pool import RenderPool
+from app.services.transcription.base import TranscriptionFailed
+from app.services.webhooks import WebhookDispatcher
 from fastapi import HTTPException, status
+from reportlab.platypus import PageBreak
 from app.api import deps
 from main import app
+from tests.conftest import test_db
 
 
 @pytest.mark.asyncio
@@ -126,7 +153,7 @@ async def test_get_job_status_success(
     )
 
     response = await async_client.get("/report/status/job-123", headers=headers)
-    assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_200_OK, response.text
     assert response.json()["status"] == "summarized"
 
     app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
@@ -157,3 +184,811 @@ async def test_download_report_not_ready(
     assert response.status_code == 404
 
     app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_resumes_from_last_checkpoint(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    user = User(username="resumeuser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user.id
+    )
+    job = AudioProcessingJob(
+        id=str(uuid.uuid4()),
+        audio_id=audio.id,
+        status=JobStatus.FAILED,
+        transcript_id="provider-1",
+        transcript="Speaker A: hello",
+    )
+    job_id = cast(str, job.id)
+    session.add_all([audio, job])
+    await session.commit()
+
+    transcriber = MagicMock(side_effect=AssertionError("transcription must be skipped"))
+    generator = AsyncMock()
+    generator.__aenter__.return_value.generate = AsyncMock(
+        return_value={"title": "Meeting Report"}
+    )
+    monkeypatch.setattr("app.services.audio.AssemblyAITranscriber", transcriber)
+    monkeypatch.setattr(
+        "app.services.audio.MistralNotesGenerator", MagicMock(return_value=generator)
+    )
+    monkeypatch.setattr(settings, "REPORT_UPLOAD_DIR", str(tmp_path))
+
+    service = AudioProcessingJobService(
+        AudioProcessingJobRepository(session),
+        AudioFileRepository(session),
+        renderer=MagicMock(prepare=AsyncMock(), render=AsyncMock()),
+    )
+    await service.run_audio_processing_pipeline(job_id, "/tmp/a.mp3")
+
+    session.expire_all()
+    job = await AudioProcessingJobRepository(session).get(job_id)
+    assert job.status == JobStatus.SUMMARIZED
+    assert job.notes == {"title": "Meeting Report"}
+    assert job.report_path == f"{tmp_path}/report_{job_id}.pdf"
+    transcriber.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_generate_and_status(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    user = User(username="batchuser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_id = user.id
+
+    audio_ids = [str(uuid.uuid4()) for _ in range(3)]
+    session.add_all(
+        AudioFile(id=i, filename=f"{i}.mp3", file_path=f"/tmp/{i}.mp3", user_id=user_id)
+        for i in audio_ids
+    )
+    await session.commit()
+
+    token = create_access_token("test", str(user_id))
+    headers = {"Authorization": f"Bearer {token}"}
+    job_scheduler = MagicMock()
+    job_scheduler.queue_info.return_value = (None, None)
+
+    def _service(db: deps.DBSessionDep) -> AudioProcessingJobService:
+        return AudioProcessingJobService(
+            AudioProcessingJobRepository(db), AudioFileRepository(db), job_scheduler
+        )
+
+    app.dependency_overrides[deps.get_audio_processing_job_service] = _service
+
+    statements: List[str] = []
+
+    def _record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    engine = test_db._engine.sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    response = await async_client.post(
+        "/report/generate/batch", json={"audio_ids": audio_ids}, headers=headers
+    )
+    event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    jobs = response.json()["jobs"]
+    assert [j["audio_id"] for j in jobs] == audio_ids
+    assert job_scheduler.submit.call_count == 3
+    inserts = [s for s in statements if s.startswith("INSERT INTO processing_jobs")]
+    assert len(inserts) == 1
+
+    job_ids = [j["job_id"] for j in jobs]
+    response = await async_client.post(
+        "/report/status/batch",
+        json={"job_ids": job_ids + ["someone-elses-job"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    statuses = response.json()["jobs"]
+    assert sorted(s["job_id"] for s in statuses) == sorted(job_ids)
+    assert {s["status"] for s in statuses} == {"created"}
+
+    response = await async_client.post(
+        "/report/generate/batch",
+        json={"audio_ids": [audio_ids[0], "missing-audio"]},
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+    app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
+
+
+@pytest.mark.asyncio
+async def test_generate_report_is_idempotent_and_coalesced(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    user = User(username="idempotentuser", hashed_password=get_password_hash("x"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_id = user.id
+
+    audio_id = str(uuid.uuid4())
+    session.add(
+        AudioFile(
+            id=audio_id, filename="a.mp3", file_path="/tmp/a.mp3", user_id=user_id
+        )
+    )
+    await session.commit()
+
+    token = create_access_token("test", str(user_id))
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "retry-1"}
+    job_scheduler = MagicMock()
+
+    def _service(db: deps.DBSessionDep) -> AudioProcessingJobService:
+        return AudioProcessingJobService(
+            AudioProcessingJobRepository(db), AudioFileRepository(db), job_scheduler
+        )
+
+    app.dependency_overrides[deps.get_audio_processing_job_service] = _service
+
+    # Concurrent duplicates share one job and one pipeline run
+    responses = await asyncio.gather(
+        *[
+            async_client.post(
+                "/report/generate", json={"audio_id": audio_id}, headers=headers
+            )
+            for _ in range(3)
+        ]
+    )
+    job_ids = {r.json()["job_id"] for r in responses}
+    assert len(job_ids) == 1
+    assert job_scheduler.submit.call_count == 1
+    job_id = job_ids.pop()
+
+    # Once the job finished, the same key still returns it ...
+    await AudioProcessingJobRepository(session).save_checkpoint(
+        job_id, inflight_key=None
+    )
+    await session.commit()
+    response = await async_client.post(
+        "/report/generate", json={"audio_id": audio_id}, headers=headers
+    )
+    assert response.json()["job_id"] == job_id
+
+    # ... but not for a different request
+    response = await async_client.post(
+        "/report/generate",
+        json={"audio_id": audio_id, "priority": "bulk"},
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+    # Keys belong to the requesting user, not to the audio owner
+    stranger = User(username="idempotentstranger", hashed_password="x")
+    session.add(stranger)
+    await session.commit()
+    stranger_headers = {
+        "Authorization": f"Bearer {create_access_token('x', str(stranger.id))}",
+        "Idempotency-Key": "retry-1",
+    }
+    response = await async_client.post(
+        "/report/generate", json={"audio_id": audio_id}, headers=stranger_headers
+    )
+    stranger_job_id = response.json()["job_id"]
+    assert stranger_job_id != job_id
+    await AudioProcessingJobRepository(session).save_checkpoint(
+        stranger_job_id, inflight_key=None
+    )
+    await session.commit()
+
+    # ... while a request without the key starts a new job
+    headers.pop("Idempotency-Key")
+    response = await async_client.post(
+        "/report/generate", json={"audio_id": audio_id}, headers=headers
+    )
+    assert response.json()["job_id"] not in (job_id, stranger_job_id)
+    assert job_scheduler.submit.call_count == 3
+
+    app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
+
+
+@pytest.mark.asyncio
+async def test_only_requests_with_the_same_priority_and_callback_coalesce(
+    async_client: AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = User(username="coalesceuser", hashed_password=get_password_hash("x"))
+    session.add(user)
+    await session.commit()
+    audio_id = str(uuid.uuid4())
+    session.add(
+        AudioFile(
+            id=audio_id, filename="a.mp3", file_path="/tmp/a.mp3", user_id=user.id
+        )
+    )
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('t', str(user.id))}"}
+    job_scheduler = MagicMock()
+    webhooks = WebhookDispatcher(secret="s", allow_private_urls=True)
+
+    def _service(db: deps.DBSessionDep) -> AudioProcessingJobService:
+        return AudioProcessingJobService(
+            AudioProcessingJobRepository(db),
+            AudioFileRepository(db),
+            job_scheduler,
+            webhooks=webhooks,
+        )
+
+    app.dependency_overrides[deps.get_audio_processing_job_service] = _service
+    requests = [
+        {"audio_id": audio_id, "priority": "bulk"},
+        {"audio_id": audio_id, "priority": "bulk"},
+        {"audio_id": audio_id, "priority": "interactive"},
+        {"audio_id": audio_id, "priority": "bulk", "callback_url": "http://a/hook"},
+        {"audio_id": audio_id, "priority": "bulk", "callback_url": "http://b/hook"},
+    ]
+    job_ids = [
+        (
+            await async_client.post("/report/generate", json=body, headers=headers)
+        ).json()["job_id"]
+        for body in requests
+    ]
+    app.dependency_overrides.pop(deps.get_audio_processing_job_service, None)
+
+    # Each caller keeps its priority and gets its webhook
+    assert job_ids[0] == job_ids[1]
+    assert len(set(job_ids)) == 4
+    priorities = [
+        call.kwargs["priority"] for call in job_scheduler.submit.call_args_list
+    ]
+    assert (
+        priorities
+        == [JobPriority.BULK, JobPriority.INTERACTIVE] + [JobPriority.BULK] * 2
+    )
+    repo = AudioProcessingJobRepository(session)
+    callbacks = [(await repo.get(job_id)).callback_url for job_id in job_ids[3:]]
+    assert callbacks == ["http://a/hook", "http://b/hook"]
+
+
+async def _create_job(session: AsyncSession, username: str, **values: Any) -> str:
+    user = User(username=username, hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user.id
+    )
+    job = AudioProcessingJob(id=str(uuid.uuid4()), audio_id=audio.id, **values)
+    job_id = cast(str, job.id)
+    session.add_all([audio, job])
+    await session.commit()
+    return job_id
+
+
+async def _owner_of(session: AsyncSession, job_id: str) -> int:
+    job = await AudioProcessingJobRepository(session).get(job_id)
+    audio = await AudioFileRepository(session).get(cast(str, job.audio_id))
+    return cast(int, audio.user_id)
+
+
+@pytest.mark.asyncio
+async def test_cancel_job_stops_work_and_records_stage(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    job_id = await _create_job(
+        session,
+        "canceluser",
+        status=JobStatus.CREATED,
+        stage="transcription",
+        transcript_id="provider-1",
+    )
+    transcriber = AsyncMock()
+    monkeypatch.setattr(
+        "app.services.audio.AssemblyAITranscriber", MagicMock(return_value=transcriber)
+    )
+    job_scheduler = MagicMock(cancel=AsyncMock(return_value=True))
+    repo = AudioProcessingJobRepository(session)
+    service = AudioProcessingJobService(
+        repo, AudioFileRepository(session), job_scheduler
+    )
+
+    owner_id = await _owner_of(session, job_id)
+    with pytest.raises(HTTPException) as exc_info:
+        await service.cancel_job(job_id, owner_id + 1000)
+    assert exc_info.value.status_code == 404
+    job_scheduler.cancel.assert_not_awaited()
+
+    result = await service.cancel_job(job_id, owner_id)
+
+    assert result["status"] == JobStatus.CANCELLED
+    job_scheduler.cancel.assert_awaited_once_with(job_id)
+    transcriber.__aenter__.return_value.cancel.assert_awaited_once_with("provider-1")
+    session.expire_all()
+    job = await repo.get(job_id)
+    assert job.status == JobStatus.CANCELLED
+    assert job.error_message == "Cancelled during transcription."
+    assert job.transcript_id is None
+    # A pipeline still running elsewhere stops at its next checkpoint
+    assert not await repo.save_checkpoint(job_id, transcript="late")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.cancel_job(job_id, owner_id)
+    assert exc_info.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_cancel_job_loses_to_a_concurrent_completion(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    job_id = await _create_job(
+        session,
+        "cancelraceuser",
+        status=JobStatus.CREATED,
+        stage="transcription",
+        transcript_id="provider-3",
+    )
+    transcriber = AsyncMock()
+    monkeypatch.setattr(
+        "app.services.audio.AssemblyAITranscriber", MagicMock(return_value=transcriber)
+    )
+    job_scheduler = MagicMock(cancel=AsyncMock(return_value=True))
+    repo = AudioProcessingJobRepository(session)
+    service = AudioProcessingJobService(
+        repo, AudioFileRepository(session), job_scheduler
+    )
+    get_with_audio = repo.get_with_audio
+
+    async def _completes_after_read(*args: Any) -> Any:
+        job = await get_with_audio(*args)
+        # The pipeline finishes between the read and the cancel
+        await repo.save_checkpoint(
+            job_id, status=JobStatus.SUMMARIZED, report_path="reports/done.pdf"
+        )
+        await session.commit()
+        return job
+
+    monkeypatch.setattr(repo, "get_with_audio", _completes_after_read)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.cancel_job(job_id, await _owner_of(session, job_id))
+
+    assert exc_info.value.status_code == 409
+    assert "completed" in exc_info.value.detail
+    job_scheduler.cancel.assert_not_awaited()
+    transcriber.__aenter__.return_value.cancel.assert_not_awaited()
+    session.expire_all()
+    job = await repo.get(job_id)
+    assert job.status == JobStatus.SUMMARIZED
+    assert job.report_path == "reports/done.pdf"
+    assert job.transcript_id == "provider-3"
+
+
+@pytest.mark.asyncio
+async def test_stage_deadline_fails_stuck_transcription(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    job_id = await _create_job(
+        session, "deadlineuser", status=JobStatus.CREATED, transcript_id="provider-2"
+    )
+
+    async def _never_completes(transcript_id: str, *args: Any) -> Dict:
+        await asyncio.Event().wait()
+        return {}
+
+    transcriber = AsyncMock()
+    transcriber.__aenter__.return_value.fetch = _never_completes
+    monkeypatch.setattr(
+        "app.services.audio.AssemblyAITranscriber", MagicMock(return_value=transcriber)
+    )
+    monkeypatch.setattr(settings, "TRANSCRIPTION_DEADLINE_SECONDS", 0.05)
+
+    repo = AudioProcessingJobRepository(session)
+    service = AudioProcessingJobService(repo, AudioFileRepository(session))
+    await service.run_audio_processing_pipeline(job_id, "/tmp/a.mp3")
+
+    session.expire_all()
+    job = await repo.get(job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.stage == "transcription"
+    # The cancelled transcript is forgotten, a retry submits the audio again
+    assert job.transcript_id is None
+    transcriber.__aenter__.return_value.cancel.assert_awaited_once_with("provider-2")
+
+
+@pytest.mark.asyncio
+async def test_provider_error_is_resubmitted_on_retry(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    job_id = await _create_job(
+        session, "providererroruser", status=JobStatus.CREATED, transcript_id="gone"
+    )
+    provider = AsyncMock()
+    provider.fetch.side_effect = TranscriptionFailed("AssemblyAI error: bad audio")
+    transcriber = AsyncMock()
+    transcriber.__aenter__.return_value = provider
+    monkeypatch.setattr(
+        "app.services.audio.AssemblyAITranscriber", MagicMock(return_value=transcriber)
+    )
+    repo = AudioProcessingJobRepository(session)
+    service = AudioProcessingJobService(repo, AudioFileRepository(session))
+
+    await service.run_audio_processing_pipeline(job_id, "/tmp/a.mp3")
+    session.expire_all()
+    job = await repo.get(job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.transcript_id is None
+
+    provider.submit.return_value = "fresh"
+    provider.fetch.side_effect = [TranscriptionFailed("AssemblyAI error: again")]
+    await service.run_audio_processing_pipeline(job_id, "/tmp/a.mp3")
+    provider.submit.assert_awaited_once()
+    provider.fetch.assert_awaited_with("fresh", ANY)
+
+
+@pytest.mark.asyncio
+async def test_transcript_layout_overlaps_notes_generation(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    job_id = await _create_job(
+        session,
+        "overlapuser",
+        status=JobStatus.TRANSCRIBED,
+        transcript="Speaker A: hello",
+    )
+    laid_out = threading.Event()
+
+    class FakePDF:
+        def prepare_transcript(self, transcript: str) -> List[str]:
+            laid_out.set()
+            return ["page"]
+
+        def export(self, **kwargs: Any) -> None:
+            assert kwargs["transcript_pages"] == ["page"]
+            Path(kwargs["output_path"]).touch()
+
+    async def generate(transcript: str) -> Dict:
+        # Only returns once the transcript was laid out in the meantime
+        await asyncio.wait_for(asyncio.to_thread(laid_out.wait), 5)
+        return {"title": "Meeting Report"}
+
+    generator = AsyncMock()
+    generator.__aenter__.return_value.generate = generate
+    monkeypatch.setattr(
+        "app.services.audio.MistralNotesGenerator", MagicMock(return_value=generator)
+    )
+    monkeypatch.setattr("app.services.render_pool.PDFReportGenerator", FakePDF)
+    monkeypatch.setattr(settings, "REPORT_UPLOAD_DIR", str(tmp_path))
+
+    repo = AudioProcessingJobRepository(session)
+    service = AudioProcessingJobService(
+        repo,
+        AudioFileRepository(session),
+        renderer=RenderPool(processes=0, max_concurrency=2),
+    )
+    await service.run_audio_processing_pipeline(job_id, "/tmp/a.mp3")
+
+    session.expire_all()
+    job = await repo.get(job_id)
+    assert job.status == JobStatus.SUMMARIZED
+    assert job.report_path == f"{tmp_path}/report_{job_id}.pdf"
+
+
+def test_prepared_transcript_pages_render(tmp_path: Path) -> None:
+    generator = PDFReportGenerator()
+    transcript = "\n".join(f"Speaker {i % 2}: " + "words " * 40 for i in range(300))
+    pages = list(generator.prepare_transcript(transcript))
+    assert any(isinstance(page, PageBreak) for page in pages)
+
+    output = tmp_path / "report.pdf"
+    notes = {
+        "title": "Meeting Report",
+        "summary": "Summary",
+        "topics_discussed": ["Budget"],
+        "decisions_made": [],
+        "action_items": ["Send minutes"],
+    }
+    generator.export(
+        transcript=transcript,
+        notes=notes,
+        output_path=str(output),
+        transcript_pages=pages,
+    )
+    assert output.read_bytes().startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_bulk_changes_once(session: AsyncSession) -> None:
+    job_ids = [
+        await _create_job(session, f"uowuser{i}", status=JobStatus.CREATED)
+        for i in range(3)
+    ]
+    repo = AudioProcessingJobRepository(session)
+
+    with pytest.raises(HTTPException):
+        async with unit_of_work(session):
+            await repo.update_many([{"id": job_ids[0], "status": JobStatus.FAILED}])
+            async with unit_of_work(session):
+                # Joins the outer unit of work: nothing is committed yet
+                await repo.update_status(job_ids[1], JobStatus.FAILED)
+            raise HTTPException(status_code=409)
+    session.expire_all()
+    assert (await repo.get(job_ids[0])).status == JobStatus.CREATED
+    assert (await repo.get(job_ids[1])).status == JobStatus.CREATED
+
+    async with unit_of_work(session):
+        await repo.update_many(
+            [{"id": job_id, "status": JobStatus.TRANSCRIBED} for job_id in job_ids]
+        )
+        assert await repo.delete(job_ids[2])
+        assert not await repo.delete("missing")
+    session.expire_all()
+    assert (await repo.get(job_ids[0])).status == JobStatus.TRANSCRIBED
+    assert (await repo.get(job_ids[1])).status == JobStatus.TRANSCRIBED
+    assert await session.get(AudioProcessingJob, job_ids[2]) is None
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_pages_through_history(
+    async_client: AsyncClient, session: AsyncSession
+) -> None:
+    user = User(username="historyuser", hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user.id
+    )
+    statuses = [JobStatus.FAILED, JobStatus.SUMMARIZED] * 3
+    jobs = [
+        AudioProcessingJob(
+            id=str(uuid.uuid4()), audio_id=audio.id, user_id=user.id, status=s
+        )
+        for s in statuses
+    ]
+    session.add_all([audio, *jobs])
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user.id))}"}
+
+    seen: List[str] = []
+    params: Dict[str, Any] = {"status": "failed", "limit": 2}
+    while True:
+        response = await async_client.get(
+            "/report/jobs", params=params, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        body = response.json()
+        assert all(item["status"] == "failed" for item in body["items"])
+        seen += [item["job_id"] for item in body["items"]]
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+    failed = [cast(str, job.id) for job in jobs if job.status == JobStatus.FAILED]
+    assert sorted(seen) == sorted(failed) and len(seen) == len(failed)
+
+    response = await async_client.get(
+        "/report/jobs", params={"limit": 100}, headers=headers
+    )
+    created = [item["created_at"] for item in response.json()["items"]]
+    assert len(created) == len(jobs) and created == sorted(created, reverse=True)
+
+    response = await async_client.get(
+        "/report/jobs", params={"cursor": "not a cursor"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_history_queries_use_indexes(session: AsyncSession) -> None:
+    jobs = AudioProcessingJobRepository(session)
+    audio = AudioFileRepository(session)
+    queries = [
+        (
+            jobs.owned_page_query(1),
+            [
+                "ix_processing_jobs_user_id_created_at",
+                "ix_processing_jobs_archive_user_id_created_at",
+            ],
+        ),
+        (
+            jobs.owned_page_query(1, status=JobStatus.FAILED, after="job-1"),
+            [
+                "ix_processing_jobs_user_id_status_created_at",
+                "ix_processing_jobs_archive_user_id_status_created_at",
+            ],
+        ),
+        (
+            audio.owned_page_query(
+                1, created_from=datetime(2024, 1, 1), after="audio-1"
+            ),
+            ["ix_audio_files_user_id_created_at"],
+        ),
+    ]
+    for query, indexes in queries:
+        sql = query.compile(
+            dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        result = await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        plan = [row[3] for row in result.all()]
+        # Index range scans, already in page order (merged for the job and
+        # archive tables): no scan, no sort
+        for index in indexes:
+            assert any(f"INDEX {index} " in step for step in plan), plan
+        assert not any(step.startswith("SCAN") for step in plan), plan
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.mark.asyncio
+async def test_archiver_moves_old_finished_jobs(
+    async_client: AsyncClient, session: AsyncSession, tmp_path: Path
+) -> None:
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    aged = {"created_at": old, "updated_at": old}
+    failed = await _create_job(
+        session, "archive1", status=JobStatus.FAILED, error_message="boom", **aged
+    )
+    report = tmp_path / "archived.pdf"
+    report.write_bytes(b"%PDF-1.4 archived")
+    rendered = await _create_job(
+        session,
+        "archive2",
+        status=JobStatus.SUMMARIZED,
+        report_path=str(report),
+        **aged,
+    )
+    owner_id = await _owner_of(session, rendered)
+    cancelled = await _create_job(
+        session, "archive3", status=JobStatus.CANCELLED, **aged
+    )
+    rendering = await _create_job(
+        session, "archive4", status=JobStatus.SUMMARIZED, **aged
+    )
+    recent = await _create_job(session, "archive5", status=JobStatus.FAILED)
+    dead_lettered = await _create_job(
+        session, "archive6", status=JobStatus.FAILED, **aged
+    )
+    session.add(
+        WebhookDeadLetter(
+            id=str(uuid.uuid4()),
+            job_id=dead_lettered,
+            url="https://example.com",
+            payload={},
+            attempts=8,
+            created_at=old,
+        )
+    )
+    await session.commit()
+
+    archiver = JobArchiver(
+        after_days=30, batch_size=2, interval=0, session_factory=test_db.session
+    )
+    assert await archiver.archive() >= 3
+
+    session.expire_all()
+    archived = [failed, rendered, cancelled]
+    for job_id in archived:
+        assert await session.get(AudioProcessingJob, job_id) is None
+        assert await session.get(ArchivedProcessingJob, job_id) is not None
+    for job_id in (rendering, recent, dead_lettered):
+        assert await session.get(AudioProcessingJob, job_id) is not None
+    assert await archiver.archive() == 0
+
+    user = User(username="archiveviewer", hashed_password=get_password_hash("s"))
+    session.add(user)
+    await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(user.id))}"}
+    response = await async_client.get(f"/report/status/{failed}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == "boom"
+
+    # The owner still sees an archived report everywhere it was listed
+    headers = {"Authorization": f"Bearer {create_access_token('test', str(owner_id))}"}
+    response = await async_client.get(f"/report/download/{rendered}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b"%PDF-1.4 archived"
+    response = await async_client.get("/report/jobs", headers=headers)
+    assert [item["job_id"] for item in response.json()["items"]] == [rendered]
+    response = await async_client.post(
+        "/report/export", json={"job_ids": [rendered]}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert f"{rendered}".encode() in response.content
+
+
+@pytest.mark.asyncio
+async def test_retry_job_is_scoped_to_its_owner(session: AsyncSession) -> None:
+    job_id = await _create_job(
+        session, "retryowner", status=JobStatus.FAILED, transcript="hello"
+    )
+    owner_id = await _owner_of(session, job_id)
+    job_scheduler = MagicMock()
+    repo = AudioProcessingJobRepository(session)
+    service = AudioProcessingJobService(
+        repo, AudioFileRepository(session), job_scheduler
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.retry_job(job_id, owner_id + 1000)
+    assert exc_info.value.status_code == 404
+    job_scheduler.submit.assert_not_called()
+
+    result = await service.retry_job(job_id, owner_id)
+    assert result["status"] == JobStatus.TRANSCRIBED
+    job_scheduler.submit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_restart_only_resumes_jobs_without_a_live_lease(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = datetime.now(timezone.utc)
+    running_elsewhere = await _create_job(
+        session,
+        "leaselive",
+        status=JobStatus.CREATED,
+        claimed_by="other-worker",
+        claimed_until=now + timedelta(minutes=1),
+    )
+    abandoned = await _create_job(
+        session,
+        "leaseexpired",
+        status=JobStatus.TRANSCRIBED,
+        claimed_by="dead-worker",
+        claimed_until=now - timedelta(minutes=1),
+    )
+    unleased = await _create_job(session, "leasenone", status=JobStatus.CREATED)
+    scheduled = MagicMock()
+    monkeypatch.setattr(AudioProcessingJobService, "schedule_pipeline", scheduled)
+    monkeypatch.setattr("app.services.audio.sessionmanager", test_db)
+
+    await resume_interrupted_jobs()
+
+    resumed = {call.args[0] for call in scheduled.call_args_list}
+    assert {abandoned, unleased} <= resumed
+    assert running_elsewhere not in resumed
+    session.expire_all()
+    job = await AudioProcessingJobRepository(session).get(abandoned)
+    assert job.claimed_by == WORKER_ID and job.attempts == 1
+
+    # This worker keeps its leases alive; a second restart resumes nothing
+    keeper = LeaseKeeper(lease_seconds=60, session_factory=test_db.session)
+    assert await keeper.renew() >= 2
+    scheduled.reset_mock()
+    await resume_interrupted_jobs()
+    resumed = {call.args[0] for call in scheduled.call_args_list}
+    assert not resumed & {abandoned, unleased, running_elsewhere}
+
+
+@pytest.mark.asyncio
+async def test_running_worker_resumes_jobs_whose_lease_expires_later(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Another worker is alive when this one starts, then dies
+    job_id = await _create_job(
+        session,
+        "leaselater",
+        status=JobStatus.TRANSCRIBED,
+        claimed_by="other-worker",
+        claimed_until=datetime.now(timezone.utc) + timedelta(seconds=0.5),
+    )
+    resumed = asyncio.Event()
+
+    def scheduled(self: Any, resumed_id: str, *args: Any) -> None:
+        if resumed_id == job_id:
+            resumed.set()
+
+    monkeypatch.setattr(AudioProcessingJobService, "schedule_pipeline", scheduled)
+    monkeypatch.setattr("app.services.audio.sessionmanager", test_db)
+    keeper = LeaseKeeper(lease_seconds=0.3, session_factory=test_db.session)
+
+    await keeper.start(resume_interrupted_jobs)
+    try:
+        assert not resumed.is_set()
+        await asyncio.wait_for(resumed.wait(), timeout=5)
+    finally:
+        await keeper.close()
+
+    session.expire_all()
+    job = await AudioProcessingJobRepository(session).get(job_id)
+    assert job.claimed_by == WORKER_ID and job.attempts == 1
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Callable, List
+
+import pytest
+
+from app.models.audio import JobPriority
+from app.services.scheduler import JobScheduler, PipelineFactory
+
+
+def make_scheduler(max_concurrency: int = 1, per_user: int = 1) -> JobScheduler:
+    return JobScheduler(
+        max_concurrency=max_concurrency,
+        per_user_concurrency=per_user,
+        weights={JobPriority.INTERACTIVE: 4.0, JobPriority.BULK: 1.0},
+        seconds_per_cost=1.0,
+    )
+
+
+def recorder(
+    started: List[str], release: asyncio.Event
+) -> Callable[[str], PipelineFactory]:
+    def factory(job_id: str) -> PipelineFactory:
+        async def run() -> None:
+            started.append(job_id)
+            await release.wait()
+
+        return run
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_interactive_user_is_not_starved_by_bulk_upload() -> None:
+    scheduler = make_scheduler()
+    started: List[str] = []
+    release = asyncio.Event()
+    job = recorder(started, release)
+
+    for i in range(5):
+        scheduler.submit(f"bulk-{i}", 1, job(f"bulk-{i}"), JobPriority.BULK, 60)
+    scheduler.submit("interactive", 2, job("interactive"), JobPriority.INTERACTIVE, 60)
+    await asyncio.sleep(0)
+
+    position, estimated_start = scheduler.queue_info("interactive")
+    assert position == 1
+    assert estimated_start is not None
+    assert scheduler.queue_info("bulk-0") == (None, None)
+
+    release.set()
+    while len(started) < 6:
+        await asyncio.sleep(0)
+    assert started[:2] == ["bulk-0", "interactive"]
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_per_user_cap_and_shortest_first() -> None:
+    scheduler = make_scheduler(max_concurrency=3, per_user=1)
+    started: List[str] = []
+    release = asyncio.Event()
+    job = recorder(started, release)
+
+    scheduler.submit("long", 1, job("long"), cost=600)
+    scheduler.submit("short", 1, job("short"), cost=30)
+    scheduler.submit("medium", 1, job("medium"), cost=120)
+    await asyncio.sleep(0)
+
+    # Only one job of the user runs at a time, the rest wait shortest first
+    assert started == ["long"]
+    assert scheduler.queue_info("short")[0] == 1
+    assert scheduler.queue_info("medium")[0] == 2
+
+    release.set()
+    while len(started) < 3:
+        await asyncio.sleep(0)
+    assert started == ["long", "short", "medium"]
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_and_running_jobs() -> None:
+    scheduler = make_scheduler()
+    started: List[str] = []
+    release = asyncio.Event()
+    job = recorder(started, release)
+
+    scheduler.submit("running", 1, job("running"))
+    scheduler.submit("queued", 1, job("queued"))
+    await asyncio.sleep(0)
+
+    assert await scheduler.cancel("queued")
+    assert scheduler.queue_info("queued") == (None, None)
+    assert await scheduler.cancel("running")
+    assert not await scheduler.cancel("unknown")
+
+    await asyncio.sleep(0)
+    assert started == ["running"]
@@ -0,0 +1,83 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.session import DatabaseSessionManager, engine_options
+
+
+@pytest.mark.asyncio
+async def test_single_writer_profile(tmp_path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'edge.sqlite3'}"
+    manager = DatabaseSessionManager(url, engine_options(url), single_writer=True)
+    async with manager.connect() as connection:
+        await connection.execute(text("CREATE TABLE counter (n INTEGER)"))
+        mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+        assert mode == "wal"
+
+    async def write(n: int) -> None:
+        async with manager.session() as session:
+            await session.execute(text("SELECT count(*) FROM counter"))
+            await session.execute(text("INSERT INTO counter VALUES (:n)"), {"n": n})
+            await session.commit()
+
+    # Read-then-write transactions would deadlock on shared locks; here they
+    # queue for the writer connection instead
+    await asyncio.gather(*(write(n) for n in range(50)))
+
+    async with manager.read_session() as session:
+        count = (await session.execute(text("SELECT count(*) FROM counter"))).scalar()
+        assert count == 50
+        with pytest.raises(OperationalError, match="readonly"):
+            await session.execute(text("INSERT INTO counter VALUES (0)"))
+
+    metrics = manager.pool_metrics()
+    assert metrics["size"] == 1
+    assert metrics["max_overflow"] == 0
+    assert metrics["reader"]["checked_out"] == 0
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_default_profile_lists_while_pipelines_write(tmp_path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'default.sqlite3'}"
+    manager = DatabaseSessionManager(
+        url, engine_options(url), single_writer=settings.DB_SQLITE_SINGLE_WRITER
+    )
+    async with manager.connect() as connection:
+        await connection.execute(text("CREATE TABLE jobs (id INTEGER, stage INTEGER)"))
+        await connection.execute(
+            text("INSERT INTO jobs VALUES (:id, 0)"), [{"id": n} for n in range(8)]
+        )
+
+    async def pipeline(job_id: int) -> None:
+        # A checkpoint per stage, with the provider calls in between
+        async with manager.session() as session:
+            for stage in range(1, 6):
+                await session.execute(
+                    text("UPDATE jobs SET stage = :stage WHERE id = :id"),
+                    {"stage": stage, "id": job_id},
+                )
+                await session.commit()
+                await asyncio.sleep(0.001)
+
+    async def listing() -> int:
+        async with manager.session() as session:
+            rows = await session.execute(text("SELECT id FROM jobs ORDER BY id"))
+            return len(rows.all())
+
+    # A listing on the primary does not wait for a transaction in progress
+    async with manager.session() as writer:
+        await writer.execute(text("UPDATE jobs SET stage = 0 WHERE id = 0"))
+        assert await asyncio.wait_for(listing(), timeout=1) == 8
+        await writer.commit()
+
+    results = await asyncio.gather(*(pipeline(n) for n in range(8)), listing())
+    assert results[-1] == 8
+    async with manager.session() as session:
+        stages = (await session.execute(text("SELECT stage FROM jobs"))).scalars()
+        assert set(stages) == {5}
+    await manager.close()
@@ -0,0 +1,326 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncGenerator, Awaitable, Callable, List, Optional, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException, Request, Response
+from httpx import ASGITransport
+from pydantic import AnyHttpUrl
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.audio import AudioFile, AudioProcessingJob, JobStatus
+from app.models.user import User
+from app.models.webhook import WebhookDeadLetter, WebhookDelivery
+from app.repositories.audio import AudioFileRepository, AudioProcessingJobRepository
+from app.repositories.webhook import WebhookDeliveryRepository
+from app.schemas.report import ReportCreate
+from app.services.audio import AudioProcessingJobService
+from app.services.webhooks import WebhookDispatcher, callback_secret
+from app.utils.urls import UnsafeURL, is_public_address
+from tests.conftest import test_db
+
+SECRET = "webhook-secret"
+HOOK = AnyHttpUrl("http://sink/hook")
+
+
+class Sink:
+    """Local HTTP endpoint recording the webhooks it receives."""
+
+    def __init__(self, status_code: int = 200, delay: float = 0.0):
+        self.status_code = status_code
+        self.delay = delay
+        self.requests: List[Request] = []
+        self.bodies: List[bytes] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Awaited while a request is in flight
+        self.during: Optional[Callable[[], Awaitable[None]]] = None
+        self.app = FastAPI()
+        self.app.post("/hook")(self.receive)
+
+    async def receive(self, request: Request) -> Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        if self.during is not None:
+            await self.during()
+        self.in_flight -= 1
+        self.requests.append(request)
+        self.bodies.append(await request.body())
+        return Response(status_code=self.status_code)
+
+
+def make_dispatcher(sink: Sink, **kwargs: Any) -> WebhookDispatcher:
+    return WebhookDispatcher(
+        secret=SECRET,
+        session_factory=test_db.session,
+        transport=ASGITransport(app=sink.app),
+        **{"allow_private_urls": True, **kwargs},
+    )
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clean_webhooks(session: AsyncSession) -> AsyncGenerator[None, None]:
+    await session.execute(delete(WebhookDelivery))
+    await session.execute(delete(WebhookDeadLetter))
+    await session.commit()
+    yield
+
+
+async def _create_job(session: AsyncSession, username: str, **values: Any) -> str:
+    user = User(username=username, hashed_password=get_password_hash("secret"))
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    audio = AudioFile(
+        id=str(uuid.uuid4()), filename="a.mp3", file_path="/tmp/a.mp3", user_id=user.id
+    )
+    job = AudioProcessingJob(id=str(uuid.uuid4()), audio_id=audio.id, **values)
+    job_id = cast(str, job.id)
+    session.add_all([audio, job])
+    await session.commit()
+    return job_id
+
+
+async def _count(session: AsyncSession, model: Any) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_completed_pipeline_delivers_signed_webhook(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    job_id = await _create_job(
+        session,
+        "webhookuser",
+        status=JobStatus.SUMMARIZED,
+        transcript="Speaker A: hello",
+        notes={"title": "Meeting Report"},
+        callback_url="http://sink/hook",
+    )
+    monkeypatch.setattr(settings, "REPORT_UPLOAD_DIR", str(tmp_path))
+
+    sink = Sink()
+    dispatcher = make_dispatcher(sink)
+    service = AudioProcessingJobService(
+        AudioProcessingJobRepository(session),
+        AudioFileRepository(session),
+        webhooks=dispatcher,
+        renderer=MagicMock(prepare=AsyncMock(), render=AsyncMock()),
+    )
+    await service.run_audio_processing_pipeline(job_id, "/tmp/a.mp3")
+
+    assert await dispatcher.deliver_due() == 1
+    await dispatcher.close()
+
+    body = sink.bodies[0]
+    headers = sink.requests[0].headers
+    payload = json.loads(body)
+    assert payload["event"] == "job.completed"
+    assert payload["job_id"] == job_id
+    assert payload["status"] == "summarized"
+    assert payload["download_url"].endswith(f"/report/download/{job_id}")
+
+    secret = callback_secret(SECRET, job_id, "http://sink/hook")
+    expected = hmac.new(
+        secret.encode(),
+        headers["X-Webhook-Timestamp"].encode() + b"." + body,
+        hashlib.sha256,
+    ).hexdigest()
+    assert headers["X-Webhook-Signature"] == f"sha256={expected}"
+    assert await _count(session, WebhookDelivery) == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_webhook_is_retried_then_dead_lettered(
+    session: AsyncSession,
+) -> None:
+    job_id = await _create_job(session, "deadletteruser", status=JobStatus.FAILED)
+    await WebhookDeliveryRepository(session).enqueue(
+        job_id, "http://sink/hook", {"event": "job.failed", "job_id": job_id}
+    )
+    await session.commit()
+
+    sink = Sink(status_code=500)
+    dispatcher = make_dispatcher(sink, max_attempts=2, backoff_base=0.0)
+
+    assert await dispatcher.deliver_due() == 1
+    session.expire_all()
+    delivery = (await session.execute(select(WebhookDelivery))).scalar_one()
+    assert delivery.attempts == 1
+    assert delivery.last_error == "HTTP 500"
+
+    assert await dispatcher.deliver_due() == 1
+    await dispatcher.close()
+
+    assert len(sink.requests) == 2
+    assert await _count(session, WebhookDelivery) == 0
+    dead = (await session.execute(select(WebhookDeadLetter))).scalar_one()
+    assert dead.job_id == job_id
+    assert dead.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_backoff_and_concurrency_is_bounded(
+    session: AsyncSession,
+) -> None:
+    job_id = await _create_job(session, "concurrencyuser", status=JobStatus.FAILED)
+    repo = WebhookDeliveryRepository(session)
+    for _ in range(6):
+        await repo.enqueue(job_id, "http://sink/hook", {"job_id": job_id})
+    await session.commit()
+
+    sink = Sink(status_code=503, delay=0.02)
+    dispatcher = make_dispatcher(sink, concurrency=2, backoff_base=60.0)
+
+    assert await dispatcher.deliver_due() == 6
+    assert sink.max_in_flight == 2
+    # Every delivery is now backing off, none is due again yet
+    assert await dispatcher.deliver_due() == 0
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_outcome_is_dropped_once_the_lease_moved_on(
+    session: AsyncSession,
+) -> None:
+    job_id = await _create_job(session, "leaseuser", status=JobStatus.SUMMARIZED)
+    await WebhookDeliveryRepository(session).enqueue(
+        job_id, "http://sink/hook", {"job_id": job_id}
+    )
+    await session.commit()
+
+    sink = Sink()
+    taken: List[Any] = []
+
+    async def expire_and_take_over() -> None:
+        # The lease runs out mid-send and another worker claims the delivery
+        async with test_db.session() as other:
+            expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+            await other.execute(update(WebhookDelivery).values(next_attempt_at=expired))
+            repo = WebhookDeliveryRepository(other)
+            taken.extend(await repo.claim_due(10, lease_seconds=60))
+            await other.commit()
+
+    sink.during = expire_and_take_over
+    dispatcher = make_dispatcher(sink)
+
+    assert await dispatcher.deliver_due() == 1
+    await dispatcher.close()
+
+    assert len(taken) == 1
+    # The first worker's success did not remove the delivery it no longer owns
+    delivery = (await session.execute(select(WebhookDelivery))).scalar_one()
+    assert delivery.attempts == 0
+    assert await WebhookDeliveryRepository(session).mark_delivered(
+        cast(str, delivery.id), taken[0][5]
+    )
+
+
+@pytest.mark.asyncio
+async def test_each_callback_gets_its_own_secret(session: AsyncSession) -> None:
+    user = User(username="callbackowner", hashed_password=get_password_hash("s"))
+    session.add(user)
+    await session.commit()
+    audio_ids = [str(uuid.uuid4()) for _ in range(2)]
+    session.add_all(
+        AudioFile(id=a, filename="a.mp3", file_path="/tmp/a.mp3", user_id=user.id)
+        for a in audio_ids
+    )
+    await session.commit()
+
+    def service(dispatcher: WebhookDispatcher) -> AudioProcessingJobService:
+        return AudioProcessingJobService(
+            AudioProcessingJobRepository(session),
+            AudioFileRepository(session),
+            job_scheduler=MagicMock(),
+            webhooks=dispatcher,
+        )
+
+    dispatcher = make_dispatcher(Sink())
+    created = [
+        await service(dispatcher).create_bg_task(
+            ReportCreate(audio_id=audio_id, callback_url=HOOK),
+            requester_id=cast(int, user.id),
+        )
+        for audio_id in audio_ids
+    ]
+    secrets = [response["webhook_secret"] for response in created]
+    assert secrets[0] != secrets[1] and SECRET not in secrets
+    assert secrets[0] == callback_secret(
+        SECRET, created[0]["job_id"], "http://sink/hook"
+    )
+
+    # Without a server key, callbacks are refused rather than sent unsigned
+    disabled = WebhookDispatcher(secret="", session_factory=test_db.session)
+    assert not disabled.enabled
+    with pytest.raises(HTTPException) as exc_info:
+        await service(disabled).create_bg_task(
+            ReportCreate(audio_id=audio_ids[0], callback_url=HOOK),
+            requester_id=cast(int, user.id),
+        )
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "address",
+    ["127.0.0.1", "10.1.2.3", "192.168.0.1", "169.254.169.254", "100.64.0.1", "::1"]
+    + ["fe80::1", "fd00::1", "::ffff:127.0.0.1", "0.0.0.0", "224.0.0.1"],
+)
+def test_internal_addresses_are_not_public(address: str) -> None:
+    assert not is_public_address(address)
+
+
+@pytest.mark.asyncio
+async def test_callbacks_to_internal_addresses_are_refused(
+    session: AsyncSession,
+) -> None:
+    sink = Sink()
+    dispatcher = make_dispatcher(sink, allow_private_urls=False)
+    await dispatcher.check_url("https://93.184.216.34/hook")
+    for url in ["http://localhost/hook", "http://169.254.169.254/latest/meta-data"]:
+        with pytest.raises(UnsafeURL):
+            await dispatcher.check_url(url)
+
+    job_id = await _create_job(session, "ssrfuser", status=JobStatus.CREATED)
+    audio_id = (await AudioProcessingJobRepository(session).get(job_id)).audio_id
+    service = AudioProcessingJobService(
+        AudioProcessingJobRepository(session),
+        AudioFileRepository(session),
+        job_scheduler=MagicMock(),
+        webhooks=dispatcher,
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await service.create_bg_task(
+            ReportCreate(
+                audio_id=cast(str, audio_id),
+                callback_url=AnyHttpUrl("http://169.254.169.254/latest/meta-data"),
+            ),
+            requester_id=0,
+        )
+    assert exc_info.value.status_code == 422
+
+    # Checked again when sending: a stored URL now pointing inside is not called
+    await WebhookDeliveryRepository(session).enqueue(
+        job_id, "http://127.0.0.1/hook", {"job_id": job_id}
+    )
+    await session.commit()
+    assert await dispatcher.deliver_due() == 1
+    await dispatcher.close()
+
+    assert sink.requests == []
+    session.expire_all()
+    delivery = (await session.execute(select(WebhookDelivery))).scalar_one()
+    assert delivery.attempts == 1
+    assert "non-public" in cast(str, delivery.last_error)